@@ -34,3 +34,12 @@ def authenticated_client(api_client: APIClient) -> tuple[APIClient, User]:
     refresh = RefreshToken.for_user(user)
     api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
     return api_client, user
+
+
+@pytest.fixture
+def staff_client(api_client: APIClient) -> APIClient:
+    """Return an API client authenticated with a staff user."""
+    user = create_user(email="staff@example.com", is_staff=True)
+    refresh = RefreshToken.for_user(user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+    return api_client
@@ -0,0 +1,208 @@
+"""
+Sync (WSGI) vs async (ASGI) deployment benchmark.
+
+Seeds a throwaway SQLite database, then serves it in turn with gunicorn
+sync workers (config.wsgi) and gunicorn with uvicorn workers (config.asgi),
+the same number of worker processes each. An HTTP load
+generator holds --concurrency requests in flight against a mix of
+catalog, product detail and cart GETs, and reports requests per second
+with p50/p95/p99 latency for each deployment.
+
+Needs gunicorn and uvicorn installed.
+
+Usage:
+    python -m benchmarks.asgi_vs_wsgi --workers 2 --concurrency 64 --requests 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+
+from benchmarks.harness import report
+
+SERVERS = {
+    "wsgi": ["config.wsgi:application"],
+    "asgi": ["config.asgi:application", "-k", "uvicorn.workers.UvicornWorker"],
+}
+
+
+def seed(products: int) -> list[str]:
+    """Migrate the database named by DATABASE_URL and fill the catalog."""
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    django.setup()
+
+    from django.core.management import call_command
+
+    from products.models import Category, Product, ProductImage
+
+    call_command("migrate", verbosity=0)
+    categories = [Category.objects.create(name=f"Bench {i}") for i in range(5)]
+    created = Product.objects.bulk_create(
+        [
+            Product(
+                name=f"Bench Hat {i}",
+                slug=f"bench-hat-{i}",
+                price=Decimal("19.99"),
+                category=categories[i % len(categories)],
+                stock=100,
+            )
+            for i in range(products)
+        ]
+    )
+    ProductImage.objects.bulk_create(
+        [
+            ProductImage(product=product, image_url=f"https://example.com/{i}.jpg")
+            for i, product in enumerate(created)
+        ]
+    )
+    return [
+        "/api/products/",
+        "/api/products/?page=2",
+        "/api/categories/",
+        "/api/cart/",
+        *[
+            f"/api/products/bench-hat-{i}/"
+            for i in range(0, products, max(1, products // 20))
+        ],
+    ]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for(port: int, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not start")
+
+
+async def _fetch(reader, writer, path: str) -> tuple[int, bool]:
+    """Send one GET; returns the status and whether the server keeps the connection."""
+    writer.write(
+        f"GET {path} HTTP/1.1\r\nHost: localhost\r\nAccept: application/json\r\n\r\n".encode()
+    )
+    await writer.drain()
+    status_line = await reader.readline()
+    length = 0
+    keep_alive = True
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+        elif name.lower() == "connection" and value.strip().lower() == "close":
+            keep_alive = False
+    await reader.readexactly(length)
+    return int(status_line.split()[1]), keep_alive
+
+
+async def load(
+    port: int, paths: list[str], concurrency: int, requests: int
+) -> tuple[list[float], float]:
+    """
+    Send requests from concurrency clients, each reusing its connection
+    while the server allows (gunicorn's sync workers close it after every
+    response).
+    """
+    durations: list[float] = []
+    remaining = itertools.islice(itertools.cycle(paths), requests)
+
+    async def connection() -> None:
+        writer = None
+        try:
+            for path in remaining:
+                t0 = time.perf_counter()
+                if writer is None:
+                    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                status, keep_alive = await _fetch(reader, writer, path)
+                if status != 200:
+                    raise RuntimeError(f"GET {path} returned {status}")
+                durations.append(time.perf_counter() - t0)
+                if not keep_alive:
+                    writer.close()
+                    writer = None
+        finally:
+            if writer is not None:
+                writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(connection() for _ in range(concurrency)))
+    return durations, time.perf_counter() - started
+
+
+def run(workers: int, concurrency: int, requests: int, products: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{Path(tmp) / 'bench.sqlite3'}",
+            "DEBUG": "False",
+        }
+        os.environ["DATABASE_URL"] = env["DATABASE_URL"]
+        paths = seed(products)
+
+        for name, target in SERVERS.items():
+            port = _free_port()
+            server = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "gunicorn",
+                    *target,
+                    "--workers",
+                    str(workers),
+                    "--bind",
+                    f"127.0.0.1:{port}",
+                    "--log-level",
+                    "warning",
+                ],
+                env=env,
+            )
+            try:
+                _wait_for(port)
+                # Warm up caches and persistent connections
+                asyncio.run(load(port, paths, concurrency, len(paths) * concurrency))
+                durations, elapsed = asyncio.run(
+                    load(port, paths, concurrency, requests)
+                )
+            finally:
+                server.terminate()
+                server.wait()
+            report(
+                f"{name} ({workers} workers, {concurrency} in flight)",
+                durations,
+                elapsed,
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--products", type=int, default=200)
+    args = parser.parse_args()
+
+    run(args.workers, args.concurrency, args.requests, args.products)
+
+
+if __name__ == "__main__":
+    main()
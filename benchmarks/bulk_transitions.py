@@ -0,0 +1,69 @@
+"""
+Bulk order status transition benchmark.
+
+Creates a large number of pending orders and times transition_orders
+moving them all to SHIPPED, including the audit trail.
+
+Usage:
+    python -m benchmarks.bulk_transitions --orders 100000 --batch-size 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from decimal import Decimal
+
+from benchmarks.harness import benchmark_database
+
+
+def run(orders: int, batch_size: int) -> None:
+    from orders.models import Order, OrderStatusChange, ShippingAddress
+    from orders.transitions import transition_orders
+
+    address = ShippingAddress.objects.create(
+        name="Bench Customer",
+        address_line_1="1 Benchmark Way",
+        city="Springfield",
+        state="IL",
+        postal_code="62701",
+    )
+    Order.objects.bulk_create(
+        (
+            Order(
+                email="bench@example.com",
+                shipping_address=address,
+                total_price=Decimal("19.99"),
+                item_count=1,
+            )
+            for _ in range(orders)
+        ),
+        batch_size=1000,
+    )
+    order_ids = list(Order.objects.values_list("pk", flat=True))
+
+    started = time.perf_counter()
+    result = transition_orders(
+        order_ids, Order.Status.SHIPPED, note="benchmark", batch_size=batch_size
+    )
+    elapsed = time.perf_counter() - started
+
+    assert OrderStatusChange.objects.count() == result["updated"] == orders
+    print(
+        f"transitioned {result['updated']:,} orders in {elapsed:.2f} s "
+        f"({result['updated'] / elapsed:,.0f} orders/s, batch size {batch_size})"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        run(args.orders, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
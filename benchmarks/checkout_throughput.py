@@ -0,0 +1,85 @@
+"""
+Checkout throughput benchmark.
+
+Runs repeated checkouts through create_order_from_cart and reports orders
+per second, latency percentiles and queries per checkout.
+
+Usage:
+    python -m benchmarks.checkout_throughput --orders 500 --lines 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from decimal import Decimal
+
+from benchmarks.harness import benchmark_database, report
+
+SHIPPING = {
+    "name": "Bench Customer",
+    "address_line_1": "1 Benchmark Way",
+    "city": "Springfield",
+    "state": "IL",
+    "postal_code": "62701",
+}
+
+
+def run(orders: int, lines: int) -> None:
+    from django.contrib.sessions.backends.db import SessionStore
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from cart.services import CartService
+    from orders.services import create_order_from_cart
+    from products.cache import get_product_summary
+    from products.models import Category, Product
+
+    category = Category.objects.create(name="Bench")
+    summaries = [
+        get_product_summary(
+            str(
+                Product.objects.create(
+                    name=f"Bench Hat {i}",
+                    price=Decimal("19.99"),
+                    category=category,
+                    stock=orders * 2,
+                ).id
+            )
+        )
+        for i in range(lines)
+    ]
+
+    durations = []
+    queries = 0
+    started = time.perf_counter()
+    for _ in range(orders):
+        cart = CartService(SessionStore())
+        for summary in summaries:
+            cart.add(summary, 1)
+
+        with CaptureQueriesContext(connection) as ctx:
+            t0 = time.perf_counter()
+            create_order_from_cart(cart, "bench@example.com", SHIPPING)
+            durations.append(time.perf_counter() - t0)
+        queries += len(ctx.captured_queries)
+        connection.queries_log.clear()
+    elapsed = time.perf_counter() - started
+
+    report(f"checkout ({lines} lines)", durations, sum(durations))
+    print(f"queries per checkout: {queries / orders:.1f}")
+    print(f"wall time incl. cart setup: {elapsed:.2f} s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=300)
+    parser.add_argument("--lines", type=int, default=5)
+    args = parser.parse_args()
+
+    with benchmark_database():
+        run(args.orders, args.lines)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Shared setup for benchmark scripts.
+
+Benchmarks run against a throwaway test database created the same way the
+test suite creates one, so they never touch db.sqlite3.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import statistics
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+
+@contextmanager
+def benchmark_database() -> Iterator[None]:
+    """Create the test database for the duration of the block."""
+    django.setup()
+
+    from django.test.utils import (
+        setup_databases,
+        setup_test_environment,
+        teardown_databases,
+        teardown_test_environment,
+    )
+
+    # Per-request logging would dominate the timings
+    logging.disable(logging.INFO)
+    setup_test_environment()
+    old_config = setup_databases(verbosity=0, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity=0)
+        teardown_test_environment()
+
+
+def report(label: str, durations: list[float], elapsed: float) -> None:
+    """Print throughput and latency percentiles for a list of durations."""
+    ordered = sorted(durations)
+
+    def percentile(fraction: float) -> float:
+        return ordered[max(0, int(len(ordered) * fraction) - 1)]
+
+    print(
+        f"{label}: {len(durations) / elapsed:,.1f} ops/s | "
+        f"mean {statistics.mean(durations) * 1000:.2f} ms | "
+        f"p50 {statistics.median(durations) * 1000:.2f} ms | "
+        f"p95 {percentile(0.95) * 1000:.2f} ms | "
+        f"p99 {percentile(0.99) * 1000:.2f} ms"
+    )
@@ -0,0 +1,148 @@
+"""
+SQLite write-contention benchmark.
+
+Several processes, standing in for gunicorn workers, run checkout-shaped
+transactions (read a hot row, update it, insert a row) against one SQLite
+file. Runs twice: once with stock settings (rollback journal, a new
+connection per operation, no retries) and once with the production
+profile (SQLITE_PRAGMAS, a persistent connection and retry_on_db_lock).
+Reports throughput, latency and how many operations failed with
+"database is locked".
+
+Usage:
+    python -m benchmarks.sqlite_contention --workers 8 --ops 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import django
+
+from benchmarks.harness import report
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+HOT_KEY = "hot"
+
+
+def _setup(path: str, tuned: bool) -> None:
+    """Point Django at the benchmark file, with or without the profile."""
+    from django.conf import settings
+
+    from config.database import parse_database_url
+
+    # SQLite whatever DATABASE_URL says; connection settings are kept
+    settings.DATABASES["default"] = {
+        **settings.DATABASES["default"],
+        **parse_database_url(f"sqlite:///{path}"),
+        "OPTIONS": {},
+    }
+    if not tuned:
+        settings.SQLITE_PRAGMAS = {}
+        settings.DB_LOCK_RETRY_ATTEMPTS = 1
+    django.setup()
+    # Retry log lines would dominate the output
+    logging.disable(logging.INFO)
+
+
+def _prepare(path: str) -> None:
+    _setup(path, tuned=False)
+
+    from django.contrib.sessions.models import Session
+    from django.db import connection
+    from django.utils import timezone
+
+    with connection.schema_editor() as editor:
+        editor.create_model(Session)
+    Session.objects.create(
+        session_key=HOT_KEY, session_data="0", expire_date=timezone.now()
+    )
+    connection.close()
+
+
+def _worker(
+    path: str, tuned: bool, ops: int, worker: int
+) -> tuple[list[float], int, float]:
+    _setup(path, tuned)
+
+    from django.contrib.sessions.models import Session
+    from django.db import OperationalError, connection, transaction
+    from django.utils import timezone
+
+    from shared.db import is_lock_error, retry_on_db_lock
+
+    @retry_on_db_lock
+    def operation(i: int) -> None:
+        with transaction.atomic():
+            hot = Session.objects.get(session_key=HOT_KEY)
+            Session.objects.filter(session_key=HOT_KEY).update(
+                session_data=str(int(hot.session_data) + 1)
+            )
+            Session.objects.create(
+                session_key=f"w{worker}-{i}",
+                session_data="x",
+                expire_date=timezone.now(),
+            )
+
+    durations, errors = [], 0
+    started = time.perf_counter()
+    for i in range(ops):
+        t0 = time.perf_counter()
+        try:
+            operation(i)
+            durations.append(time.perf_counter() - t0)
+        except OperationalError as e:
+            if not is_lock_error(e):
+                raise
+            errors += 1
+        if not tuned:
+            # Stock CONN_MAX_AGE=0: a fresh connection for every request
+            connection.close()
+    return durations, errors, time.perf_counter() - started
+
+
+def run(workers: int, ops: int, tuned: bool) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "bench.sqlite3")
+        ctx = multiprocessing.get_context("spawn")
+
+        with ctx.Pool(1) as pool:
+            pool.apply(_prepare, (path,))
+
+        with ctx.Pool(workers) as pool:
+            collected = pool.starmap(
+                _worker, [(path, tuned, ops, n) for n in range(workers)]
+            )
+
+    # Workers start at slightly different times; the slowest bounds the run
+    elapsed = max(worker_elapsed for _, _, worker_elapsed in collected)
+
+    durations = [d for worker_durations, _, _ in collected for d in worker_durations]
+    errors = sum(worker_errors for _, worker_errors, _ in collected)
+    label = "tuned" if tuned else "stock"
+    if durations:
+        report(f"{label} ({workers} workers)", durations, elapsed)
+    print(
+        f"{label}: {errors} of {workers * ops} operations failed with 'database is locked'"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=200)
+    args = parser.parse_args()
+
+    run(args.workers, args.ops, tuned=False)
+    run(args.workers, args.ops, tuned=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Async cart view for ASGI deployments (see config.urls_async).
+
+Same URL and responses as CartView; DELETE is handled by CartView.
+"""
+
+from __future__ import annotations
+
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest, HttpResponse
+
+from cart.services import CartService
+from cart.views import CartView
+from shared.async_views import AsyncReadView, json_response
+
+
+class AsyncCartView(AsyncReadView):
+    """
+    GET /api/cart/
+
+    Query Parameters:
+        validate: Reprice items and report unavailable ones when "true"
+    """
+
+    sync_view = staticmethod(CartView.as_view())
+    uses_session = True
+
+    async def get(self, request: HttpRequest) -> HttpResponse:
+        # Django 4.2 sessions have no async API; the first access loads it
+        cart = await sync_to_async(CartService)(request.session)
+        if request.GET.get("validate", "").lower() in ("1", "true"):
+            validation = await sync_to_async(cart.revalidate)()
+            return json_response({**cart.to_dict(), "validation": validation})
+        return json_response(cart.to_dict())
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from cart.reservations import sweep_expired
+
+
+class Command(BaseCommand):
+    help = "Release cart stock reservations whose TTL has passed."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Reservations released per transaction (default: 500)",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep sweeping every --interval seconds instead of exiting",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=30.0,
+            help="Seconds between sweeps with --loop (default: 30)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        while True:
+            released = sweep_expired(batch_size=options["batch_size"])
+            self.stdout.write(f"Released {released} expired reservations")
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from django.db import models
+
+from shared.models import BaseModel
+
+
+class StockReservation(BaseModel):
+    """
+    Units of a product held for a cart until expires_at.
+
+    The held quantity is also counted in Product.reserved so availability
+    checks stay a single conditional UPDATE on the product row.
+    """
+
+    session_key = models.CharField(max_length=40)
+    product = models.ForeignKey(
+        "products.Product",
+        on_delete=models.CASCADE,
+        related_name="reservations",
+    )
+    quantity = models.PositiveIntegerField()
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = "stock_reservations"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["session_key", "product"],
+                name="unique_reservation_per_cart_product",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.product_id} x {self.quantity} until {self.expires_at}"
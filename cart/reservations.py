@@ -0,0 +1,233 @@
+"""
+Time-boxed stock holds for carts.
+
+Every change to Product.reserved is a single conditional UPDATE evaluated
+by the database (``stock >= reserved + n``), never a read-modify-write in
+Python, so concurrent workers cannot oversell on SQLite or PostgreSQL.
+Holds expire after CART_RESERVATION_TTL and are released in bulk by the
+``release_expired_reservations`` management command.
+
+Releases read the hold before changing it. select_for_update() is a no-op
+on SQLite, so under contention such a transaction can fail with "database
+is locked" when it starts writing; those are retried with retry_on_db_lock.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Any
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from cart.models import StockReservation
+from products.models import Product
+from shared.db import retry_on_db_lock
+
+logger = logging.getLogger(__name__)
+
+
+class InsufficientStock(ValueError):
+    """Raised when a product cannot cover the requested quantity."""
+
+    def __init__(self, product_ids: list[str]) -> None:
+        super().__init__("Not enough stock available")
+        self.product_ids = product_ids
+
+
+def _expiry() -> datetime:
+    return timezone.now() + settings.CART_RESERVATION_TTL
+
+
+def _per_product(values: dict[Any, int]) -> Case:
+    """Build a CASE expression mapping product ids to integer amounts."""
+    return Case(
+        *[When(pk=pk, then=Value(amount)) for pk, amount in values.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def reserve(session_key: str, product_id: str, quantity: int) -> None:
+    """
+    Hold additional units of a product for a cart and refresh the hold's TTL.
+
+    Raises:
+        InsufficientStock: If fewer than ``quantity`` units are available
+    """
+    with transaction.atomic():
+        held = Product.objects.filter(
+            pk=product_id,
+            is_active=True,
+            stock__gte=F("reserved") + quantity,
+        ).update(reserved=F("reserved") + quantity)
+        if not held:
+            raise InsufficientStock([product_id])
+
+        extended = StockReservation.objects.filter(
+            session_key=session_key, product_id=product_id
+        ).update(quantity=F("quantity") + quantity, expires_at=_expiry())
+        if extended:
+            return
+
+        try:
+            with transaction.atomic():
+                StockReservation.objects.create(
+                    session_key=session_key,
+                    product_id=product_id,
+                    quantity=quantity,
+                    expires_at=_expiry(),
+                )
+        except IntegrityError:
+            # A concurrent request for the same cart created the hold first
+            StockReservation.objects.filter(
+                session_key=session_key, product_id=product_id
+            ).update(quantity=F("quantity") + quantity, expires_at=_expiry())
+
+
+@retry_on_db_lock
+def release(session_key: str, product_id: str, quantity: int | None = None) -> None:
+    """Give back some or all (``quantity=None``) of a cart's hold on a product."""
+    with transaction.atomic():
+        reservation = (
+            StockReservation.objects.select_for_update()
+            .filter(session_key=session_key, product_id=product_id)
+            .first()
+        )
+        if reservation is None:
+            return
+
+        if quantity is None or quantity >= reservation.quantity:
+            quantity = reservation.quantity
+            released = StockReservation.objects.filter(
+                pk=reservation.pk, quantity=quantity
+            ).delete()[0]
+        else:
+            released = StockReservation.objects.filter(
+                pk=reservation.pk, quantity=reservation.quantity
+            ).update(quantity=F("quantity") - quantity)
+
+        # Zero rows means the sweeper or another request got there first
+        if released:
+            Product.objects.filter(pk=product_id).update(
+                reserved=F("reserved") - quantity
+            )
+
+
+@retry_on_db_lock
+def release_all(session_key: str) -> None:
+    """Drop every hold owned by a cart."""
+    with transaction.atomic():
+        holds = _lock_holds(session_key)
+        if holds:
+            StockReservation.objects.filter(session_key=session_key).delete()
+            Product.objects.filter(pk__in=holds).update(
+                reserved=F("reserved") - _per_product(holds)
+            )
+
+
+def held_quantities(session_key: str) -> dict[str, int]:
+    """Return the cart's current holds keyed by product id."""
+    return {
+        str(product_id): quantity
+        for product_id, quantity in StockReservation.objects.filter(
+            session_key=session_key
+        ).values_list("product_id", "quantity")
+    }
+
+
+def _lock_holds(session_key: str) -> dict[str, int]:
+    return {
+        str(product_id): quantity
+        for product_id, quantity in StockReservation.objects.select_for_update()
+        .filter(session_key=session_key)
+        .values_list("product_id", "quantity")
+    }
+
+
+def commit(session_key: str, lines: dict[str, int]) -> None:
+    """
+    Convert a cart's holds into sales.
+
+    Decrements ``stock`` by the purchased quantity and ``reserved`` by the
+    held quantity in one conditional UPDATE. Lines whose hold expired are
+    sold from free stock when enough remains.
+
+    Args:
+        session_key: Cart session owning the holds
+        lines: Purchased quantity keyed by product id
+
+    Raises:
+        InsufficientStock: If any line cannot be covered; nothing is changed
+    """
+    with transaction.atomic():
+        holds = _lock_holds(session_key)
+        product_ids = set(lines) | set(holds)
+
+        # stock - sold >= reserved - held, rearranged so the row only
+        # matches when the sale keeps the product from going oversold
+        updated = Product.objects.filter(
+            pk__in=product_ids,
+            stock__gte=F("reserved") - _per_product(holds) + _per_product(lines),
+        ).update(
+            stock=F("stock") - _per_product(lines),
+            reserved=F("reserved") - _per_product(holds),
+        )
+
+        if updated != len(product_ids):
+            raise InsufficientStock(_find_shortfall(lines, holds))
+
+        StockReservation.objects.filter(session_key=session_key).delete()
+
+
+def _find_shortfall(lines: dict[str, int], holds: dict[str, int]) -> list[str]:
+    products = Product.objects.filter(pk__in=lines).values_list(
+        "pk", "stock", "reserved"
+    )
+    return [
+        str(pk)
+        for pk, stock, reserved in products
+        if stock < reserved - holds.get(str(pk), 0) + lines[str(pk)]
+    ]
+
+
+def sweep_expired(batch_size: int = 500, now: datetime | None = None) -> int:
+    """
+    Release holds whose TTL has passed, one batch per transaction.
+
+    Returns:
+        Number of holds released
+    """
+    now = now or timezone.now()
+    released = 0
+
+    while count := _sweep_batch(batch_size, now):
+        released += count
+        logger.info("Released %d expired stock reservations", count)
+    return released
+
+
+@retry_on_db_lock
+def _sweep_batch(batch_size: int, now: datetime) -> int:
+    with transaction.atomic():
+        expired = list(
+            StockReservation.objects.select_for_update(skip_locked=True)
+            .filter(expires_at__lte=now)
+            .values_list("pk", "product_id", "quantity")[:batch_size]
+        )
+        if not expired:
+            return 0
+
+        totals: dict[Any, int] = defaultdict(int)
+        for _, product_id, quantity in expired:
+            totals[product_id] += quantity
+
+        StockReservation.objects.filter(pk__in=[pk for pk, _, _ in expired]).delete()
+        Product.objects.filter(pk__in=totals).update(
+            reserved=F("reserved") - _per_product(totals)
+        )
+    return len(expired)
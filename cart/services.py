@@ -3,6 +3,10 @@ from __future__ import annotations
 from decimal import Decimal
 from typing import Any, TypedDict
 
+from django.contrib.sessions.backends.base import SessionBase
+
+from cart import reservations
+from products.cache import ProductSummary
 from products.models import Product
 
 
@@ -16,6 +20,57 @@ class CartItem(TypedDict):
     image_url: str | None
 
 
+class PriceChange(TypedDict):
+    """A cart item whose snapshot price no longer matches the catalog."""
+
+    product_id: str
+    name: str
+    old_price: str
+    new_price: str
+
+
+class StockShortfall(TypedDict):
+    """A cart item requesting more units than are available."""
+
+    product_id: str
+    name: str
+    requested: int
+    available: int
+
+
+class CartValidation(TypedDict):
+    """Result of revalidating cart snapshots against the catalog."""
+
+    valid: bool
+    price_changes: list[PriceChange]
+    unavailable: list[str]
+    out_of_stock: list[StockShortfall]
+
+
+class CartValidationError(ValueError):
+    """
+    Raised when a cart contains items that can no longer be purchased, or
+    at checkout when prices went up since the customer last saw them.
+    """
+
+    def __init__(self, validation: CartValidation) -> None:
+        if validation["unavailable"] or validation["out_of_stock"]:
+            message = "Some items in your cart are no longer available"
+        else:
+            message = "Some prices in your cart have gone up"
+        super().__init__(message)
+        self.validation = validation
+
+
+def price_increases(validation: CartValidation) -> list[PriceChange]:
+    """Price changes in validation that raise the price."""
+    return [
+        change
+        for change in validation["price_changes"]
+        if Decimal(change["new_price"]) > Decimal(change["old_price"])
+    ]
+
+
 class CartService:
     """
     Service class for managing session-based shopping cart.
@@ -23,7 +78,7 @@ class CartService:
 
     CART_SESSION_KEY = "cart"
 
-    def __init__(self, session: dict[str, Any]) -> None:
+    def __init__(self, session: SessionBase) -> None:
         self.session = session
         cart = self.session.get(self.CART_SESSION_KEY)
         if not cart:
@@ -35,33 +90,56 @@ class CartService:
         """Mark session as modified to persist changes."""
         self.session.modified = True
 
-    def add(self, product: Product, quantity: int = 1) -> CartItem:
-        """Add a product to cart or update its quantity."""
-        product_id = str(product.id)
+    @property
+    def session_key(self) -> str:
+        """Session key owning this cart's stock reservations."""
+        if self.session.session_key is None:
+            self.session.save()
+        return self.session.session_key
+
+    def add(self, product: ProductSummary, quantity: int = 1) -> CartItem:
+        """
+        Add a product to cart or update its quantity.
+
+        Raises:
+            InsufficientStock: If the extra units cannot be reserved
+        """
+        product_id = product["id"]
+        reservations.reserve(self.session_key, product_id, quantity)
 
         if product_id in self.cart:
             self.cart[product_id]["quantity"] += quantity
         else:
-            primary_image = product.primary_image
             self.cart[product_id] = CartItem(
                 product_id=product_id,
                 quantity=quantity,
-                name=product.name,
-                price=str(product.price),
-                image_url=primary_image.image_url if primary_image else None,
+                name=product["name"],
+                price=str(product["price"]),
+                image_url=product["image_url"],
             )
 
         self._save()
         return self.cart[product_id]
 
     def update_quantity(self, product_id: str, quantity: int) -> CartItem | None:
-        """Update the quantity of an item in the cart."""
+        """
+        Update the quantity of an item in the cart.
+
+        Raises:
+            InsufficientStock: If an increase cannot be reserved
+        """
         if product_id not in self.cart:
             return None
 
         if quantity <= 0:
             return self.remove(product_id)
 
+        delta = quantity - self.cart[product_id]["quantity"]
+        if delta > 0:
+            reservations.reserve(self.session_key, product_id, delta)
+        elif delta < 0:
+            reservations.release(self.session_key, product_id, -delta)
+
         self.cart[product_id]["quantity"] = quantity
         self._save()
         return self.cart[product_id]
@@ -69,13 +147,22 @@ class CartService:
     def remove(self, product_id: str) -> CartItem | None:
         """Remove an item from the cart."""
         if product_id in self.cart:
+            reservations.release(self.session_key, product_id)
             item = self.cart.pop(product_id)
             self._save()
             return item
         return None
 
-    def clear(self) -> None:
-        """Clear all items from the cart."""
+    def clear(self, release: bool = True) -> None:
+        """
+        Clear all items from the cart.
+
+        Args:
+            release: Release the cart's stock reservations. Pass False when
+                they were already converted into sales.
+        """
+        if release and self.cart:
+            reservations.release_all(self.session_key)
         self.cart.clear()
         self._save()
 
@@ -87,6 +174,87 @@ class CartService:
         """Get a specific item from the cart."""
         return self.cart.get(product_id)
 
+    def quantities(self) -> dict[str, int]:
+        """Get requested quantity keyed by product id."""
+        return {product_id: item["quantity"] for product_id, item in self.cart.items()}
+
+    def load_products(self) -> dict[str, Product]:
+        """Fetch every product in the cart with a single query, keyed by id."""
+        if not self.cart:
+            return {}
+        products = Product.objects.filter(id__in=list(self.cart.keys()))
+        return {str(product.id): product for product in products}
+
+    def revalidate(self, products: dict[str, Product] | None = None) -> CartValidation:
+        """
+        Refresh item snapshots from the catalog and report what changed.
+
+        Prices and names are updated in place. Items whose product was
+        deleted or deactivated, or that request more than this cart's hold
+        plus the unreserved stock, are reported but left in the cart so the
+        customer can decide.
+
+        Args:
+            products: Products keyed by id, as returned by load_products().
+                Loaded with one query when omitted.
+        """
+        if products is None:
+            products = self.load_products()
+        held = reservations.held_quantities(self.session_key) if self.cart else {}
+
+        validation = CartValidation(
+            valid=True,
+            price_changes=[],
+            unavailable=[],
+            out_of_stock=[],
+        )
+        changed = False
+
+        for product_id, item in self.cart.items():
+            product = products.get(product_id)
+            if product is None or not product.is_active:
+                validation["unavailable"].append(product_id)
+                continue
+
+            current_price = str(product.price)
+            if Decimal(item["price"]) != product.price:
+                validation["price_changes"].append(
+                    PriceChange(
+                        product_id=product_id,
+                        name=product.name,
+                        old_price=item["price"],
+                        new_price=current_price,
+                    )
+                )
+                item["price"] = current_price
+                changed = True
+
+            if item["name"] != product.name:
+                item["name"] = product.name
+                changed = True
+
+            # Stock not held by other carts
+            available = max(
+                product.stock - product.reserved + held.get(product_id, 0), 0
+            )
+            if item["quantity"] > available:
+                validation["out_of_stock"].append(
+                    StockShortfall(
+                        product_id=product_id,
+                        name=product.name,
+                        requested=item["quantity"],
+                        available=available,
+                    )
+                )
+
+        validation["valid"] = not (
+            validation["unavailable"] or validation["out_of_stock"]
+        )
+
+        if changed:
+            self._save()
+        return validation
+
     @property
     def total_items(self) -> int:
         """Get total number of items in cart."""
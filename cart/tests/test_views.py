@@ -1,14 +1,24 @@
 """Tests for cart API endpoints."""
 from __future__ import annotations
 
+from datetime import timedelta
 from decimal import Decimal
+from io import StringIO
 
 import pytest
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management import call_command
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from cart.models import StockReservation
+from cart.reservations import sweep_expired
+from cart.services import CartService
+from products.cache import get_product_summary
 from products.models import Category, Product
+from shared.tests.helpers import database_locked
 
 
 @pytest.fixture
@@ -167,3 +177,203 @@ class TestCartItemDetailView:
         response = api_client.delete(url)
 
         assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestCartRevalidation:
+    """Tests for repricing and availability checks on cart contents."""
+
+    def test_validate_reprices_changed_items(
+        self, api_client: APIClient, product: Product
+    ) -> None:
+        """Test that validation applies and reports catalog price changes."""
+        api_client.post(
+            reverse("cart-items"), {"product_id": str(product.id), "quantity": 2}
+        )
+        product.price = Decimal("24.99")
+        product.save()
+
+        response = api_client.get(reverse("cart"), {"validate": "true"})
+
+        assert response.status_code == status.HTTP_200_OK
+        validation = response.data["validation"]
+        assert validation["valid"] is True
+        assert validation["price_changes"] == [
+            {
+                "product_id": str(product.id),
+                "name": product.name,
+                "old_price": "29.99",
+                "new_price": "24.99",
+            }
+        ]
+        assert response.data["items"][0]["price"] == "24.99"
+        assert response.data["subtotal"] == "49.98"
+
+    def test_validate_flags_inactive_and_out_of_stock(
+        self, api_client: APIClient, product: Product, category: Category
+    ) -> None:
+        """Test that inactive and understocked items make the cart invalid."""
+        other = Product.objects.create(
+            name="Other Hat", price=Decimal("10.00"), category=category, stock=3
+        )
+        url = reverse("cart-items")
+        api_client.post(url, {"product_id": str(product.id), "quantity": 1})
+        api_client.post(url, {"product_id": str(other.id), "quantity": 3})
+        product.is_active = False
+        product.save()
+        other.stock = 1
+        other.save()
+
+        response = api_client.get(reverse("cart"), {"validate": "true"})
+
+        validation = response.data["validation"]
+        assert validation["valid"] is False
+        assert validation["unavailable"] == [str(product.id)]
+        assert validation["out_of_stock"][0]["product_id"] == str(other.id)
+        assert validation["out_of_stock"][0]["available"] == 1
+
+    def test_revalidate_uses_single_query(
+        self, category: Category, django_assert_num_queries
+    ) -> None:
+        """Test that revalidation cost does not grow with cart size."""
+        cart = CartService(SessionStore())
+        for i in range(5):
+            product = Product.objects.create(
+                name=f"Hat {i}", price=Decimal("5.00"), category=category, stock=5
+            )
+            cart.add(get_product_summary(str(product.id)))
+
+        # Products plus this cart's reservations
+        with django_assert_num_queries(2):
+            cart.revalidate()
+
+
+@pytest.mark.django_db
+class TestStockReservations:
+    """Tests for stock held by carts."""
+
+    def test_add_reserves_stock(self, api_client: APIClient, product: Product) -> None:
+        """Test that adding to cart holds stock for the cart."""
+        url = reverse("cart-items")
+        api_client.post(url, {"product_id": str(product.id), "quantity": 4})
+
+        product.refresh_from_db()
+        assert product.reserved == 4
+        assert StockReservation.objects.get(product=product).quantity == 4
+
+    def test_add_beyond_available_stock_fails(
+        self, api_client: APIClient, product: Product
+    ) -> None:
+        """Test that stock held by another cart cannot be added."""
+        url = reverse("cart-items")
+        api_client.post(url, {"product_id": str(product.id), "quantity": 8})
+
+        other_client = APIClient()
+        response = other_client.post(
+            url, {"product_id": str(product.id), "quantity": 3}
+        )
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        product.refresh_from_db()
+        assert product.reserved == 8
+
+    def test_update_and_remove_adjust_reservation(
+        self, api_client: APIClient, product: Product
+    ) -> None:
+        """Test that quantity changes grow or shrink the hold."""
+        api_client.post(
+            reverse("cart-items"), {"product_id": str(product.id), "quantity": 2}
+        )
+        url = reverse("cart-item-detail", kwargs={"product_id": str(product.id)})
+
+        api_client.patch(url, {"quantity": 5})
+        product.refresh_from_db()
+        assert product.reserved == 5
+
+        response = api_client.patch(url, {"quantity": 11})
+        assert response.status_code == status.HTTP_409_CONFLICT
+
+        api_client.patch(url, {"quantity": 1})
+        product.refresh_from_db()
+        assert product.reserved == 1
+
+        api_client.delete(url)
+        product.refresh_from_db()
+        assert product.reserved == 0
+        assert not StockReservation.objects.exists()
+
+    def test_sweep_releases_expired_holds(
+        self, api_client: APIClient, product: Product
+    ) -> None:
+        """Test that the sweeper returns expired holds to available stock."""
+        api_client.post(
+            reverse("cart-items"), {"product_id": str(product.id), "quantity": 3}
+        )
+        StockReservation.objects.update(expires_at=timezone.now())
+
+        call_command("release_expired_reservations", stdout=StringIO())
+
+        product.refresh_from_db()
+        assert product.reserved == 0
+        assert not StockReservation.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+class TestReservationLockContention:
+    """Tests for releases that find SQLite's write lock taken."""
+
+    @pytest.fixture
+    def cart_client(self, api_client: APIClient, product: Product) -> APIClient:
+        api_client.post(
+            reverse("cart-items"), {"product_id": str(product.id), "quantity": 4}
+        )
+        return api_client
+
+    def test_lower_quantity_retried(
+        self, cart_client: APIClient, product: Product
+    ) -> None:
+        url = reverse("cart-item-detail", kwargs={"product_id": str(product.id)})
+
+        with database_locked() as failed:
+            response = cart_client.patch(url, {"quantity": 1})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(failed) == 1
+        assert "stock_reservations" in failed[0]
+        product.refresh_from_db()
+        assert product.reserved == 1
+
+    def test_remove_item_retried(
+        self, cart_client: APIClient, product: Product
+    ) -> None:
+        url = reverse("cart-item-detail", kwargs={"product_id": str(product.id)})
+
+        with database_locked() as failed:
+            response = cart_client.delete(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(failed) == 1
+        assert "stock_reservations" in failed[0]
+        product.refresh_from_db()
+        assert product.reserved == 0
+
+    def test_clear_cart_retried(self, cart_client: APIClient, product: Product) -> None:
+        with database_locked() as failed:
+            response = cart_client.delete(reverse("cart"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(failed) == 1
+        assert "stock_reservations" in failed[0]
+        product.refresh_from_db()
+        assert product.reserved == 0
+        assert not StockReservation.objects.exists()
+
+    def test_sweep_retried(self, cart_client: APIClient, product: Product) -> None:
+        with database_locked() as failed:
+            released = sweep_expired(now=timezone.now() + timedelta(days=1))
+
+        assert released == 1
+        assert len(failed) == 1
+        assert "stock_reservations" in failed[0]
+        product.refresh_from_db()
+        assert product.reserved == 0
@@ -6,8 +6,9 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from cart.reservations import InsufficientStock
 from cart.services import CartService
-from products.models import Product
+from products.cache import get_product_summary
 
 
 class CartView(APIView):
@@ -16,12 +17,20 @@ class CartView(APIView):
 
     GET /api/cart/ - Get cart contents
     DELETE /api/cart/ - Clear cart
+
+    Query Parameters:
+        validate: Reprice items and report unavailable ones when "true"
     """
 
     permission_classes = [AllowAny]
+    # Batches calling this view run sequentially (see shared.batch)
+    uses_session = True
 
     def get(self, request: Request) -> Response:
         cart = CartService(request.session)
+        if request.query_params.get("validate", "").lower() in ("1", "true"):
+            validation = cart.revalidate()
+            return Response({**cart.to_dict(), "validation": validation})
         return Response(cart.to_dict())
 
     def delete(self, request: Request) -> Response:
@@ -35,9 +44,12 @@ class CartItemView(APIView):
     View for adding items to cart.
 
     POST /api/cart/items/ - Add item to cart
+
+    Adding an item reserves stock for the cart; 409 if not enough is left.
     """
 
     permission_classes = [AllowAny]
+    uses_session = True
 
     def post(self, request: Request) -> Response:
         product_id = request.data.get("product_id")
@@ -59,16 +71,21 @@ class CartItemView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        try:
-            product = Product.objects.get(id=product_id, is_active=True)
-        except Product.DoesNotExist:
+        product = get_product_summary(product_id)
+        if product is None or not product["is_active"]:
             return Response(
                 {"error": "Product not found"},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
         cart = CartService(request.session)
-        item = cart.add(product, quantity)
+        try:
+            item = cart.add(product, quantity)
+        except InsufficientStock as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_409_CONFLICT,
+            )
         return Response(
             {"item": item, "cart": cart.to_dict()},
             status=status.HTTP_201_CREATED,
@@ -84,6 +101,7 @@ class CartItemDetailView(APIView):
     """
 
     permission_classes = [AllowAny]
+    uses_session = True
 
     def patch(self, request: Request, product_id: str) -> Response:
         quantity = request.data.get("quantity")
@@ -103,7 +121,13 @@ class CartItemDetailView(APIView):
             )
 
         cart = CartService(request.session)
-        item = cart.update_quantity(product_id, quantity)
+        try:
+            item = cart.update_quantity(product_id, quantity)
+        except InsufficientStock as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_409_CONFLICT,
+            )
 
         if item is None and quantity > 0:
             return Response(
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import os
+from typing import Any
+
+from asgiref.wsgi import WsgiToAsgi
+from django.core.asgi import get_asgi_application
+from whitenoise import WhiteNoise
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+# Async catalog, cart and order views in front of the sync ones
+os.environ.setdefault("DJANGO_ROOT_URLCONF", "config.urls_async")
+# Leaves the sync-only WhiteNoise middleware out (see settings.MIDDLEWARE)
+os.environ.setdefault("DJANGO_SERVE_ASGI", "True")
+django_application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402  (configured by get_asgi_application)
+
+
+def _not_found(environ: dict[str, Any], start_response: Any) -> list[bytes]:
+    start_response("404 Not Found", [("Content-Type", "text/plain")])
+    return [b"Not Found"]
+
+
+# Collected static files, served by WhiteNoise on a thread; only these
+# requests leave the event loop
+static_application = WsgiToAsgi(
+    WhiteNoise(_not_found, root=settings.STATIC_ROOT, prefix=settings.STATIC_URL)
+)
+
+
+async def application(scope: dict[str, Any], receive: Any, send: Any) -> None:
+    if scope["type"] == "http" and scope["path"].startswith(settings.STATIC_URL):
+        await static_application(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
@@ -3,10 +3,18 @@ from __future__ import annotations
 from django.contrib import admin
 from django.urls import include, path
 
+from monitoring.views import metrics_view
+from shared.views import BatchView
+
 urlpatterns = [
+    # Ahead of the admin site, whose catch-all would swallow these
+    path("admin/", include("monitoring.urls")),
     path("admin/", admin.site.urls),
     path("api/accounts/", include("accounts.urls")),
     path("api/", include("products.urls")),
     path("api/", include("cart.urls")),
     path("api/", include("orders.urls")),
+    path("api/", include("reports.urls")),
+    path("api/batch/", BatchView.as_view(), name="batch"),
+    path("metrics", metrics_view, name="metrics"),
 ]
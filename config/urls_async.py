@@ -0,0 +1,25 @@
+"""
+URLconf for the ASGI deployment (config.asgi).
+
+Puts async versions of the read-heavy endpoints in front of config.urls;
+everything else, including non-GET methods on these paths, is served by
+the sync views.
+"""
+
+from __future__ import annotations
+
+from django.urls import path
+
+from cart.async_views import AsyncCartView
+from config.urls import urlpatterns as sync_urlpatterns
+from orders.async_views import OrderDetailView
+from products.async_views import CategoryListView, ProductDetailView, ProductListView
+
+urlpatterns = [
+    path("api/categories/", CategoryListView.as_view()),
+    path("api/products/", ProductListView.as_view()),
+    path("api/products/<str:slug>/", ProductDetailView.as_view()),
+    path("api/cart/", AsyncCartView.as_view()),
+    path("api/orders/<uuid:pk>/", OrderDetailView.as_view()),
+    *sync_urlpatterns,
+]
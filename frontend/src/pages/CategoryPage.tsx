@@ -9,6 +9,7 @@ import { useParams, Link } from 'react-router-dom'
 import { ChevronLeft } from 'lucide-react'
 import { Button, SkeletonCard, EmptyState } from '@/components/ui'
 import { ProductCard } from '@/components/ProductCard'
+import { type PaginatedResponse } from '@/services/api'
 import { productsApi, type Product, type Category } from '@/services/productsApi'
 
 export const CategoryPage: React.FC = () => {
@@ -27,20 +28,18 @@ export const CategoryPage: React.FC = () => {
         setLoading(true)
         setError(null)
 
-        // Fetch category details if not "all"
+        // One request for the category and its first page; "all" reuses
+        // the home payload
+        let productsData: PaginatedResponse<Product>
         if (slug && slug !== 'all') {
-          const categoryData = await productsApi.getCategory(slug)
-          setCategory(categoryData)
+          const payload = await productsApi.getCategoryPage(slug)
+          setCategory(payload.category)
+          productsData = payload.products
         } else {
           setCategory(null)
+          productsData = (await productsApi.getHome()).products
         }
 
-        // Fetch products
-        const productsData = await productsApi.listProducts({
-          category: slug === 'all' ? undefined : slug,
-          page: 1,
-        })
-
         setProducts(productsData.results)
         setTotalCount(productsData.count)
         setHasMore(productsData.next !== null)
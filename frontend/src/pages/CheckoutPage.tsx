@@ -7,9 +7,11 @@
 import { useState, type FormEvent } from 'react'
 import { Link, useNavigate } from 'react-router-dom'
 import { ChevronLeft } from 'lucide-react'
+import axios from 'axios'
 import { Button, Card, Input, EmptyState, PageLoading } from '@/components/ui'
 import { useCart } from '@/context/CartContext'
-import { ordersApi, type CheckoutData } from '@/services/ordersApi'
+import type { PriceChange } from '@/services/cartApi'
+import { ordersApi, type CheckoutConflict, type CheckoutData } from '@/services/ordersApi'
 
 interface FormErrors {
   [key: string]: string
@@ -19,7 +21,11 @@ export const CheckoutPage: React.FC = () => {
   const navigate = useNavigate()
   const { cart, loading: cartLoading, refreshCart } = useCart()
   const [submitting, setSubmitting] = useState(false)
+  // Reused across resubmits so a retried checkout cannot create two orders
+  const [idempotencyKey] = useState(() => crypto.randomUUID())
   const [errors, setErrors] = useState<FormErrors>({})
+  // Price rises reported by the last checkout attempt, awaiting confirmation
+  const [priceChanges, setPriceChanges] = useState<PriceChange[]>([])
   const [formData, setFormData] = useState<CheckoutData>({
     email: '',
     name: '',
@@ -89,12 +95,29 @@ export const CheckoutPage: React.FC = () => {
 
     try {
       setSubmitting(true)
-      const order = await ordersApi.checkout(formData)
+      const order = await ordersApi.checkout(formData, idempotencyKey)
       await refreshCart()
       navigate(`/order/${order.id}`)
     } catch (err) {
-      console.error('Checkout error:', err)
-      setErrors({ submit: 'Failed to process order. Please try again.' })
+      const conflict = axios.isAxiosError<CheckoutConflict>(err) && err.response?.status === 409
+        ? err.response.data
+        : null
+      if (conflict?.validation) {
+        // The server repriced the cart; show the new prices before the
+        // customer can place the order again
+        await refreshCart()
+        const { validation } = conflict
+        if (validation.unavailable.length > 0 || validation.out_of_stock.length > 0) {
+          setPriceChanges([])
+          setErrors({ submit: 'Some items in your cart are no longer available. Please review your cart.' })
+        } else {
+          setPriceChanges(validation.price_changes)
+          setErrors({ submit: 'Some prices have gone up since you added these items. Please review the new prices and confirm your order.' })
+        }
+      } else {
+        console.error('Checkout error:', err)
+        setErrors({ submit: 'Failed to process order. Please try again.' })
+      }
     } finally {
       setSubmitting(false)
     }
@@ -241,13 +264,35 @@ export const CheckoutPage: React.FC = () => {
                 <p className="text-[var(--color-error)] text-sm mb-4">{errors.submit}</p>
               )}
 
+              {priceChanges.length > 0 && (
+                <ul className="text-sm mb-4 space-y-1" data-testid="price-changes">
+                  {priceChanges.map((change) => (
+                    <li key={change.product_id} className="flex justify-between">
+                      <span className="text-[var(--color-fg)]">{change.name}</span>
+                      <span>
+                        <span className="line-through text-[var(--color-muted)] mr-2">
+                          {formatPrice(change.old_price)}
+                        </span>
+                        <span className="font-medium text-[var(--color-fg)]">
+                          {formatPrice(change.new_price)}
+                        </span>
+                      </span>
+                    </li>
+                  ))}
+                </ul>
+              )}
+
               <Button
                 type="submit"
                 size="lg"
                 className="w-full"
                 disabled={submitting}
               >
-                {submitting ? 'Processing...' : 'Place Order'}
+                {submitting
+                  ? 'Processing...'
+                  : priceChanges.length > 0
+                    ? 'Confirm New Prices & Place Order'
+                    : 'Place Order'}
               </Button>
             </form>
           </div>
@@ -22,12 +22,9 @@ export const HomePage: React.FC = () => {
     const fetchData = async () => {
       try {
         setLoading(true)
-        const [categoriesData, productsData] = await Promise.all([
-          productsApi.listCategories(),
-          productsApi.listProducts({ page: 1 }),
-        ])
-        setCategories(categoriesData)
-        setFeaturedProducts(productsData.results.slice(0, 4))
+        const home = await productsApi.getHome()
+        setCategories(home.categories)
+        setFeaturedProducts(home.products.results.slice(0, 4))
       } catch (err) {
         setError('Failed to load data. Please try again.')
         console.error('Error fetching data:', err)
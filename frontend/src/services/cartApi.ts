@@ -21,6 +21,31 @@ export interface Cart {
   subtotal: string
 }
 
+export interface PriceChange {
+  product_id: string
+  name: string
+  old_price: string
+  new_price: string
+}
+
+export interface StockShortfall {
+  product_id: string
+  name: string
+  requested: number
+  available: number
+}
+
+export interface CartValidation {
+  valid: boolean
+  price_changes: PriceChange[]
+  unavailable: string[]
+  out_of_stock: StockShortfall[]
+}
+
+export interface ValidatedCart extends Cart {
+  validation: CartValidation
+}
+
 export interface CartResponse {
   item?: CartItem | null
   cart: Cart
@@ -37,6 +62,16 @@ export const cartApi = {
     return response.data
   },
 
+  /**
+   * Get cart contents repriced against the catalog, with availability issues
+   */
+  validateCart: async (): Promise<ValidatedCart> => {
+    const response = await api.get<ValidatedCart>('/api/cart/', {
+      params: { validate: true },
+    })
+    return response.data
+  },
+
   /**
    * Add an item to the cart
    */
@@ -5,6 +5,7 @@
  */
 
 import { api, PaginatedResponse } from './api'
+import type { CartValidation } from './cartApi'
 
 // Types
 export interface ShippingAddress {
@@ -58,13 +59,28 @@ export interface CheckoutData {
   country?: string
 }
 
+/**
+ * Body of a 409 from checkout: items became unavailable or prices went up.
+ * The cart already holds the current prices, so checking out again
+ * confirms them.
+ */
+export interface CheckoutConflict {
+  error: string
+  validation: CartValidation
+}
+
 // API functions
 export const ordersApi = {
   /**
    * Create an order from the current cart (checkout)
+   *
+   * Pass the same idempotencyKey when retrying so a request that timed out
+   * after the order was placed returns that order instead of a duplicate.
    */
-  checkout: async (data: CheckoutData): Promise<Order> => {
-    const response = await api.post<Order>('/api/orders/checkout/', data)
+  checkout: async (data: CheckoutData, idempotencyKey?: string): Promise<Order> => {
+    const response = await api.post<Order>('/api/orders/checkout/', data, {
+      headers: idempotencyKey ? { 'Idempotency-Key': idempotencyKey } : undefined,
+    })
     return response.data
   },
 
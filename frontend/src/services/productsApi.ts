@@ -42,6 +42,16 @@ export interface ProductDetail extends Omit<Product, 'primary_image'> {
   updated_at: string
 }
 
+export interface HomePayload {
+  categories: Category[]
+  products: PaginatedResponse<Product>
+}
+
+export interface CategoryPayload {
+  category: Category
+  products: PaginatedResponse<Product>
+}
+
 // API functions
 export const productsApi = {
   /**
@@ -71,6 +81,23 @@ export const productsApi = {
     return response.data
   },
 
+  /**
+   * Get everything the home page needs in one request: all categories
+   * and the first page of products
+   */
+  getHome: async (): Promise<HomePayload> => {
+    const response = await api.get<HomePayload>('/api/storefront/home/')
+    return response.data
+  },
+
+  /**
+   * Get a category and the first page of its products in one request
+   */
+  getCategoryPage: async (slug: string): Promise<CategoryPayload> => {
+    const response = await api.get<CategoryPayload>(`/api/storefront/categories/${slug}/`)
+    return response.data
+  },
+
   /**
    * Get a product by slug
    */
@@ -76,4 +76,66 @@ test.describe('Checkout Flow Tests', () => {
       await expect(page).toHaveURL('/checkout')
     }
   })
+
+  test('price increase is shown before the order can be placed', async ({ page }) => {
+    const item = { product_id: 'p1', quantity: 2, name: 'Fedora', image_url: null }
+    let price = '20.00'
+    const checkouts: string[] = []
+
+    await page.route('**/api/cart/', (route) =>
+      route.fulfill({
+        json: {
+          items: [{ ...item, price }],
+          total_items: 2,
+          subtotal: (parseFloat(price) * 2).toFixed(2),
+        },
+      })
+    )
+    await page.route('**/api/orders/checkout/', (route) => {
+      checkouts.push(route.request().method())
+      if (checkouts.length === 1) {
+        // The server repriced the cart while answering
+        price = '25.00'
+        return route.fulfill({
+          status: 409,
+          json: {
+            error: 'Some prices in your cart have gone up',
+            validation: {
+              valid: false,
+              price_changes: [
+                { product_id: 'p1', name: 'Fedora', old_price: '20.00', new_price: '25.00' },
+              ],
+              unavailable: [],
+              out_of_stock: [],
+            },
+          },
+        })
+      }
+      return route.fulfill({ status: 201, json: { id: 'order-1' } })
+    })
+    await page.route('**/api/orders/order-1/', (route) => route.fulfill({ status: 404, json: {} }))
+
+    await page.goto('/checkout')
+    await page.getByRole('textbox', { name: /email/i }).fill('buyer@example.com')
+    await page.getByRole('textbox', { name: /full name/i }).fill('Jane Doe')
+    await page.getByRole('textbox', { name: /^address$/i }).fill('1 Main St')
+    await page.getByRole('textbox', { name: /city/i }).fill('Springfield')
+    await page.getByRole('textbox', { name: /state/i }).fill('IL')
+    await page.getByRole('textbox', { name: /postal code/i }).fill('62701')
+    await page.getByRole('button', { name: /place order/i }).click()
+
+    // The old and new price are shown, and the summary is repriced
+    const changes = page.getByTestId('price-changes')
+    await expect(changes).toContainText('Fedora')
+    await expect(changes).toContainText('$20.00')
+    await expect(changes).toContainText('$25.00')
+    await expect(page.getByText('$50.00').first()).toBeVisible()
+    await expect(page).toHaveURL('/checkout')
+    expect(checkouts).toHaveLength(1)
+
+    // Placing the order again confirms the new price
+    await page.getByRole('button', { name: /confirm new prices/i }).click()
+    await expect(page).toHaveURL('/order/order-1')
+    expect(checkouts).toHaveLength(2)
+  })
 })
@@ -0,0 +1,28 @@
+"""
+gunicorn settings, loaded automatically from the working directory.
+
+Points prometheus_client's multiprocess mode at a fresh directory, so
+/metrics on any worker reports totals across all of them.
+"""
+
+import os
+import shutil
+import tempfile
+
+# Must be set before the app (and prometheus_client) is imported
+os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "hatshop-metrics")
+)
+
+
+def on_starting(server):
+    # Samples left by a previous run would be counted again
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from django.contrib import admin
+from django.utils.html import format_html
+
+from monitoring.models import SlowQuery
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    """
+    Read-only report of slow query shapes, costliest in total first.
+
+    Rows are maintained by monitoring.slow_queries; deleting one starts its
+    totals afresh and captures a new plan next time the shape runs slow.
+    """
+
+    list_display = [
+        "__str__",
+        "calls",
+        "total_time",
+        "avg_time",
+        "max_time",
+        "view",
+        "database",
+        "last_seen",
+    ]
+    list_filter = ["database"]
+    search_fields = ["sql", "view"]
+    ordering = ["-total_ms"]
+    fields = [
+        "fingerprint",
+        "sql",
+        "explain_plan",
+        "view",
+        "database",
+        "calls",
+        "total_ms",
+        "max_ms",
+        "created_at",
+        "last_seen",
+    ]
+    readonly_fields = fields
+
+    def has_add_permission(self, request) -> bool:
+        return False
+
+    def has_change_permission(self, request, obj=None) -> bool:
+        return False
+
+    @admin.display(description="total ms", ordering="total_ms")
+    def total_time(self, obj: SlowQuery) -> str:
+        return f"{obj.total_ms:,.0f}"
+
+    @admin.display(description="avg ms")
+    def avg_time(self, obj: SlowQuery) -> str:
+        return f"{obj.avg_ms:,.1f}"
+
+    @admin.display(description="max ms", ordering="max_ms")
+    def max_time(self, obj: SlowQuery) -> str:
+        return f"{obj.max_ms:,.1f}"
+
+    @admin.display(description="plan")
+    def explain_plan(self, obj: SlowQuery) -> str:
+        return format_html("<pre>{}</pre>", obj.plan or "(not captured)")
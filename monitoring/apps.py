@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class MonitoringConfig(AppConfig):
+    """Monitoring app configuration."""
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "monitoring"
+
+    def ready(self) -> None:
+        if settings.REQUEST_INSTRUMENTATION or settings.METRICS_ENABLED:
+            from monitoring import instrumentation
+
+            instrumentation.install()
+        if settings.SLOW_QUERY_LOG:
+            from monitoring import slow_queries
+
+            slow_queries.install()
@@ -0,0 +1,188 @@
+"""
+Per-request query counting and timing.
+
+While InstrumentationMiddleware handles a request, a RequestStats in a
+context variable collects:
+
+- queries and db: every query run on any database connection
+- serialize: time in DRF serializer .data, including the queries it
+  triggers, which is where N+1 lookups show up
+- render: time rendering the response
+
+install() hooks the database connections and DRF serializers. It is only
+called when REQUEST_INSTRUMENTATION or METRICS_ENABLED is on, so a
+deployment with both off runs no instrumentation code at all.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable
+from contextvars import ContextVar
+from typing import Any
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+
+class RequestStats:
+    """Query count and phase timings for one request; times in seconds."""
+
+    __slots__ = ("queries", "db_time", "serialize_time", "render_time", "_serializing")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.render_time = 0.0
+        self._serializing = False
+
+    def add(self, other: RequestStats) -> None:
+        """Add the totals of other, e.g. a sub-request counted on another thread."""
+        self.queries += other.queries
+        self.db_time += other.db_time
+        self.serialize_time += other.serialize_time
+        self.render_time += other.render_time
+
+
+current: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def view_name(request: HttpRequest) -> str:
+    """URL name of the view that handled request, for labels and logs."""
+    match = request.resolver_match
+    return (match.view_name or match._func_path) if match else "unresolved"
+
+
+def record_query(
+    execute: Callable, sql: str, params: Any, many: bool, context: dict
+) -> Any:
+    """Database execute wrapper counting and timing queries."""
+    stats = current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - started
+
+
+def _add_wrapper(sender: Any, connection: BaseDatabaseWrapper, **kwargs: Any) -> None:
+    # Fires again when a persistent connection reconnects
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def _timed_data(prop: property) -> property:
+    def data(self: serializers.BaseSerializer) -> Any:
+        stats = current.get()
+        # Nested serializers are part of their parent's time
+        if stats is None or stats._serializing:
+            return prop.fget(self)
+        stats._serializing = True
+        started = time.perf_counter()
+        try:
+            return prop.fget(self)
+        finally:
+            stats.serialize_time += time.perf_counter() - started
+            stats._serializing = False
+
+    return property(data)
+
+
+_installed = False
+
+
+def install() -> None:
+    """Hook database connections and DRF serializers; safe to call twice."""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+
+    connection_created.connect(_add_wrapper, dispatch_uid="monitoring.record_query")
+    for connection in connections.all(initialized_only=True):
+        _add_wrapper(None, connection)
+
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        cls.data = _timed_data(cls.data)
+
+
+class ViewStatsLog:
+    """
+    Per-view totals for this process, logged as JSON lines.
+
+    Every REQUEST_STATS_LOG_INTERVAL seconds, the next request to finish
+    logs one line per view seen since the last flush and resets the totals.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._views: dict[str, dict[str, Any]] = {}
+        self._since = time.monotonic()
+
+    def add(self, view: str, stats: RequestStats, duration: float) -> None:
+        with self._lock:
+            totals = self._views.setdefault(
+                view,
+                {
+                    "requests": 0,
+                    "time": 0.0,
+                    "max_time": 0.0,
+                    "db_time": 0.0,
+                    "queries": 0,
+                    "max_queries": 0,
+                    "serialize_time": 0.0,
+                    "render_time": 0.0,
+                },
+            )
+            totals["requests"] += 1
+            totals["time"] += duration
+            totals["max_time"] = max(totals["max_time"], duration)
+            totals["db_time"] += stats.db_time
+            totals["queries"] += stats.queries
+            totals["max_queries"] = max(totals["max_queries"], stats.queries)
+            totals["serialize_time"] += stats.serialize_time
+            totals["render_time"] += stats.render_time
+
+            now = time.monotonic()
+            if now - self._since < settings.REQUEST_STATS_LOG_INTERVAL:
+                return
+            views, self._views = self._views, {}
+            interval, self._since = now - self._since, now
+
+        for name, totals in sorted(views.items()):
+            count = totals["requests"]
+            logger.info(
+                json.dumps(
+                    {
+                        "event": "view_stats",
+                        "view": name,
+                        "interval_s": round(interval, 1),
+                        "requests": count,
+                        "avg_ms": round(totals["time"] / count * 1000, 2),
+                        "max_ms": round(totals["max_time"] * 1000, 2),
+                        "avg_queries": round(totals["queries"] / count, 2),
+                        "max_queries": totals["max_queries"],
+                        "avg_db_ms": round(totals["db_time"] / count * 1000, 2),
+                        "avg_serialize_ms": round(
+                            totals["serialize_time"] / count * 1000, 2
+                        ),
+                        "avg_render_ms": round(totals["render_time"] / count * 1000, 2),
+                    }
+                )
+            )
+
+
+view_stats = ViewStatsLog()
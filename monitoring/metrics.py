@@ -0,0 +1,80 @@
+"""
+Prometheus metrics.
+
+Request metrics are observed by InstrumentationMiddleware when
+METRICS_ENABLED is on. Cache, checkout and import counters are
+incremented where those things happen.
+
+Under gunicorn, each worker writes its samples to files in
+PROMETHEUS_MULTIPROC_DIR (set up by gunicorn.conf.py), and /metrics sums
+them, so any worker can answer a scrape for all of them. The variable
+must be set before prometheus_client is imported.
+"""
+
+from __future__ import annotations
+
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests by view, method and response status.",
+    ["view", "method", "status"],
+)
+LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time to produce a response, by view and method.",
+    ["view", "method"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL queries run per request, by view and method.",
+    ["view", "method"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144),
+)
+DB_TIME = Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent in SQL per request, by view and method.",
+    ["view", "method"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Application cache lookups by cache and result (hit or miss).",
+    ["cache", "result"],
+)
+CHECKOUTS = Counter(
+    "checkouts_total",
+    "Checkout attempts by outcome.",
+    ["result"],
+)
+PRODUCT_IMPORT_ROWS = Counter(
+    "product_import_rows_total",
+    "Rows processed by the product CSV import, by outcome.",
+    ["result"],
+)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a lookup in one of the application caches."""
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def render() -> tuple[bytes, str]:
+    """Current metrics in the Prometheus text format, and its content type."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
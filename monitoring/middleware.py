@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import cProfile
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable
+from contextvars import Token
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from monitoring import instrumentation, metrics, profiling, slow_queries
+from monitoring.instrumentation import RequestStats, current, view_name
+
+logger = logging.getLogger(__name__)
+
+# cProfile refuses a second active profiler (per thread before Python 3.12,
+# per process after), so a request selected while another is being
+# profiled runs unprofiled
+_profiling = threading.Lock()
+
+
+class InstrumentationMiddleware:
+    """
+    Count queries and time each request's DB, serialization and rendering.
+
+    With REQUEST_INSTRUMENTATION on, totals feed the per-view log lines
+    (see monitoring.instrumentation), and with
+    REQUEST_INSTRUMENTATION_HEADERS also Server-Timing (shown in browser
+    dev tools) and X-Query-Count response headers. With METRICS_ENABLED
+    on, they feed the Prometheus request metrics. With SLOW_QUERY_LOG on,
+    it names the view running each slow query and saves the slow-query
+    totals once the response is ready (see monitoring.slow_queries). Not
+    loaded when all three are off. Runs natively under WSGI and ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        if not (
+            settings.REQUEST_INSTRUMENTATION
+            or settings.METRICS_ENABLED
+            or settings.SLOW_QUERY_LOG
+        ):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # The handler runs sync hooks in a thread under ASGI
+            self.process_template_response = self._aprocess_template_response
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats, tokens, started = self._start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            self._reset(tokens)
+        if slow_queries.has_pending():
+            slow_queries.flush()
+        return self._finish(request, response, stats, started)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        stats, tokens, started = self._start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            self._reset(tokens)
+        if slow_queries.has_pending():
+            await sync_to_async(slow_queries.flush)()
+        return self._finish(request, response, stats, started)
+
+    @staticmethod
+    def _start(request: HttpRequest) -> tuple[RequestStats, tuple[Token, Token], float]:
+        stats = RequestStats()
+        tokens = (current.set(stats), slow_queries.current_request.set(request))
+        return stats, tokens, time.perf_counter()
+
+    @staticmethod
+    def _reset(tokens: tuple[Token, Token]) -> None:
+        stats_token, request_token = tokens
+        current.reset(stats_token)
+        slow_queries.current_request.reset(request_token)
+
+    @staticmethod
+    def _finish(
+        request: HttpRequest,
+        response: HttpResponse,
+        stats: RequestStats,
+        started: float,
+    ) -> HttpResponse:
+        duration = time.perf_counter() - started
+        name = view_name(request)
+
+        if settings.METRICS_ENABLED:
+            metrics.REQUESTS.labels(name, request.method, response.status_code).inc()
+            metrics.LATENCY.labels(name, request.method).observe(duration)
+            metrics.DB_QUERIES.labels(name, request.method).observe(stats.queries)
+            metrics.DB_TIME.labels(name, request.method).observe(stats.db_time)
+
+        if not settings.REQUEST_INSTRUMENTATION:
+            return response
+        instrumentation.view_stats.add(f"{request.method} {name}", stats, duration)
+        if settings.REQUEST_INSTRUMENTATION_HEADERS:
+            response["Server-Timing"] = ", ".join(
+                [
+                    f'db;dur={stats.db_time * 1000:.2f};desc="{stats.queries} queries"',
+                    f"serialize;dur={stats.serialize_time * 1000:.2f}",
+                    f"render;dur={stats.render_time * 1000:.2f}",
+                    f"total;dur={duration * 1000:.2f}",
+                ]
+            )
+            response["X-Query-Count"] = str(stats.queries)
+        return response
+
+    def process_template_response(
+        self, request: HttpRequest, response: HttpResponse
+    ) -> HttpResponse:
+        # Called just before the handler renders DRF and template responses
+        self._time_render(response)
+        return response
+
+    async def _aprocess_template_response(
+        self, request: HttpRequest, response: HttpResponse
+    ) -> HttpResponse:
+        self._time_render(response)
+        return response
+
+    @staticmethod
+    def _time_render(response: HttpResponse) -> None:
+        stats = current.get()
+        if stats is not None:
+            started = time.perf_counter()
+
+            def rendered(response: HttpResponse) -> None:
+                stats.render_time += time.perf_counter() - started
+
+            response.add_post_render_callback(rendered)
+
+
+class ProfilingMiddleware:
+    """
+    Run selected requests under cProfile (see monitoring.profiling).
+
+    Requests sending X-Profile are profiled when the user is staff, by
+    session or JWT; others are picked at PROFILING_SAMPLE_RATE. Profiled
+    responses name their profile in X-Profile-Id. Everything else costs
+    a header lookup and, with sampling on, one random number. One request
+    is profiled at a time; others selected meanwhile run unprofiled. Not
+    loaded unless PROFILING_ENABLED is on. Runs natively under WSGI and ASGI;
+    under ASGI the profiler runs on the event loop's thread, so a profile
+    also contains whatever other requests the loop ran meanwhile.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._selected(request) or not _profiling.acquire(blocking=False):
+            return self.get_response(request)
+
+        try:
+            profiler = cProfile.Profile()
+            started = time.perf_counter()
+            profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+        finally:
+            _profiling.release()
+        self._save(profiler, request, response, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        if "X-Profile" in request.headers:
+            # The session user is loaded from the database
+            selected = await sync_to_async(self._is_staff)(request)
+        else:
+            selected = self._sampled()
+        if not selected or not _profiling.acquire(blocking=False):
+            return await self.get_response(request)
+
+        try:
+            profiler = cProfile.Profile()
+            started = time.perf_counter()
+            profiler.enable()
+            try:
+                response = await self.get_response(request)
+            finally:
+                profiler.disable()
+        finally:
+            _profiling.release()
+        await sync_to_async(self._save)(
+            profiler, request, response, time.perf_counter() - started
+        )
+        return response
+
+    @staticmethod
+    def _save(
+        profiler: cProfile.Profile,
+        request: HttpRequest,
+        response: HttpResponse,
+        duration: float,
+    ) -> None:
+        try:
+            response["X-Profile-Id"] = profiling.save(profiler, request, duration)
+        except OSError:
+            logger.exception("Could not save profile for %s", request.path)
+
+    def _selected(self, request: HttpRequest) -> bool:
+        if "X-Profile" in request.headers:
+            return self._is_staff(request)
+        return self._sampled()
+
+    @staticmethod
+    def _sampled() -> bool:
+        rate = settings.PROFILING_SAMPLE_RATE
+        return rate > 0 and random.random() < rate
+
+    @staticmethod
+    def _is_staff(request: HttpRequest) -> bool:
+        if request.user.is_staff:
+            return True
+        try:
+            auth = JWTAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return False
+        return auth is not None and auth[0].is_staff
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from django.db import models
+
+from shared.models import BaseModel
+
+
+class SlowQuery(BaseModel):
+    """
+    Totals for one query shape that ran over SLOW_QUERY_THRESHOLD_MS.
+
+    Queries differing only in literal values share a fingerprint (see
+    monitoring.slow_queries). created_at is when the shape was first
+    seen slow; written only by monitoring.slow_queries.
+    """
+
+    fingerprint = models.CharField(max_length=40, unique=True)
+    sql = models.TextField()
+    database = models.CharField(max_length=100)
+    # Last view seen running it; blank outside requests
+    view = models.CharField(max_length=255, blank=True)
+    plan = models.TextField(blank=True)
+    calls = models.PositiveBigIntegerField(default=0)
+    total_ms = models.FloatField(default=0)
+    max_ms = models.FloatField(default=0)
+    last_seen = models.DateTimeField()
+
+    class Meta:
+        db_table = "slow_queries"
+        verbose_name_plural = "slow queries"
+        ordering = ["-total_ms"]
+
+    def __str__(self) -> str:
+        return self.sql[:80]
+
+    @property
+    def avg_ms(self) -> float:
+        """Mean duration of the slow executions."""
+        return self.total_ms / self.calls if self.calls else 0.0
@@ -0,0 +1,98 @@
+"""
+On-demand cProfile capture for live requests.
+
+A request is profiled when it carries an X-Profile header from a staff
+user (session or JWT), or when it is picked at PROFILING_SAMPLE_RATE.
+Profiles are pstats files in PROFILING_DIR, capped at PROFILING_MAX_FILES
+with the oldest removed first, and browsable at /admin/profiles/.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import itertools
+import os
+import pstats
+import re
+import time
+from pathlib import Path
+from typing import TypedDict
+
+from django.conf import settings
+from django.http import HttpRequest
+from django.utils.text import slugify
+
+PROFILE_NAME = re.compile(r"^[\w.-]+\.prof$")
+# Tells apart profiles a process saves within the same second
+_sequence = itertools.count(1)
+
+
+class ProfileInfo(TypedDict):
+    """A stored profile, as listed by the admin page."""
+
+    name: str
+    size: int
+    modified: float
+
+
+def profile_dir() -> Path:
+    return Path(settings.PROFILING_DIR)
+
+
+def save(profiler: cProfile.Profile, request: HttpRequest, duration: float) -> str:
+    """
+    Write a finished profile and drop the oldest beyond PROFILING_MAX_FILES.
+
+    Returns:
+        The profile's file name
+    """
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    name = "{stamp}-{pid}.{seq}-{method}-{path}-{ms}ms.prof".format(
+        stamp=time.strftime("%Y%m%dT%H%M%S"),
+        pid=os.getpid(),
+        seq=next(_sequence),
+        method=request.method.lower(),
+        path=slugify(request.path)[:60] or "root",
+        ms=round(duration * 1000),
+    )
+    # Write then rename, so the admin page never sees a partial file
+    partial = directory / f".{name}"
+    profiler.dump_stats(partial)
+    partial.rename(directory / name)
+
+    for stale in list_profiles()[settings.PROFILING_MAX_FILES :]:
+        (directory / stale["name"]).unlink(missing_ok=True)
+    return name
+
+
+def list_profiles() -> list[ProfileInfo]:
+    """Stored profiles, newest first."""
+    directory = profile_dir()
+    if not directory.is_dir():
+        return []
+    profiles = []
+    for entry in os.scandir(directory):
+        if PROFILE_NAME.match(entry.name) and not entry.name.startswith("."):
+            stat = entry.stat()
+            profiles.append(
+                ProfileInfo(name=entry.name, size=stat.st_size, modified=stat.st_mtime)
+            )
+    return sorted(profiles, key=lambda p: p["modified"], reverse=True)
+
+
+def profile_path(name: str) -> Path | None:
+    """Path of a stored profile, or None for unknown or unsafe names."""
+    if not PROFILE_NAME.match(name) or name.startswith("."):
+        return None
+    path = profile_dir() / name
+    return path if path.is_file() else None
+
+
+def summarize(path: Path, sort: str = "cumulative", limit: int = 60) -> str:
+    """The top functions of a profile as pstats prints them."""
+    out = io.StringIO()
+    stats = pstats.Stats(str(path), stream=out)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
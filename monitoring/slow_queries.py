@@ -0,0 +1,299 @@
+"""
+Slow-query log with EXPLAIN capture.
+
+install() adds a database execute wrapper that times every query. One
+taking SLOW_QUERY_THRESHOLD_MS or longer is:
+
+- logged as a JSON "slow_query" line with its normalized SQL, which
+  carries no parameter values, and the view that ran it
+- EXPLAINed on the connection that ran it, the first time this process
+  sees its fingerprint (EXPLAIN QUERY PLAN on SQLite, EXPLAIN on
+  PostgreSQL); only SELECT, UPDATE and DELETE statements, where an index
+  can help
+- added to per-fingerprint totals in memory, which InstrumentationMiddleware
+  saves to SlowQuery rows after each request, outside the request's
+  transactions. Outside a request, call flush() to save them.
+
+The EXPLAIN and the saves are not themselves timed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, TypedDict
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connections, transaction
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.http import HttpRequest
+from django.utils import timezone
+
+from monitoring.instrumentation import view_name
+
+logger = logging.getLogger(__name__)
+
+# Request running the current queries, set by InstrumentationMiddleware; its
+# view is looked up when a query is slow, after URL resolution
+current_request: ContextVar[HttpRequest | None] = ContextVar(
+    "slow_query_request", default=None
+)
+# Set while running our own EXPLAIN and saves, so they are not recorded
+_recording: ContextVar[bool] = ContextVar("slow_query_recording", default=False)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w\"$])\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\?")
+_LIST = r"\(\s*\?(?:\s*,\s*\?)*\s*\)"
+_IN_LIST = re.compile(rf"\bIN\s*{_LIST}", re.IGNORECASE)
+_ROWS = re.compile(rf"{_LIST}(?:\s*,\s*{_LIST})+")
+_SPACE = re.compile(r"\s+")
+_EXPLAINABLE = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+# Fingerprints with totals not yet saved; more are logged but not kept
+MAX_PENDING = 500
+# Fingerprints this process has EXPLAINed; forgotten when full
+MAX_EXPLAINED = 10_000
+
+
+class PendingTotals(TypedDict):
+    """Unsaved totals for one fingerprint."""
+
+    sql: str
+    database: str
+    view: str
+    plan: str
+    calls: int
+    total_ms: float
+    max_ms: float
+
+
+_lock = threading.Lock()
+_pending: dict[str, PendingTotals] = {}
+_explained: set[str] = set()
+
+
+def normalize(sql: str) -> str:
+    """
+    Reduce sql to its shape: literals and placeholders become ?, and IN
+    lists and multi-row VALUES of any length collapse to one form.
+
+    Args:
+        sql: SQL as passed to the cursor, with %s placeholders
+
+    Returns:
+        Normalized SQL on one line
+    """
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    sql = _ROWS.sub(lambda match: match.group(0).split(")", 1)[0] + "), ...", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+def fingerprint(normalized_sql: str) -> str:
+    """Stable key for a normalized query."""
+    return hashlib.sha1(normalized_sql.encode()).hexdigest()
+
+
+@contextmanager
+def _not_recorded() -> Iterator[None]:
+    token = _recording.set(True)
+    try:
+        yield
+    finally:
+        _recording.reset(token)
+
+
+def explain(connection: BaseDatabaseWrapper, sql: str, params: Any) -> str:
+    """
+    Plan the database would use for sql, or "" if it cannot be explained.
+
+    Args:
+        connection: Connection the query ran on
+        sql: The query, with %s placeholders
+        params: Its parameters
+
+    Returns:
+        One line per plan step
+    """
+    if not connection.features.supports_explaining_query_execution:
+        return ""
+    # A failed statement would abort the caller's PostgreSQL transaction
+    scope = (
+        transaction.atomic(using=connection.alias)
+        if connection.in_atomic_block
+        else nullcontext()
+    )
+    try:
+        with _not_recorded(), scope, connection.cursor() as cursor:
+            cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params)
+            rows = cursor.fetchall()
+    except DatabaseError:
+        logger.warning("Could not explain slow query", exc_info=True)
+        return ""
+    if connection.vendor != "sqlite":
+        return "\n".join(str(row[0]) for row in rows)
+    # EXPLAIN QUERY PLAN rows are (id, parent, notused, detail)
+    depth = {0: -1}
+    lines = []
+    for node, parent, _, detail in rows:
+        depth[node] = depth.get(parent, -1) + 1
+        lines.append(f"{'  ' * depth[node]}{detail}")
+    return "\n".join(lines)
+
+
+def _record(
+    connection: BaseDatabaseWrapper, sql: str, params: Any, many: bool, duration: float
+) -> None:
+    normalized = normalize(sql)
+    key = fingerprint(normalized)
+    request = current_request.get()
+    view = f"{request.method} {view_name(request)}" if request is not None else ""
+    duration_ms = duration * 1000
+    logger.warning(
+        json.dumps(
+            {
+                "event": "slow_query",
+                "fingerprint": key,
+                "duration_ms": round(duration_ms, 2),
+                "database": connection.alias,
+                "view": view,
+                "sql": normalized,
+            }
+        )
+    )
+
+    plan = ""
+    with _lock:
+        first_sighting = key not in _explained
+        if first_sighting:
+            if len(_explained) >= MAX_EXPLAINED:
+                _explained.clear()
+            _explained.add(key)
+    if (
+        first_sighting
+        and not many
+        and sql.lstrip()[:6].upper().startswith(_EXPLAINABLE)
+    ):
+        plan = explain(connection, sql, params)
+
+    with _lock:
+        totals = _pending.get(key)
+        if totals is None:
+            if len(_pending) >= MAX_PENDING:
+                return
+            totals = _pending[key] = PendingTotals(
+                sql=normalized,
+                database=connection.alias,
+                view=view,
+                plan="",
+                calls=0,
+                total_ms=0.0,
+                max_ms=0.0,
+            )
+        totals["calls"] += 1
+        totals["total_ms"] += duration_ms
+        totals["max_ms"] = max(totals["max_ms"], duration_ms)
+        totals["view"] = view or totals["view"]
+        totals["plan"] = plan or totals["plan"]
+
+
+def log_slow_query(
+    execute: Callable, sql: str, params: Any, many: bool, context: dict
+) -> Any:
+    """Database execute wrapper recording queries over SLOW_QUERY_THRESHOLD_MS."""
+    if _recording.get() or not settings.SLOW_QUERY_LOG:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    # Failed queries are not recorded; the caller sees the error
+    result = execute(sql, params, many, context)
+    duration = time.perf_counter() - started
+    if duration * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+        _record(context["connection"], sql, params, many, duration)
+    return result
+
+
+def has_pending() -> bool:
+    """Whether flush() has anything to save."""
+    return bool(_pending)
+
+
+def flush() -> None:
+    """
+    Add the unsaved totals to their SlowQuery rows.
+
+    Database errors are logged and the totals dropped, so a locked or
+    unavailable database never fails the request being finished.
+    """
+    from monitoring.models import SlowQuery
+
+    global _pending
+    with _lock:
+        pending, _pending = _pending, {}
+    if not pending:
+        return
+
+    now = timezone.now()
+    with _not_recorded():
+        for key, totals in pending.items():
+            changes: dict[str, Any] = {
+                "calls": F("calls") + totals["calls"],
+                "total_ms": F("total_ms") + totals["total_ms"],
+                "max_ms": Greatest(F("max_ms"), Value(totals["max_ms"])),
+                "last_seen": now,
+            }
+            if totals["view"]:
+                changes["view"] = totals["view"]
+            if totals["plan"]:
+                changes["plan"] = totals["plan"]
+            try:
+                if SlowQuery.objects.filter(fingerprint=key).update(**changes):
+                    continue
+                try:
+                    with transaction.atomic():
+                        SlowQuery.objects.create(
+                            fingerprint=key, last_seen=now, **totals
+                        )
+                    if not totals["plan"]:
+                        # The row was deleted since this process explained
+                        # it; explain again next time it runs slow
+                        with _lock:
+                            _explained.discard(key)
+                except IntegrityError:
+                    # Another process saved it first
+                    SlowQuery.objects.filter(fingerprint=key).update(**changes)
+            except DatabaseError:
+                logger.exception("Could not save slow query %s", key)
+
+
+def _add_wrapper(sender: Any, connection: BaseDatabaseWrapper, **kwargs: Any) -> None:
+    # Fires again when a persistent connection reconnects
+    if log_slow_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(log_slow_query)
+
+
+_installed = False
+
+
+def install() -> None:
+    """Hook database connections; safe to call twice."""
+    global _installed
+    if _installed:
+        return
+    _installed = True
+
+    connection_created.connect(_add_wrapper, dispatch_uid="monitoring.log_slow_query")
+    for connection in connections.all(initialized_only=True):
+        _add_wrapper(None, connection)
@@ -0,0 +1,147 @@
+"""Tests for Prometheus metrics and the /metrics endpoint."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from django.conf import settings as django_settings
+from django.test import Client
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework.test import APIClient
+
+from monitoring import instrumentation
+from products.models import Category, Product
+
+
+def sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def metrics_on(settings):
+    """Enable request metrics."""
+    instrumentation.install()
+    settings.METRICS_ENABLED = True
+    settings.METRICS_AUTH_TOKEN = ""
+    return settings
+
+
+@pytest.fixture
+def product(db) -> Product:
+    """Create a test product."""
+    category = Category.objects.create(name="Hats")
+    return Product.objects.create(
+        name="Test Hat", price=Decimal("10.00"), category=category, stock=5
+    )
+
+
+@pytest.mark.django_db
+class TestRequestMetrics:
+    """Tests for metrics observed by the middleware."""
+
+    def test_request_counted_with_latency_and_queries(
+        self, metrics_on, api_client: APIClient, product: Product
+    ) -> None:
+        labels = {"view": "product-list", "method": "GET"}
+        requests = sample("http_requests_total", status="200", **labels)
+        observed = sample("http_request_duration_seconds_count", **labels)
+        queries = sample("http_request_db_queries_sum", **labels)
+
+        api_client.get(reverse("product-list"))
+
+        assert sample("http_requests_total", status="200", **labels) == requests + 1
+        assert sample("http_request_duration_seconds_count", **labels) == observed + 1
+        assert sample("http_request_db_queries_sum", **labels) > queries
+
+    def test_cache_hits_and_misses(
+        self, metrics_on, api_client: APIClient, product: Product
+    ) -> None:
+        hits = sample("cache_requests_total", cache="storefront", result="hit")
+        misses = sample("cache_requests_total", cache="storefront", result="miss")
+
+        api_client.get(reverse("storefront-home"))
+        api_client.get(reverse("storefront-home"))
+
+        assert (
+            sample("cache_requests_total", cache="storefront", result="miss")
+            >= misses + 1
+        )
+        assert (
+            sample("cache_requests_total", cache="storefront", result="hit") >= hits + 1
+        )
+
+    def test_checkout_counted(self, api_client: APIClient, product: Product) -> None:
+        placed = sample("checkouts_total", result="placed")
+        api_client.post(
+            reverse("cart-items"), {"product_id": str(product.id), "quantity": 1}
+        )
+
+        api_client.post(
+            reverse("checkout"),
+            {
+                "email": "test@example.com",
+                "name": "John Doe",
+                "address_line_1": "123 Test St",
+                "city": "New York",
+                "state": "NY",
+                "postal_code": "10001",
+            },
+        )
+
+        assert sample("checkouts_total", result="placed") == placed + 1
+
+
+@pytest.mark.django_db
+class TestMetricsView:
+    """Tests for GET /metrics."""
+
+    def test_exposition_format(self, metrics_on, client: Client) -> None:
+        response = client.get(reverse("metrics"))
+
+        assert response.status_code == 200
+        assert response["Content-Type"].startswith("text/plain")
+        assert b"# TYPE http_requests_total counter" in response.content
+
+    def test_disabled(self, settings, client: Client) -> None:
+        settings.METRICS_ENABLED = False
+
+        assert client.get(reverse("metrics")).status_code == 404
+
+    def test_token_required(self, metrics_on, client: Client) -> None:
+        metrics_on.METRICS_AUTH_TOKEN = "s3cret"
+
+        assert client.get(reverse("metrics")).status_code == 401
+        response = client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer s3cret")
+        assert response.status_code == 200
+
+    def test_sums_across_processes(
+        self,
+        metrics_on,
+        client: Client,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Samples written by separate worker processes are added up."""
+        env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+        for _ in range(2):
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-c",
+                    "from monitoring.metrics import CHECKOUTS; CHECKOUTS.labels('placed').inc()",
+                ],
+                env=env,
+                cwd=django_settings.BASE_DIR,
+                check=True,
+            )
+        monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+        response = client.get(reverse("metrics"))
+
+        assert b'checkouts_total{result="placed"} 2.0' in response.content
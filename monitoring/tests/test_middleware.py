@@ -0,0 +1,98 @@
+"""Tests for per-request instrumentation."""
+
+from __future__ import annotations
+
+import json
+import logging
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from monitoring import instrumentation
+from products.models import Category, Product
+
+
+@pytest.fixture
+def instrumented(settings, monkeypatch: pytest.MonkeyPatch):
+    """Enable instrumentation with response headers and fresh per-view totals."""
+    instrumentation.install()
+    settings.REQUEST_INSTRUMENTATION = True
+    settings.REQUEST_INSTRUMENTATION_HEADERS = True
+    monkeypatch.setattr(instrumentation, "view_stats", instrumentation.ViewStatsLog())
+    return settings
+
+
+@pytest.fixture
+def products(db) -> list[Product]:
+    """Create three active products."""
+    category = Category.objects.create(name="Hats")
+    return [
+        Product.objects.create(
+            name=f"Hat {i}", price=Decimal("10.00"), category=category, stock=1
+        )
+        for i in range(3)
+    ]
+
+
+def parse_server_timing(header: str) -> dict[str, float]:
+    metrics = {}
+    for metric in header.split(", "):
+        name, dur = metric.split(";")[:2]
+        metrics[name] = float(dur.removeprefix("dur="))
+    return metrics
+
+
+@pytest.mark.django_db
+class TestInstrumentationMiddleware:
+    """Tests for InstrumentationMiddleware."""
+
+    def test_headers_report_queries_and_phases(
+        self, instrumented, api_client: APIClient, products: list[Product]
+    ) -> None:
+        """X-Query-Count matches the queries run; Server-Timing has every phase."""
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(reverse("product-list"))
+
+        assert int(response["X-Query-Count"]) == len(ctx.captured_queries)
+        timing = parse_server_timing(response["Server-Timing"])
+        assert set(timing) == {"db", "serialize", "render", "total"}
+        assert timing["serialize"] > 0 and timing["render"] > 0
+        assert timing["total"] >= timing["db"]
+
+    def test_headers_off(self, instrumented, api_client: APIClient, products) -> None:
+        """Without REQUEST_INSTRUMENTATION_HEADERS nothing is exposed."""
+        instrumented.REQUEST_INSTRUMENTATION_HEADERS = False
+
+        response = api_client.get(reverse("product-list"))
+
+        assert "Server-Timing" not in response
+        assert "X-Query-Count" not in response
+
+    def test_disabled_by_default(
+        self, settings, api_client: APIClient, products
+    ) -> None:
+        """The middleware unloads itself when instrumentation is off."""
+        settings.REQUEST_INSTRUMENTATION = False
+
+        response = api_client.get(reverse("product-list"))
+
+        assert "X-Query-Count" not in response
+
+    def test_per_view_log_lines(
+        self, instrumented, api_client: APIClient, products, caplog
+    ) -> None:
+        """Each flush logs one JSON line per view with averaged counts."""
+        instrumented.REQUEST_STATS_LOG_INTERVAL = 0
+
+        with caplog.at_level(logging.INFO, logger="monitoring.instrumentation"):
+            api_client.get(reverse("product-list"))
+
+        line = json.loads(caplog.records[-1].getMessage())
+        assert line["event"] == "view_stats"
+        assert line["view"] == "GET product-list"
+        assert line["requests"] == 1
+        assert line["max_queries"] >= 1
@@ -0,0 +1,126 @@
+"""Tests for on-demand request profiling."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from django.http import HttpRequest, HttpResponse
+from django.test import Client, RequestFactory
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from monitoring import profiling
+from monitoring.middleware import ProfilingMiddleware
+
+
+@pytest.fixture
+def profiling_on(settings, tmp_path: Path):
+    """Enable profiling into a temporary directory."""
+    settings.PROFILING_ENABLED = True
+    settings.PROFILING_SAMPLE_RATE = 0
+    settings.PROFILING_DIR = str(tmp_path)
+    return settings
+
+
+@pytest.mark.django_db
+class TestProfilingMiddleware:
+    """Tests for ProfilingMiddleware."""
+
+    def test_staff_header_profiles_request(
+        self, profiling_on, staff_client: APIClient
+    ) -> None:
+        """A staff JWT with X-Profile gets a stored, readable profile."""
+        response = staff_client.get(reverse("product-list"), HTTP_X_PROFILE="1")
+
+        name = response["X-Profile-Id"]
+        assert [p["name"] for p in profiling.list_profiles()] == [name]
+        # Not cut off by the top-N limit, whichever functions rank first
+        summary = profiling.summarize(profiling.profile_path(name), limit=10_000)
+        assert "get_queryset" in summary
+
+    def test_header_ignored_for_non_staff(
+        self, profiling_on, api_client: APIClient
+    ) -> None:
+        response = api_client.get(reverse("product-list"), HTTP_X_PROFILE="1")
+
+        assert "X-Profile-Id" not in response
+        assert profiling.list_profiles() == []
+
+    def test_sampling(self, profiling_on, api_client: APIClient) -> None:
+        profiling_on.PROFILING_SAMPLE_RATE = 1
+
+        response = api_client.get(reverse("product-list"))
+
+        assert "X-Profile-Id" in response
+
+    def test_oldest_profiles_rotated_out(
+        self, profiling_on, api_client: APIClient
+    ) -> None:
+        profiling_on.PROFILING_SAMPLE_RATE = 1
+        profiling_on.PROFILING_MAX_FILES = 2
+
+        names = [
+            api_client.get(reverse("product-list"))["X-Profile-Id"] for _ in range(3)
+        ]
+
+        assert {p["name"] for p in profiling.list_profiles()} <= set(names)
+        assert len(profiling.list_profiles()) == 2
+
+    def test_overlapping_request_served_unprofiled(self, profiling_on) -> None:
+        """A request arriving while another is profiled is served without a profile."""
+        profiling_on.PROFILING_SAMPLE_RATE = 1
+        factory = RequestFactory()
+        inner = ProfilingMiddleware(lambda request: HttpResponse("inner"))
+        overlapped: list[HttpResponse] = []
+
+        def view(request: HttpRequest) -> HttpResponse:
+            overlapped.append(inner(factory.get("/inner/")))
+            return HttpResponse("outer")
+
+        response = ProfilingMiddleware(view)(factory.get("/outer/"))
+
+        assert overlapped[0].status_code == 200
+        assert "X-Profile-Id" not in overlapped[0]
+        assert [p["name"] for p in profiling.list_profiles()] == [
+            response["X-Profile-Id"]
+        ]
+
+
+@pytest.mark.django_db
+class TestProfileAdmin:
+    """Tests for the staff profile pages."""
+
+    @pytest.fixture
+    def profile_name(self, profiling_on) -> str:
+        profiling_on.PROFILING_SAMPLE_RATE = 1
+        return APIClient().get(reverse("product-list"))["X-Profile-Id"]
+
+    def test_list_detail_and_download(
+        self, admin_client: Client, profile_name: str, settings
+    ) -> None:
+        # Admin templates need static files; the manifest only exists after collectstatic
+        settings.STORAGES = {
+            **settings.STORAGES,
+            "staticfiles": {
+                "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+            },
+        }
+
+        listing = admin_client.get(reverse("profile-list"))
+        detail = admin_client.get(reverse("profile-detail", args=[profile_name]))
+        download = admin_client.get(reverse("profile-download", args=[profile_name]))
+
+        assert profile_name in listing.content.decode()
+        assert "function calls" in detail.content.decode()
+        assert download["Content-Disposition"].startswith("attachment")
+
+    def test_staff_only(self, client: Client, profile_name: str) -> None:
+        response = client.get(reverse("profile-list"))
+
+        assert response.status_code == 302  # to the admin login
+
+    def test_unknown_or_unsafe_names(self, admin_client: Client, profiling_on) -> None:
+        for name in ["missing.prof", "..%2Fsettings.py"]:
+            response = admin_client.get(reverse("profile-download", args=[name]))
+            assert response.status_code == 404
@@ -0,0 +1,183 @@
+"""Tests for the slow-query log."""
+
+from __future__ import annotations
+
+import json
+import logging
+from decimal import Decimal
+
+import pytest
+from django.db import transaction
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from monitoring import slow_queries
+from monitoring.models import SlowQuery
+from products.models import Category, Product
+
+
+@pytest.fixture
+def slow_log(settings, monkeypatch: pytest.MonkeyPatch):
+    """Log every query as slow, starting from empty in-memory totals."""
+    slow_queries.install()
+    settings.SLOW_QUERY_LOG = True
+    settings.SLOW_QUERY_THRESHOLD_MS = 0
+    monkeypatch.setattr(slow_queries, "_pending", {})
+    monkeypatch.setattr(slow_queries, "_explained", set())
+    return settings
+
+
+@pytest.fixture
+def products(db) -> list[Product]:
+    """Create two active products."""
+    category = Category.objects.create(name="Hats")
+    return [
+        Product.objects.create(
+            name=f"Hat {i}", price=Decimal("10.00"), category=category, stock=1
+        )
+        for i in range(2)
+    ]
+
+
+class TestNormalize:
+    """Tests for normalize()."""
+
+    def test_literals_and_placeholders(self) -> None:
+        sql = """SELECT "a"."id" FROM "t1" "a" WHERE "a"."name" = 'it''s' AND "a"."n" > 10 AND "a"."x" = %s LIMIT 21"""
+
+        assert slow_queries.normalize(sql) == (
+            'SELECT "a"."id" FROM "t1" "a" WHERE "a"."name" = ? AND "a"."n" > ? '
+            'AND "a"."x" = ? LIMIT ?'
+        )
+
+    def test_lists_of_any_length_share_a_fingerprint(self) -> None:
+        short = slow_queries.normalize('SELECT * FROM "t" WHERE "id" IN (%s)')
+        long = slow_queries.normalize('SELECT * FROM "t" WHERE "id" IN (%s, %s,\n %s)')
+        rows = slow_queries.normalize(
+            'INSERT INTO "t" ("a", "b") VALUES (%s, %s), (%s, %s)'
+        )
+
+        assert short == long == 'SELECT * FROM "t" WHERE "id" IN (...)'
+        assert slow_queries.fingerprint(short) == slow_queries.fingerprint(long)
+        assert rows == 'INSERT INTO "t" ("a", "b") VALUES (?, ?), ...'
+
+
+@pytest.mark.django_db
+class TestSlowQueryLog:
+    """Tests for the execute wrapper and flush()."""
+
+    def test_request_queries_saved_with_view_and_plan(
+        self, slow_log, products: list[Product], api_client: APIClient
+    ) -> None:
+        response = api_client.get(reverse("product-list"))
+
+        assert response.status_code == 200
+        listing = SlowQuery.objects.get(
+            sql__startswith='SELECT "products"."id"', sql__contains="LIMIT"
+        )
+        assert listing.view == "GET product-list"
+        assert listing.calls == 1
+        assert listing.total_ms >= listing.max_ms > 0
+        assert "products" in listing.plan
+        # Neither the EXPLAIN nor the saves are recorded themselves
+        assert not SlowQuery.objects.filter(sql__contains="slow_queries").exists()
+        assert not SlowQuery.objects.filter(sql__startswith="EXPLAIN").exists()
+
+    def test_repeats_add_to_one_row(
+        self, slow_log, products: list[Product], api_client: APIClient
+    ) -> None:
+        for product in products:
+            api_client.get(reverse("product-detail", args=[product.slug]))
+
+        lookup = SlowQuery.objects.get(
+            sql__startswith='SELECT "products"."id"',
+            sql__contains='"products"."slug" = ?',
+        )
+        assert lookup.calls == 2
+        assert lookup.view == "GET product-detail"
+        assert lookup.plan
+
+    def test_deleted_row_gets_a_new_plan(
+        self, slow_log, products: list[Product], api_client: APIClient
+    ) -> None:
+        url = reverse("product-detail", args=[products[0].slug])
+        api_client.get(url)
+        SlowQuery.objects.all().delete()
+
+        api_client.get(url)
+        api_client.get(url)
+
+        lookup = SlowQuery.objects.get(
+            sql__startswith='SELECT "products"."id"',
+            sql__contains='"products"."slug" = ?',
+        )
+        assert lookup.calls == 2
+        assert lookup.plan
+
+    def test_logged_without_parameters(
+        self, slow_log, products: list[Product], caplog: pytest.LogCaptureFixture
+    ) -> None:
+        with caplog.at_level(logging.WARNING, logger="monitoring.slow_queries"):
+            Product.objects.filter(slug=products[0].slug).first()
+
+        lines = [json.loads(record.getMessage()) for record in caplog.records]
+        line = next(line for line in lines if '"products"."slug" = ?' in line["sql"])
+        assert line["event"] == "slow_query"
+        assert line["database"] == "default"
+        assert products[0].slug not in json.dumps(lines)
+
+    def test_fast_queries_ignored(
+        self, products: list[Product], slow_log, api_client: APIClient
+    ) -> None:
+        slow_log.SLOW_QUERY_THRESHOLD_MS = 60_000
+
+        api_client.get(reverse("product-list"))
+
+        assert not SlowQuery.objects.exists()
+
+    def test_explain_inside_transaction(
+        self, slow_log, products: list[Product]
+    ) -> None:
+        with transaction.atomic():
+            Product.objects.filter(is_active=True).count()
+            # The transaction is still usable after the EXPLAIN
+            assert Product.objects.count() == 2
+
+        slow_queries.flush()
+
+        row = SlowQuery.objects.get(sql__contains='WHERE "products"."is_active"')
+        assert row.plan
+        assert row.view == ""
+
+
+@pytest.mark.django_db
+class TestSlowQueryAdmin:
+    """Tests for the admin report."""
+
+    def test_ranked_by_total_time(self, admin_client: Client, settings) -> None:
+        # Admin templates need static files; the manifest only exists after collectstatic
+        settings.STORAGES = {
+            **settings.STORAGES,
+            "staticfiles": {
+                "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+            },
+        }
+        now = timezone.now()
+        for sql, total in [("SELECT cheap", 5.0), ("SELECT costly", 900.0)]:
+            SlowQuery.objects.create(
+                fingerprint=slow_queries.fingerprint(sql),
+                sql=sql,
+                database="default",
+                calls=3,
+                total_ms=total,
+                max_ms=total,
+                last_seen=now,
+            )
+
+        response = admin_client.get(reverse("admin:monitoring_slowquery_changelist"))
+
+        assert response.status_code == 200
+        content = response.content.decode()
+        assert content.index("SELECT costly") < content.index("SELECT cheap")
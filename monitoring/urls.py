@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from django.urls import path
+
+from monitoring.views import profile_detail, profile_download, profile_list
+
+urlpatterns = [
+    path("profiles/", profile_list, name="profile-list"),
+    path("profiles/<str:name>/", profile_detail, name="profile-detail"),
+    path("profiles/<str:name>/download/", profile_download, name="profile-download"),
+]
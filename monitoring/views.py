@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import hmac
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import FileResponse, Http404, HttpRequest, HttpResponse
+from django.shortcuts import render
+
+from monitoring import metrics, profiling
+
+PROFILE_SORTS = {"cumulative", "tottime", "ncalls"}
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """
+    GET /metrics - Prometheus scrape endpoint.
+
+    404 unless METRICS_ENABLED. When METRICS_AUTH_TOKEN is set, scrapes
+    must send it as a bearer token.
+    """
+    if not settings.METRICS_ENABLED:
+        raise Http404
+    token = settings.METRICS_AUTH_TOKEN
+    if token and not hmac.compare_digest(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponse(status=401, headers={"WWW-Authenticate": "Bearer"})
+    body, content_type = metrics.render()
+    return HttpResponse(body, content_type=content_type)
+
+
+@staff_member_required
+def profile_list(request: HttpRequest) -> HttpResponse:
+    """GET /admin/profiles/ - Captured request profiles, newest first."""
+    profiles = [
+        {**info, "captured": datetime.fromtimestamp(info["modified"], tz=timezone.utc)}
+        for info in profiling.list_profiles()
+    ]
+    return render(
+        request,
+        "monitoring/profiles.html",
+        {
+            **admin.site.each_context(request),
+            "title": "Request profiles",
+            "profiles": profiles,
+        },
+    )
+
+
+@staff_member_required
+def profile_detail(request: HttpRequest, name: str) -> HttpResponse:
+    """GET /admin/profiles/{name}/ - Top functions of one profile."""
+    path = profiling.profile_path(name)
+    if path is None:
+        raise Http404
+    sort = request.GET.get("sort", "cumulative")
+    if sort not in PROFILE_SORTS:
+        sort = "cumulative"
+    return render(
+        request,
+        "monitoring/profiles.html",
+        {
+            **admin.site.each_context(request),
+            "title": name,
+            "profile": name,
+            "summary": profiling.summarize(path, sort),
+        },
+    )
+
+
+@staff_member_required
+def profile_download(request: HttpRequest, name: str) -> FileResponse:
+    """GET /admin/profiles/{name}/download/ - The raw pstats file."""
+    path = profiling.profile_path(name)
+    if path is None:
+        raise Http404
+    return FileResponse(path.open("rb"), as_attachment=True, filename=name)
@@ -0,0 +1,34 @@
+"""
+Shipping address deduplication.
+
+Addresses are immutable and stored once per normalized content hash, so
+repeat customers shipping to the same place share a row. The hash covers
+every field, including the recipient name.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any
+
+
+ADDRESS_FIELDS = [
+    "name",
+    "address_line_1",
+    "address_line_2",
+    "city",
+    "state",
+    "postal_code",
+    "country",
+]
+
+
+def normalize(value: str) -> str:
+    """Case-fold and collapse whitespace so trivial variations match."""
+    return " ".join(value.split()).casefold()
+
+
+def address_hash(fields: dict[str, Any]) -> str:
+    """SHA-256 of the normalized address fields."""
+    joined = "\x1f".join(normalize(fields.get(name) or "") for name in ADDRESS_FIELDS)
+    return hashlib.sha256(joined.encode()).hexdigest()
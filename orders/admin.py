@@ -1,8 +1,18 @@
 from __future__ import annotations
 
 from django.contrib import admin
+from django.utils import timezone
 
-from orders.models import Order, OrderItem, ShippingAddress
+from orders.models import (
+    ArchivedOrder,
+    ArchivedOrderItem,
+    Order,
+    OrderItem,
+    OrderStatusChange,
+    OutboxEvent,
+    ShippingAddress,
+)
+from orders.transitions import transition_orders
 
 
 class OrderItemInline(admin.TabularInline):
@@ -20,6 +30,10 @@ class ShippingAddressAdmin(admin.ModelAdmin):
     list_display = ["name", "city", "state", "country", "created_at"]
     search_fields = ["name", "city", "state"]
 
+    # Shared between orders, so an edit would rewrite every one of them
+    def has_change_permission(self, request, obj=None) -> bool:
+        return False
+
 
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
@@ -28,13 +42,40 @@ class OrderAdmin(admin.ModelAdmin):
     list_display = ["id", "email", "status", "total_price", "item_count", "created_at"]
     list_filter = ["status", "created_at"]
     search_fields = ["email", "id"]
-    readonly_fields = ["total_price"]
+    # Status changes go through the actions, which audit them and reverse
+    # the sales rollup on cancellation (see orders.transitions)
+    readonly_fields = ["status", "total_price", "item_count"]
     inlines = [OrderItemInline]
-
-    def item_count(self, obj: Order) -> int:
-        return obj.item_count
-
-    item_count.short_description = "Items"
+    actions = ["mark_paid", "mark_shipped", "mark_delivered", "mark_cancelled"]
+
+    def _transition(self, request, queryset, to_status: str) -> None:
+        # Ids only: the queryset may span every page of the changelist
+        result = transition_orders(
+            list(queryset.values_list("pk", flat=True)),
+            to_status,
+            changed_by=request.user,
+        )
+        self.message_user(
+            request,
+            f"Marked {result['updated']} orders as {Order.Status(to_status).label}; "
+            f"skipped {result['skipped']} that cannot make this transition.",
+        )
+
+    @admin.action(description="Mark selected orders as paid")
+    def mark_paid(self, request, queryset) -> None:
+        self._transition(request, queryset, Order.Status.PAID)
+
+    @admin.action(description="Mark selected orders as shipped")
+    def mark_shipped(self, request, queryset) -> None:
+        self._transition(request, queryset, Order.Status.SHIPPED)
+
+    @admin.action(description="Mark selected orders as delivered")
+    def mark_delivered(self, request, queryset) -> None:
+        self._transition(request, queryset, Order.Status.DELIVERED)
+
+    @admin.action(description="Mark selected orders as cancelled")
+    def mark_cancelled(self, request, queryset) -> None:
+        self._transition(request, queryset, Order.Status.CANCELLED)
 
 
 @admin.register(OrderItem)
@@ -44,3 +85,62 @@ class OrderItemAdmin(admin.ModelAdmin):
     list_display = ["order", "product_name", "quantity", "price_at_purchase", "subtotal"]
     list_filter = ["order__status"]
     search_fields = ["product_name", "order__email"]
+
+
+@admin.register(OrderStatusChange)
+class OrderStatusChangeAdmin(admin.ModelAdmin):
+    """Read-only admin for the order status audit trail."""
+
+    list_display = ["order_id", "from_status", "to_status", "changed_by", "created_at"]
+    list_filter = ["to_status", "created_at"]
+    search_fields = ["order_id", "note"]
+
+    def has_add_permission(self, request) -> bool:
+        return False
+
+    def has_change_permission(self, request, obj=None) -> bool:
+        return False
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    """Admin configuration for OutboxEvent model."""
+
+    list_display = ["topic", "status", "attempts", "available_at", "created_at"]
+    list_filter = ["status", "topic"]
+    readonly_fields = ["topic", "payload", "attempts", "last_error"]
+    actions = ["requeue"]
+
+    @admin.action(description="Requeue selected events")
+    def requeue(self, request, queryset) -> None:
+        updated = queryset.update(
+            status=OutboxEvent.Status.PENDING,
+            attempts=0,
+            available_at=timezone.now(),
+        )
+        self.message_user(request, f"Requeued {updated} events.")
+
+
+class ArchivedOrderItemInline(admin.TabularInline):
+    """Inline admin for archived order items."""
+
+    model = ArchivedOrderItem
+    extra = 0
+    can_delete = False
+    readonly_fields = ["product", "product_name", "quantity", "price_at_purchase"]
+
+
+@admin.register(ArchivedOrder)
+class ArchivedOrderAdmin(admin.ModelAdmin):
+    """Read-only admin for orders moved out by the archival job."""
+
+    list_display = ["id", "email", "status", "total_price", "created_at", "archived_at"]
+    list_filter = ["status"]
+    search_fields = ["email", "id"]
+    inlines = [ArchivedOrderItemInline]
+
+    def has_add_permission(self, request) -> bool:
+        return False
+
+    def has_change_permission(self, request, obj=None) -> bool:
+        return False
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from orders.export import FORMATS, iter_rows
+from orders.serializers import OrderExportQuerySerializer, OrderTransitionSerializer
+from orders.transitions import transition_orders
+
+
+class OrderExportView(APIView):
+    """
+    Admin endpoint streaming orders for accounting.
+
+    GET /api/admin/orders/export/
+
+    Query params:
+    - start: First order date, YYYY-MM-DD (required)
+    - end: Last order date, YYYY-MM-DD, inclusive (required)
+    - file_format: "csv" (default) or "ndjson"
+    - cursor: Resume after the row carrying this cursor value
+
+    One row per order item, with order and shipping address columns
+    repeated. Each row's last column is its cursor; after a dropped
+    connection, pass the last received cursor to continue.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request: Request) -> StreamingHttpResponse | Response:
+        query = OrderExportQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        params = query.validated_data
+        render, content_type = FORMATS[params["file_format"]]
+        rows = iter_rows(
+            params["since"],
+            params["until"],
+            cursor=params.get("cursor"),
+            chunk_size=settings.ORDER_EXPORT_CHUNK_SIZE,
+        )
+        response = StreamingHttpResponse(
+            render(rows, header=not params.get("cursor")),
+            content_type=content_type,
+        )
+        filename = f"orders-{params['start']}-{params['end']}.{params['file_format']}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class OrderTransitionView(APIView):
+    """
+    Admin endpoint for moving orders between statuses in bulk.
+
+    POST /api/admin/orders/transition/
+
+    Body:
+    - order_ids: Up to 10,000 order ids
+    - status: Target status
+    - note: Optional reason, stored on the audit trail
+
+    Orders whose current status cannot move to the target are skipped and
+    counted in the response.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def post(self, request: Request) -> Response:
+        serializer = OrderTransitionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        data = serializer.validated_data
+        result = transition_orders(
+            data["order_ids"],
+            data["status"],
+            changed_by=request.user,
+            note=data.get("note", ""),
+        )
+        return Response(result)
@@ -8,3 +8,6 @@ class OrdersConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "orders"
+
+    def ready(self) -> None:
+        from orders import signals  # noqa: F401
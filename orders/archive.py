@@ -0,0 +1,119 @@
+"""
+Hot/cold partitioning of orders.
+
+Delivered and cancelled orders older than ORDER_ARCHIVE_AFTER are moved,
+with their items, from orders/order_items into archived_orders and
+archived_order_items, with the shipping address copied onto the archived
+row. Address rows are kept even when no live order uses them any more:
+checkout reuses them by content hash, and deleting one between checkout's
+lookup and its order insert would fail that checkout. The hot tables, and every index on them, only hold recent and in-flight
+orders; OrderViewSet.retrieve falls back to the archive by id.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from orders.models import (
+    ArchivedOrder,
+    ArchivedOrderItem,
+    Order,
+    OrderItem,
+)
+from shared.db import retry_on_db_lock
+
+TERMINAL_STATUSES = [Order.Status.DELIVERED, Order.Status.CANCELLED]
+
+
+def _archive_order(order: Order) -> ArchivedOrder:
+    address = order.shipping_address
+    return ArchivedOrder(
+        id=order.id,
+        created_at=order.created_at,
+        updated_at=order.updated_at,
+        user_id=order.user_id,
+        email=order.email,
+        status=order.status,
+        total_price=order.total_price,
+        item_count=order.item_count,
+        shipping_address_id=address.id,
+        shipping_name=address.name,
+        shipping_address_line_1=address.address_line_1,
+        shipping_address_line_2=address.address_line_2,
+        shipping_city=address.city,
+        shipping_state=address.state,
+        shipping_postal_code=address.postal_code,
+        shipping_country=address.country,
+    )
+
+
+def _archive_item(item: OrderItem) -> ArchivedOrderItem:
+    return ArchivedOrderItem(
+        id=item.id,
+        created_at=item.created_at,
+        order_id=item.order_id,
+        product_id=item.product_id,
+        product_name=item.product_name,
+        quantity=item.quantity,
+        price_at_purchase=item.price_at_purchase,
+    )
+
+
+@retry_on_db_lock
+def archive_batch(cutoff: datetime, batch_size: int = 500) -> int:
+    """
+    Move one batch of terminal orders created before cutoff.
+
+    Copy and delete happen in a single transaction, so an order is always
+    in exactly one of the hot and archive tables. Retried when SQLite
+    reports the database locked.
+
+    Returns:
+        Number of orders archived; 0 when nothing is left to move
+    """
+    with transaction.atomic():
+        orders = list(
+            Order.objects.select_for_update(skip_locked=True)
+            .select_related("shipping_address")
+            .filter(created_at__lt=cutoff, status__in=TERMINAL_STATUSES)
+            .order_by("created_at", "id")[:batch_size]
+        )
+        if not orders:
+            return 0
+
+        order_ids = [order.id for order in orders]
+        items = OrderItem.objects.filter(order_id__in=order_ids)
+
+        ArchivedOrder.objects.bulk_create(_archive_order(order) for order in orders)
+        ArchivedOrderItem.objects.bulk_create(_archive_item(item) for item in items)
+
+        items.delete()
+        Order.objects.filter(pk__in=order_ids).delete()
+    return len(orders)
+
+
+def archive_orders(
+    older_than: timedelta | None = None,
+    batch_size: int = 500,
+    now: datetime | None = None,
+) -> int:
+    """
+    Archive every eligible order, one batch per transaction.
+
+    Args:
+        older_than: Minimum order age; defaults to ORDER_ARCHIVE_AFTER
+        batch_size: Orders moved per transaction
+        now: Reference time, for tests
+
+    Returns:
+        Number of orders archived
+    """
+    cutoff = (now or timezone.now()) - (older_than or settings.ORDER_ARCHIVE_AFTER)
+    total = 0
+    while archived := archive_batch(cutoff, batch_size):
+        total += archived
+    return total
@@ -0,0 +1,56 @@
+"""
+Async order detail view for ASGI deployments (see config.urls_async).
+
+Same URL, caching and conditional GET behaviour as OrderViewSet.retrieve.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.http import HttpRequest, HttpResponse
+from django.utils.http import parse_etags
+
+from orders.cache import aget_order_detail, aset_order_detail, order_etag
+from orders.models import ArchivedOrder, Order
+from orders.serializers import ArchivedOrderSerializer, OrderSerializer
+from orders.views import OrderViewSet
+from shared.async_views import AsyncReadView, json_response
+
+
+async def _updated_at(model: type[Order] | type[ArchivedOrder], pk: Any) -> Any:
+    return (
+        await model.objects.filter(pk=pk).values_list("updated_at", flat=True).afirst()
+    )
+
+
+class OrderDetailView(AsyncReadView):
+    """GET /api/orders/{id}/"""
+
+    sync_view = staticmethod(OrderViewSet.as_view({"get": "retrieve"}))
+
+    async def get(self, request: HttpRequest, pk: Any) -> HttpResponse:
+        model, serializer_class = Order, OrderSerializer
+        updated_at = await _updated_at(model, pk)
+        if updated_at is None:
+            model, serializer_class = ArchivedOrder, ArchivedOrderSerializer
+            updated_at = await _updated_at(model, pk)
+        if updated_at is None:
+            return json_response({"error": "Order not found"}, status=404)
+
+        etag = order_etag(pk, updated_at)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+        if etag in if_none_match or "*" in if_none_match:
+            return json_response(None, status=304, headers=headers)
+
+        data = await aget_order_detail(pk, updated_at)
+        if data is None:
+            queryset = model.objects.prefetch_related("items")
+            if model is Order:
+                queryset = queryset.select_related("shipping_address")
+            order = await queryset.aget(pk=pk)
+            data = serializer_class(order).data
+            await aset_order_detail(pk, order.updated_at, data)
+            headers["ETag"] = order_etag(pk, order.updated_at)
+        return json_response(data, headers=headers)
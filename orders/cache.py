@@ -0,0 +1,74 @@
+"""
+Cache for serialized order detail payloads.
+
+Items and shipping address never change after checkout, so a payload only
+goes stale when the order row itself is updated. Entries carry the order's
+updated_at as a version, and Order saves delete them outright.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+
+from monitoring.metrics import record_cache
+
+
+def order_detail_key(order_id: Any) -> str:
+    return f"orders:detail:{order_id}"
+
+
+def order_etag(order_id: Any, updated_at: datetime) -> str:
+    """Strong ETag for an order detail response."""
+    digest = hashlib.sha1(f"{order_id}:{updated_at.isoformat()}".encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def get_order_detail(order_id: Any, updated_at: datetime) -> dict[str, Any] | None:
+    """Return the cached payload if it was built from this version of the order."""
+    entry = cache.get(order_detail_key(order_id))
+    if entry is None or entry["version"] != updated_at.isoformat():
+        record_cache("order_detail", False)
+        return None
+    record_cache("order_detail", True)
+    return entry["data"]
+
+
+def set_order_detail(order_id: Any, updated_at: datetime, data: dict[str, Any]) -> None:
+    cache.set(
+        order_detail_key(order_id),
+        {"version": updated_at.isoformat(), "data": data},
+        settings.ORDER_DETAIL_CACHE_TIMEOUT,
+    )
+
+
+def invalidate_order_detail(*order_ids: Any) -> None:
+    """Drop cached payloads, e.g. after a status transition."""
+    cache.delete_many([order_detail_key(order_id) for order_id in order_ids])
+
+
+async def aget_order_detail(
+    order_id: Any, updated_at: datetime
+) -> dict[str, Any] | None:
+    """Async get_order_detail."""
+    entry = await cache.aget(order_detail_key(order_id))
+    if entry is None or entry["version"] != updated_at.isoformat():
+        record_cache("order_detail", False)
+        return None
+    record_cache("order_detail", True)
+    return entry["data"]
+
+
+async def aset_order_detail(
+    order_id: Any, updated_at: datetime, data: dict[str, Any]
+) -> None:
+    """Async set_order_detail."""
+    await cache.aset(
+        order_detail_key(order_id),
+        {"version": updated_at.isoformat(), "data": data},
+        settings.ORDER_DETAIL_CACHE_TIMEOUT,
+    )
@@ -0,0 +1,185 @@
+"""
+Periodic order digest emails for the store owner.
+
+Used when ORDER_NOTIFICATION_MODE is "digest": instead of one email per
+order, send_order_digest summarises every order placed since the previous
+digest from aggregate queries, never loading individual orders. The email
+goes out through the outbox once the digest is recorded.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, TypedDict
+
+from django.conf import settings
+from django.core.mail import send_mail
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum
+from django.utils import timezone
+
+from orders import outbox
+from orders.models import Order, OrderDigest, OrderItem
+
+CENTS = Decimal("0.01")
+
+
+class ProductSales(TypedDict):
+    """Units and revenue for one product within a digest window."""
+
+    product_name: str
+    units: int
+    revenue: Decimal
+
+
+class DigestSummary(TypedDict):
+    """Aggregated order activity for a digest window."""
+
+    window_start: datetime
+    window_end: datetime
+    order_count: int
+    units: int
+    revenue: Decimal
+    top_products: list[ProductSales]
+
+
+def _line_total() -> ExpressionWrapper:
+    return ExpressionWrapper(
+        F("price_at_purchase") * F("quantity"),
+        output_field=DecimalField(max_digits=12, decimal_places=2),
+    )
+
+
+def build_summary(window_start: datetime, window_end: datetime) -> DigestSummary:
+    """
+    Aggregate orders placed in [window_start, window_end).
+
+    Costs two queries regardless of order volume: one aggregate over the
+    window's orders, and one GROUP BY product over their items for the
+    top sellers. Both read the primary: the next window starts at
+    window_end, so orders a lagging replica had not received by then
+    would never be included in any digest.
+    """
+    in_window = {
+        "created_at__gte": window_start,
+        "created_at__lt": window_end,
+    }
+    orders = (
+        Order.objects.using(DEFAULT_DB_ALIAS)
+        .filter(**in_window)
+        .exclude(status=Order.Status.CANCELLED)
+    )
+
+    totals = orders.aggregate(
+        order_count=Count("id"),
+        units=Sum("item_count"),
+        revenue=Sum("total_price"),
+    )
+
+    top_products = list(
+        OrderItem.objects.using(DEFAULT_DB_ALIAS)
+        .filter(order__in=orders.values("id"))
+        .values("product_name")
+        .annotate(units=Sum("quantity"), revenue=Sum(_line_total()))
+        .order_by("-revenue", "product_name")[: settings.ORDER_DIGEST_TOP_PRODUCTS]
+    )
+
+    return DigestSummary(
+        window_start=window_start,
+        window_end=window_end,
+        order_count=totals["order_count"] or 0,
+        units=totals["units"] or 0,
+        revenue=Decimal(totals["revenue"] or 0).quantize(CENTS),
+        top_products=[
+            ProductSales(
+                product_name=row["product_name"],
+                units=row["units"],
+                revenue=Decimal(row["revenue"]).quantize(CENTS),
+            )
+            for row in top_products
+        ],
+    )
+
+
+def render_summary(summary: DigestSummary) -> str:
+    """Render a digest as a plain-text email body."""
+    lines = [
+        f"Orders from {summary['window_start']:%Y-%m-%d %H:%M} "
+        f"to {summary['window_end']:%Y-%m-%d %H:%M} UTC",
+        "",
+        f"Orders: {summary['order_count']}",
+        f"Items sold: {summary['units']}",
+        f"Revenue: ${summary['revenue']}",
+    ]
+    if summary["top_products"]:
+        lines += ["", "Top products:"]
+        lines += [
+            f"- {row['product_name']}: {row['units']} sold, ${row['revenue']}"
+            for row in summary["top_products"]
+        ]
+    return "\n".join(lines)
+
+
+def _window_start(now: datetime) -> datetime:
+    previous = OrderDigest.objects.first()
+    if previous:
+        return previous.window_end
+    # Whole minutes, so overlapping first runs pick the same start
+    return (now - settings.ORDER_DIGEST_WINDOW).replace(second=0, microsecond=0)
+
+
+def send_digest(now: datetime | None = None, force: bool = False) -> OrderDigest | None:
+    """
+    Record the digest for orders placed since the previous one.
+
+    Does nothing until ORDER_DIGEST_WINDOW has elapsed, unless forced, so
+    the command can safely run from a frequent cron schedule. The window
+    is claimed in a short transaction that also queues the email as an
+    ORDER_DIGEST outbox event; the process_outbox worker sends it after
+    the commit. Windows with no orders are recorded without an email.
+
+    Overlapping runs start from the same window_start, and its unique
+    constraint lets only one of them record the window.
+
+    Returns:
+        The recorded digest, or None if the window is still open or
+        another run recorded it
+    """
+    now = now or timezone.now()
+    window_start = _window_start(now)
+
+    if not force and now - window_start < settings.ORDER_DIGEST_WINDOW:
+        return None
+
+    summary = build_summary(window_start, now)
+
+    try:
+        with transaction.atomic():
+            digest = OrderDigest.objects.create(
+                window_start=window_start,
+                window_end=now,
+                order_count=summary["order_count"],
+                total_revenue=summary["revenue"],
+            )
+            if summary["order_count"]:
+                outbox.enqueue(
+                    outbox.ORDER_DIGEST,
+                    {
+                        "subject": f"Order digest: {summary['order_count']} new orders",
+                        "message": render_summary(summary),
+                    },
+                )
+    except IntegrityError:
+        return None
+    return digest
+
+
+def handle_order_digest(payload: dict[str, Any]) -> None:
+    """Outbox handler for ORDER_DIGEST events: email a recorded digest."""
+    send_mail(
+        subject=payload["subject"],
+        message=payload["message"],
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=[settings.STORE_OWNER_EMAIL],
+    )
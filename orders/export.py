@@ -0,0 +1,212 @@
+"""
+Streaming order export for accounting.
+
+One row per order item, joined with its order and shipping address, in
+(order created_at, order id, item id) order. Live and archived orders (see
+orders.archive) are read side by side and merged, so archiving never
+changes an export. On PostgreSQL rows stream from one server-side cursor
+per table; elsewhere they are read in keyset paginated chunks, so no
+single query holds the database for the length of the export. Memory
+stays constant either way. Every row carries an opaque cursor an
+interrupted export can resume from.
+"""
+
+from __future__ import annotations
+
+import base64
+import csv
+import heapq
+import json
+import uuid
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from typing import Any
+
+from django.db.models import Q, QuerySet
+
+from orders.models import ArchivedOrderItem, OrderItem
+from shared.db import streams_with_server_side_cursors
+
+# Export column -> OrderItem lookup
+COLUMNS: list[tuple[str, str]] = [
+    ("order_id", "order_id"),
+    ("created_at", "order__created_at"),
+    ("status", "order__status"),
+    ("email", "order__email"),
+    ("order_total", "order__total_price"),
+    ("shipping_name", "order__shipping_address__name"),
+    ("address_line_1", "order__shipping_address__address_line_1"),
+    ("address_line_2", "order__shipping_address__address_line_2"),
+    ("city", "order__shipping_address__city"),
+    ("state", "order__shipping_address__state"),
+    ("postal_code", "order__shipping_address__postal_code"),
+    ("country", "order__shipping_address__country"),
+    ("item_id", "id"),
+    ("product_name", "product_name"),
+    ("quantity", "quantity"),
+    ("unit_price", "price_at_purchase"),
+]
+# The same columns from ArchivedOrderItem, which keeps the address on the order
+ARCHIVE_COLUMNS: list[tuple[str, str]] = [
+    ("order_id", "order_id"),
+    ("created_at", "order__created_at"),
+    ("status", "order__status"),
+    ("email", "order__email"),
+    ("order_total", "order__total_price"),
+    ("shipping_name", "order__shipping_name"),
+    ("address_line_1", "order__shipping_address_line_1"),
+    ("address_line_2", "order__shipping_address_line_2"),
+    ("city", "order__shipping_city"),
+    ("state", "order__shipping_state"),
+    ("postal_code", "order__shipping_postal_code"),
+    ("country", "order__shipping_country"),
+    ("item_id", "id"),
+    ("product_name", "product_name"),
+    ("quantity", "quantity"),
+    ("unit_price", "price_at_purchase"),
+]
+HEADER = [name for name, _ in COLUMNS] + ["cursor"]
+
+
+class InvalidCursor(ValueError):
+    """Raised when a resume cursor cannot be decoded."""
+
+    def __init__(self) -> None:
+        super().__init__("Invalid export cursor")
+
+
+def encode_cursor(created_at: datetime, order_id: Any, item_id: Any) -> str:
+    raw = f"{created_at.isoformat()}|{order_id}|{item_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID, uuid.UUID]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Raises:
+        InvalidCursor: If the cursor is malformed
+    """
+    try:
+        created_at, order_id, item_id = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        )
+        return (
+            datetime.fromisoformat(created_at),
+            uuid.UUID(order_id),
+            uuid.UUID(item_id),
+        )
+    except ValueError as e:
+        raise InvalidCursor() from e
+
+
+def _after(created_at: datetime, order_id: uuid.UUID, item_id: uuid.UUID) -> Q:
+    """Rows strictly after a position in export order."""
+    return (
+        Q(order__created_at__gt=created_at)
+        | Q(order__created_at=created_at, order_id__gt=order_id)
+        | Q(order__created_at=created_at, order_id=order_id, id__gt=item_id)
+    )
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if value is None or isinstance(value, (int, str)):
+        return value
+    return str(value)
+
+
+def _position(row: dict[str, Any]) -> tuple[datetime, uuid.UUID, uuid.UUID]:
+    return row["created_at"], row["order_id"], row["item_id"]
+
+
+def _read(
+    items: QuerySet,
+    columns: list[tuple[str, str]],
+    position: tuple[datetime, uuid.UUID, uuid.UUID] | None,
+    chunk_size: int,
+) -> Iterator[dict[str, Any]]:
+    """Rows of one item table in export order, after position, unformatted."""
+    items = items.order_by("order__created_at", "order_id", "id")
+    lookups = [lookup for _, lookup in columns]
+
+    def rows(chunk: Iterable[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        for values in chunk:
+            yield {name: values[lookup] for name, lookup in columns}
+
+    if streams_with_server_side_cursors(items.db):
+        # One query, fetched chunk_size rows at a time from a named cursor
+        page = items.filter(_after(*position)) if position else items
+        yield from rows(page.values(*lookups).iterator(chunk_size=chunk_size))
+        return
+
+    while True:
+        page = items.filter(_after(*position)) if position else items
+        chunk = list(rows(page.values(*lookups)[:chunk_size]))
+        yield from chunk
+        if len(chunk) < chunk_size:
+            return
+        position = _position(chunk[-1])
+
+
+def iter_rows(
+    start: datetime,
+    end: datetime,
+    cursor: str | None = None,
+    chunk_size: int = 2000,
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield export rows for live and archived orders created in [start, end).
+
+    Args:
+        start: Earliest order created_at, inclusive
+        end: Latest order created_at, exclusive
+        cursor: Resume after the row that carried this cursor
+        chunk_size: Rows fetched per query, or per cursor fetch where
+            the database streams from a server-side cursor
+
+    Raises:
+        InvalidCursor: If cursor is malformed
+    """
+    position = decode_cursor(cursor) if cursor else None
+    in_range = {"order__created_at__gte": start, "order__created_at__lt": end}
+    live = _read(OrderItem.objects.filter(**in_range), COLUMNS, position, chunk_size)
+    archived = _read(
+        ArchivedOrderItem.objects.filter(**in_range),
+        ARCHIVE_COLUMNS,
+        position,
+        chunk_size,
+    )
+    # An order is in exactly one of the tables, so positions never tie
+    for values in heapq.merge(live, archived, key=_position):
+        row = {name: _jsonable(value) for name, value in values.items()}
+        row["cursor"] = encode_cursor(*_position(values))
+        yield row
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for csv.writer."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def render_csv(rows: Iterable[dict[str, Any]], header: bool = True) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    if header:
+        yield writer.writerow(HEADER)
+    for row in rows:
+        yield writer.writerow([row[name] for name in HEADER])
+
+
+def render_ndjson(rows: Iterable[dict[str, Any]], header: bool = True) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row) + "\n"
+
+
+# Format -> (renderer, content type)
+FORMATS = {
+    "csv": (render_csv, "text/csv"),
+    "ndjson": (render_ndjson, "application/x-ndjson"),
+}
@@ -0,0 +1,115 @@
+"""
+Idempotency-Key handling for checkout.
+
+The unique constraint on IdempotencyKey.key is the lock: the first request
+to insert a key owns it, and concurrent duplicates fail fast instead of
+waiting on or repeating the checkout.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+from django.utils import timezone
+
+from orders.models import IdempotencyKey, Order
+
+
+class IdempotencyError(Exception):
+    """Base class for idempotency key failures."""
+
+
+class IdempotencyInProgress(IdempotencyError):
+    """Raised when another request holding the same key has not finished."""
+
+    def __init__(self) -> None:
+        super().__init__("A request with this Idempotency-Key is in progress")
+
+
+class IdempotencyMismatch(IdempotencyError):
+    """Raised when a key is reused with a different request body."""
+
+    def __init__(self) -> None:
+        super().__init__("Idempotency-Key was already used with a different request")
+
+
+def request_fingerprint(data: dict[str, Any], user_id: Any = None) -> str:
+    """Hash the parts of a request that must match on replay."""
+    payload = json.dumps({"data": data, "user": str(user_id)}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def claim(key: str, request_hash: str) -> Order | None:
+    """
+    Claim an idempotency key before running checkout.
+
+    Returns:
+        The order created by an earlier request with this key, or None if
+        the caller now owns the key and should perform the checkout
+
+    Raises:
+        IdempotencyInProgress: If a duplicate request is still running
+        IdempotencyMismatch: If the key was used for a different request
+    """
+    now = timezone.now()
+    # Expired keys, and claims abandoned by a crashed worker, are reusable
+    IdempotencyKey.objects.filter(key=key, expires_at__lte=now).delete()
+    IdempotencyKey.objects.filter(
+        key=key,
+        order__isnull=True,
+        created_at__lte=now - settings.IDEMPOTENCY_LOCK_TIMEOUT,
+    ).delete()
+
+    try:
+        with transaction.atomic():
+            IdempotencyKey.objects.create(
+                key=key,
+                request_hash=request_hash,
+                expires_at=now + settings.IDEMPOTENCY_KEY_TTL,
+            )
+        return None
+    except IntegrityError:
+        pass
+
+    existing = IdempotencyKey.objects.filter(key=key).first()
+    if existing is None or existing.order_id is None:
+        raise IdempotencyInProgress()
+    if existing.request_hash != request_hash:
+        raise IdempotencyMismatch()
+    # The order may have been committed moments ago and not yet reached
+    # a replica; a retrying client carries no pin cookie
+    return (
+        Order.objects.using(DEFAULT_DB_ALIAS)
+        .select_related("shipping_address")
+        .prefetch_related("items")
+        .get(pk=existing.order_id)
+    )
+
+
+def complete(key: str, order: Order) -> None:
+    """Link a claimed key to its order; call inside the checkout transaction."""
+    IdempotencyKey.objects.filter(key=key).update(order=order)
+
+
+def release(key: str) -> None:
+    """Drop an unfinished claim so the client can retry after a failure."""
+    IdempotencyKey.objects.filter(key=key, order__isnull=True).delete()
+
+
+def purge_expired(batch_size: int = 1000) -> int:
+    """Delete expired keys in batches and return how many were removed."""
+    deleted = 0
+    now = timezone.now()
+    while True:
+        pks = list(
+            IdempotencyKey.objects.filter(expires_at__lte=now).values_list(
+                "pk", flat=True
+            )[:batch_size]
+        )
+        if not pks:
+            return deleted
+        deleted += IdempotencyKey.objects.filter(pk__in=pks).delete()[0]
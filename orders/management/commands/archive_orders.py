@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from orders.archive import archive_orders
+
+
+class Command(BaseCommand):
+    help = (
+        "Move delivered and cancelled orders older than ORDER_ARCHIVE_AFTER "
+        "into the archive tables, one batch per transaction."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            help="Override ORDER_ARCHIVE_AFTER",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Orders moved per transaction (default: 500)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        days = options["older_than_days"]
+        archived = archive_orders(
+            older_than=timedelta(days=days) if days is not None else None,
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(f"Archived {archived} orders")
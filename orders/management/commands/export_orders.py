@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import date, datetime, time, timedelta
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.utils import timezone
+
+from orders.export import FORMATS, InvalidCursor, decode_cursor, iter_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream orders joined with items and shipping addresses as CSV or "
+        "NDJSON. Resumable: on failure, rerun with the printed --cursor and "
+        "--append."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--start", type=date.fromisoformat, required=True)
+        parser.add_argument(
+            "--end",
+            type=date.fromisoformat,
+            required=True,
+            help="Last order date, inclusive (YYYY-MM-DD)",
+        )
+        parser.add_argument("--format", choices=list(FORMATS), default="csv")
+        parser.add_argument(
+            "--output",
+            help="File to write (default: stdout)",
+        )
+        parser.add_argument(
+            "--cursor",
+            help="Resume after the row carrying this cursor value",
+        )
+        parser.add_argument(
+            "--append",
+            action="store_true",
+            help="Append to --output instead of truncating it",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.ORDER_EXPORT_CHUNK_SIZE,
+            help="Rows fetched per query",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["start"] > options["end"]:
+            raise CommandError("--start must not be after --end")
+        if options["cursor"]:
+            try:
+                decode_cursor(options["cursor"])
+            except InvalidCursor as e:
+                raise CommandError(str(e))
+
+        since = timezone.make_aware(datetime.combine(options["start"], time.min))
+        until = timezone.make_aware(
+            datetime.combine(options["end"] + timedelta(days=1), time.min)
+        )
+        render, _ = FORMATS[options["format"]]
+
+        last_cursor = options["cursor"]
+        exported = 0
+
+        def tracked() -> Iterator[dict[str, Any]]:
+            # Advances only once the previous row has been written
+            nonlocal last_cursor, exported
+            for row in iter_rows(
+                since, until, cursor=options["cursor"], chunk_size=options["chunk_size"]
+            ):
+                yield row
+                last_cursor = row["cursor"]
+                exported += 1
+
+        out = None
+        if options["output"]:
+            out = open(options["output"], "a" if options["append"] else "w", newline="")
+        try:
+            for chunk in render(tracked(), header=not options["cursor"]):
+                if out is None:
+                    self.stdout.write(chunk, ending="")
+                else:
+                    out.write(chunk)
+        except Exception:
+            if last_cursor:
+                self.stderr.write(
+                    f"Export interrupted; resume with --cursor {last_cursor} --append"
+                )
+            raise
+        finally:
+            if out is not None:
+                out.close()
+
+        self.stderr.write(f"Exported {exported} rows")
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from orders.outbox import drain
+
+
+class Command(BaseCommand):
+    help = "Deliver pending outbox events (order notifications, etc.)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Events claimed per batch (default: 100)",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep polling every --interval seconds instead of exiting",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=2.0,
+            help="Seconds to sleep when idle with --loop (default: 2)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        while True:
+            processed = drain(batch_size=options["batch_size"])
+            if processed or not options["loop"]:
+                self.stdout.write(f"Processed {processed} outbox events")
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from orders.idempotency import purge_expired
+
+
+class Command(BaseCommand):
+    help = "Delete checkout idempotency keys past their TTL."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Keys deleted per statement (default: 1000)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        deleted = purge_expired(batch_size=options["batch_size"])
+        self.stdout.write(f"Deleted {deleted} expired idempotency keys")
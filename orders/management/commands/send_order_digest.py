@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from orders.digest import send_digest
+
+
+class Command(BaseCommand):
+    help = (
+        "Queue an email to the store owner summarising orders placed since "
+        "the last digest; process_outbox sends it. Safe to run every minute; "
+        "sends once per ORDER_DIGEST_WINDOW."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Send now even if the window has not elapsed",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        digest = send_digest(force=options["force"])
+        if digest is None:
+            self.stdout.write(
+                "Digest window still open or already recorded; nothing sent"
+            )
+        else:
+            self.stdout.write(f"Recorded digest covering {digest.order_count} orders")
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:39
+
+from decimal import Decimal
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0003_outboxevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderDigest',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('window_start', models.DateTimeField()),
+                ('window_end', models.DateTimeField(unique=True)),
+                ('order_count', models.PositiveIntegerField(default=0)),
+                ('total_revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+            ],
+            options={
+                'db_table': 'order_digests',
+                'ordering': ['-window_end'],
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:45
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+BATCH_SIZE = 1000
+
+
+def backfill_item_count(apps, schema_editor):
+    Order = apps.get_model("orders", "Order")
+    OrderItem = apps.get_model("orders", "OrderItem")
+
+    last_pk = None
+    while True:
+        batch = Order.objects.order_by("pk")
+        if last_pk is not None:
+            batch = batch.filter(pk__gt=last_pk)
+        pks = list(batch.values_list("pk", flat=True)[:BATCH_SIZE])
+        if not pks:
+            return
+
+        counts = dict(
+            OrderItem.objects.filter(order_id__in=pks)
+            .values("order_id")
+            .annotate(units=Sum("quantity"))
+            .values_list("order_id", "units")
+        )
+        orders = [Order(pk=pk, item_count=counts.get(pk) or 0) for pk in pks]
+        Order.objects.bulk_update(orders, ["item_count"])
+        last_pk = pks[-1]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0004_orderdigest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='item_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_item_count, migrations.RunPython.noop),
+    ]
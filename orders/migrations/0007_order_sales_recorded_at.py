@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0006_order_history_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='sales_recorded_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
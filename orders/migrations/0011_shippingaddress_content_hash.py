@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0010_archived_orders'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='shippingaddress',
+            name='content_hash',
+            field=models.CharField(editable=False, max_length=64, null=True),
+        ),
+    ]
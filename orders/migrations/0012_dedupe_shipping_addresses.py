@@ -0,0 +1,86 @@
+# Generated by Django 4.2.30 on 2026-10-19 01:53
+
+import hashlib
+
+from django.db import migrations, models, transaction
+from django.db.models import Case, Value, When
+
+# Frozen copies of orders.addresses as of this migration, so later changes
+# to the live hashing cannot change what replaying it does
+ADDRESS_FIELDS = [
+    "name",
+    "address_line_1",
+    "address_line_2",
+    "city",
+    "state",
+    "postal_code",
+    "country",
+]
+# Keeps the CASE expression under SQLite's parameter limit
+BATCH_SIZE = 200
+
+
+def address_hash(address):
+    joined = "\x1f".join(
+        " ".join((getattr(address, name) or "").split()).casefold()
+        for name in ADDRESS_FIELDS
+    )
+    return hashlib.sha256(joined.encode()).hexdigest()
+
+
+def dedupe(apps, schema_editor):
+    ShippingAddress = apps.get_model("orders", "ShippingAddress")
+    Order = apps.get_model("orders", "Order")
+
+    while True:
+        with transaction.atomic():
+            batch = list(
+                ShippingAddress.objects.filter(content_hash__isnull=True).order_by(
+                    "created_at", "id"
+                )[:BATCH_SIZE]
+            )
+            if not batch:
+                return
+
+            hashes = {address.pk: address_hash(address) for address in batch}
+            canonical = dict(
+                ShippingAddress.objects.filter(
+                    content_hash__in=set(hashes.values())
+                ).values_list("content_hash", "pk")
+            )
+
+            keep, duplicate_of = [], {}
+            for address in batch:
+                digest = hashes[address.pk]
+                if digest in canonical:
+                    duplicate_of[address.pk] = canonical[digest]
+                else:
+                    canonical[digest] = address.pk
+                    address.content_hash = digest
+                    keep.append(address)
+
+            ShippingAddress.objects.bulk_update(keep, ["content_hash"])
+            if duplicate_of:
+                Order.objects.filter(shipping_address_id__in=duplicate_of).update(
+                    shipping_address_id=Case(
+                        *[
+                            When(shipping_address_id=duplicate, then=Value(original))
+                            for duplicate, original in duplicate_of.items()
+                        ],
+                        output_field=models.UUIDField(),
+                    )
+                )
+                ShippingAddress.objects.filter(pk__in=duplicate_of).delete()
+
+
+class Migration(migrations.Migration):
+    # Each batch commits on its own
+    atomic = False
+
+    dependencies = [
+        ('orders', '0011_shippingaddress_content_hash'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 02:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0013_shippingaddress_content_hash_unique'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='orderdigest',
+            name='window_start',
+            field=models.DateTimeField(unique=True),
+        ),
+    ]
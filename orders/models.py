@@ -5,7 +5,9 @@ from typing import TYPE_CHECKING
 
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
+from orders.addresses import ADDRESS_FIELDS, address_hash
 from shared.models import BaseModel
 
 if TYPE_CHECKING:
@@ -15,6 +17,9 @@ if TYPE_CHECKING:
 class ShippingAddress(BaseModel):
     """
     Shipping address for orders.
+
+    Rows are shared between orders and never edited: checkout looks up an
+    existing row by content_hash (see orders.addresses) before inserting.
     """
 
     name = models.CharField(max_length=200)
@@ -24,6 +29,7 @@ class ShippingAddress(BaseModel):
     state = models.CharField(max_length=100)
     postal_code = models.CharField(max_length=20)
     country = models.CharField(max_length=100, default="United States")
+    content_hash = models.CharField(max_length=64, unique=True, editable=False)
 
     class Meta:
         db_table = "shipping_addresses"
@@ -32,6 +38,12 @@ class ShippingAddress(BaseModel):
     def __str__(self) -> str:
         return f"{self.name} - {self.city}, {self.state}"
 
+    def save(self, *args, **kwargs) -> None:
+        self.content_hash = address_hash(
+            {name: getattr(self, name) for name in ADDRESS_FIELDS}
+        )
+        super().save(*args, **kwargs)
+
 
 class Order(BaseModel):
     """
@@ -63,6 +75,10 @@ class Order(BaseModel):
         decimal_places=2,
         default=Decimal("0.00"),
     )
+    # Total units across items; written at checkout alongside total_price
+    item_count = models.PositiveIntegerField(default=0)
+    # Set once the order is counted in the sales rollups (see reports.services)
+    sales_recorded_at = models.DateTimeField(null=True, blank=True, editable=False)
     shipping_address = models.ForeignKey(
         ShippingAddress,
         on_delete=models.PROTECT,
@@ -72,15 +88,18 @@ class Order(BaseModel):
     class Meta:
         db_table = "orders"
         ordering = ["-created_at"]
+        indexes = [
+            # Order history: WHERE user_id = ? ORDER BY created_at DESC
+            models.Index(
+                fields=["user", "-created_at"], name="orders_user_created_idx"
+            ),
+            # Date-range scans (export keyset, digests, rollup backfill)
+            models.Index(fields=["created_at", "id"], name="orders_created_id_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"Order {self.id} - {self.email}"
 
-    @property
-    def item_count(self) -> int:
-        """Get total number of items in the order."""
-        return sum(item.quantity for item in self.items.all())
-
     def calculate_total(self) -> Decimal:
         """Calculate total price from order items."""
         return sum(
@@ -118,3 +137,197 @@ class OrderItem(BaseModel):
     def subtotal(self) -> Decimal:
         """Calculate subtotal for this item."""
         return self.price_at_purchase * self.quantity
+
+
+class IdempotencyKey(BaseModel):
+    """
+    Client-supplied key making checkout safe to retry.
+
+    A row is claimed before checkout starts and linked to the order in the
+    checkout transaction; while order is null the checkout is in progress.
+    """
+
+    key = models.CharField(max_length=255, unique=True)
+    request_hash = models.CharField(max_length=64)
+    order = models.ForeignKey(
+        Order,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = "idempotency_keys"
+
+    def __str__(self) -> str:
+        return self.key
+
+
+class OutboxEvent(BaseModel):
+    """
+    Event recorded in the same transaction as the change it describes.
+
+    Delivered by the process_outbox worker; rows are deleted once handled
+    and kept as FAILED after the final retry for inspection.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        FAILED = "failed", "Failed"
+
+    topic = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        db_table = "outbox_events"
+        ordering = ["available_at"]
+        indexes = [
+            models.Index(
+                fields=["status", "available_at"], name="outbox_status_available_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.topic} ({self.status})"
+
+
+class OrderDigest(BaseModel):
+    """
+    Record of a digest email covering orders placed in [window_start, window_end).
+
+    The latest window_end is where the next digest starts, so windows never
+    overlap or leave gaps. window_start is unique so that of two runs
+    starting from the same point, only one records its window.
+    """
+
+    window_start = models.DateTimeField(unique=True)
+    window_end = models.DateTimeField(unique=True)
+    order_count = models.PositiveIntegerField(default=0)
+    total_revenue = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal("0.00"),
+    )
+
+    class Meta:
+        db_table = "order_digests"
+        ordering = ["-window_end"]
+
+    def __str__(self) -> str:
+        return f"Digest {self.window_start:%Y-%m-%d %H:%M} - {self.window_end:%H:%M}"
+
+
+class OrderStatusChange(BaseModel):
+    """
+    Audit record of an order moving between statuses.
+
+    order_id is a plain column rather than a foreign key so the trail
+    outlives the order row.
+    """
+
+    order_id = models.UUIDField(db_index=True)
+    from_status = models.CharField(max_length=20, choices=Order.Status.choices)
+    to_status = models.CharField(max_length=20, choices=Order.Status.choices)
+    changed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    note = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        db_table = "order_status_changes"
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        return f"{self.order_id}: {self.from_status} -> {self.to_status}"
+
+
+class ArchivedOrder(models.Model):
+    """
+    Delivered or cancelled order moved out of the hot tables.
+
+    Keeps the original id and timestamps. The shipping address is copied
+    onto the row, so archived orders need no shipping_addresses rows.
+    Written only by orders.archive.
+    """
+
+    id = models.UUIDField(primary_key=True, editable=False)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="archived_orders",
+    )
+    email = models.EmailField()
+    status = models.CharField(max_length=20, choices=Order.Status.choices)
+    total_price = models.DecimalField(max_digits=10, decimal_places=2)
+    item_count = models.PositiveIntegerField(default=0)
+    shipping_address_id = models.UUIDField()
+    shipping_name = models.CharField(max_length=200)
+    shipping_address_line_1 = models.CharField(max_length=255)
+    shipping_address_line_2 = models.CharField(max_length=255, blank=True)
+    shipping_city = models.CharField(max_length=100)
+    shipping_state = models.CharField(max_length=100)
+    shipping_postal_code = models.CharField(max_length=20)
+    shipping_country = models.CharField(max_length=100)
+
+    class Meta:
+        db_table = "archived_orders"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["user", "-created_at"], name="archived_user_created_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Archived order {self.id} - {self.email}"
+
+
+class ArchivedOrderItem(models.Model):
+    """Item of an ArchivedOrder, keeping the original id."""
+
+    id = models.UUIDField(primary_key=True, editable=False)
+    created_at = models.DateTimeField()
+    order = models.ForeignKey(
+        ArchivedOrder,
+        on_delete=models.CASCADE,
+        related_name="items",
+    )
+    product = models.ForeignKey(
+        "products.Product",
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+",
+    )
+    product_name = models.CharField(max_length=200)
+    quantity = models.PositiveIntegerField(default=1)
+    price_at_purchase = models.DecimalField(max_digits=10, decimal_places=2)
+
+    class Meta:
+        db_table = "archived_order_items"
+
+    def __str__(self) -> str:
+        return f"{self.product_name} x {self.quantity}"
+
+    @property
+    def subtotal(self) -> Decimal:
+        """Calculate subtotal for this item."""
+        return self.price_at_purchase * self.quantity
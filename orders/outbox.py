@@ -0,0 +1,151 @@
+"""
+Transactional outbox.
+
+Side effects of a write (emails, derived data) are recorded as OutboxEvent
+rows inside the write's transaction with enqueue(), then delivered by the
+``process_outbox`` worker with batching, retries and exponential backoff.
+An event is only ever seen by the worker if its transaction committed.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+from django.conf import settings
+from django.db import OperationalError, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from orders.models import OutboxEvent
+from shared.db import is_lock_error, retry_on_db_lock
+
+logger = logging.getLogger(__name__)
+
+ORDER_PLACED = "order.placed"
+SALES_ROLLUP = "sales.rollup"
+SALES_REVERSAL = "sales.reversal"
+ORDER_DIGEST = "order.digest"
+
+# Topic -> dotted path of a handler taking the event payload. Resolved
+# lazily so handler modules can import freely from the apps they serve.
+HANDLERS: dict[str, str] = {
+    ORDER_PLACED: "orders.services.handle_order_placed",
+    SALES_ROLLUP: "reports.services.record_order",
+    SALES_REVERSAL: "reports.services.reverse_orders",
+    ORDER_DIGEST: "orders.digest.handle_order_digest",
+}
+
+
+def enqueue(topic: str, payload: dict[str, Any]) -> OutboxEvent:
+    """Record an event; call inside the transaction making the change."""
+    if topic not in HANDLERS:
+        raise ValueError(f"No outbox handler registered for '{topic}'")
+    return OutboxEvent.objects.create(topic=topic, payload=payload)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff with full jitter, capped at OUTBOX_RETRY_MAX_SECONDS."""
+    ceiling = min(
+        settings.OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1),
+        settings.OUTBOX_RETRY_MAX_SECONDS,
+    )
+    return timedelta(seconds=random.uniform(ceiling / 2, ceiling))
+
+
+@retry_on_db_lock
+def _claim(batch_size: int, now: datetime) -> list[OutboxEvent]:
+    """
+    Lease a batch of due events.
+
+    Pushing available_at past the lease hides the batch from other workers
+    (SKIP LOCKED covers the claim itself on PostgreSQL) and lets it be
+    retried automatically if this worker dies mid-batch. On SQLite, two
+    workers claiming at once can find the database locked; the claim is
+    retried with backoff.
+    """
+    with transaction.atomic():
+        events = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboxEvent.Status.PENDING, available_at__lte=now)
+            .order_by("available_at")[:batch_size]
+        )
+        if events:
+            OutboxEvent.objects.filter(pk__in=[e.pk for e in events]).update(
+                available_at=now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS)
+            )
+    return events
+
+
+def _resolve(topic: str) -> Callable[[dict[str, Any]], None]:
+    return import_string(HANDLERS[topic])
+
+
+def process_batch(batch_size: int = 100, now: datetime | None = None) -> int:
+    """
+    Deliver up to batch_size due events.
+
+    Returns:
+        Number of events claimed
+    """
+    now = now or timezone.now()
+    try:
+        events = _claim(batch_size, now)
+    except OperationalError as e:
+        if not is_lock_error(e):
+            raise
+        # Still locked after every retry; the events stay due, so the next
+        # poll picks them up instead of the worker exiting
+        logger.warning("Outbox claim found the database locked; skipping this poll")
+        return 0
+
+    delivered: list[Any] = []
+    for event in events:
+        try:
+            _resolve(event.topic)(event.payload)
+        except Exception as e:
+            _record_failure(event, e)
+        else:
+            delivered.append(event.pk)
+
+    if delivered:
+        OutboxEvent.objects.filter(pk__in=delivered).delete()
+    return len(events)
+
+
+def _record_failure(event: OutboxEvent, error: Exception) -> None:
+    attempts = event.attempts + 1
+    if attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+        logger.error(
+            "Outbox event %s (%s) failed permanently: %s", event.pk, event.topic, error
+        )
+        status = OutboxEvent.Status.FAILED
+        available_at = event.available_at
+    else:
+        logger.warning(
+            "Outbox event %s (%s) failed, attempt %d: %s",
+            event.pk,
+            event.topic,
+            attempts,
+            error,
+        )
+        status = OutboxEvent.Status.PENDING
+        available_at = timezone.now() + retry_delay(attempts)
+
+    OutboxEvent.objects.filter(pk=event.pk).update(
+        status=status,
+        attempts=attempts,
+        available_at=available_at,
+        last_error=f"{type(error).__name__}: {error}",
+    )
+
+
+def drain(batch_size: int = 100) -> int:
+    """Process batches until nothing is due; returns events claimed."""
+    total = 0
+    while processed := process_batch(batch_size):
+        total += processed
+    return total
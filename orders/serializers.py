@@ -1,8 +1,19 @@
 from __future__ import annotations
 
+from datetime import datetime, time, timedelta
+from typing import Any
+
+from django.utils import timezone
 from rest_framework import serializers
 
-from orders.models import Order, OrderItem, ShippingAddress
+from orders.export import FORMATS, InvalidCursor, decode_cursor
+from orders.models import (
+    ArchivedOrder,
+    ArchivedOrderItem,
+    Order,
+    OrderItem,
+    ShippingAddress,
+)
 
 
 class ShippingAddressSerializer(serializers.ModelSerializer):
@@ -60,6 +71,39 @@ class OrderSerializer(serializers.ModelSerializer):
         ]
 
 
+class ArchivedOrderItemSerializer(serializers.ModelSerializer):
+    """Serializer for ArchivedOrderItem, shaped like OrderItemSerializer."""
+
+    subtotal = serializers.ReadOnlyField()
+
+    class Meta:
+        model = ArchivedOrderItem
+        fields = OrderItemSerializer.Meta.fields
+
+
+class ArchivedOrderSerializer(serializers.ModelSerializer):
+    """Serializer for ArchivedOrder, shaped like OrderSerializer."""
+
+    items = ArchivedOrderItemSerializer(many=True, read_only=True)
+    shipping_address = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ArchivedOrder
+        fields = OrderSerializer.Meta.fields
+
+    def get_shipping_address(self, order: ArchivedOrder) -> dict[str, Any]:
+        return {
+            "id": str(order.shipping_address_id),
+            "name": order.shipping_name,
+            "address_line_1": order.shipping_address_line_1,
+            "address_line_2": order.shipping_address_line_2,
+            "city": order.shipping_city,
+            "state": order.shipping_state,
+            "postal_code": order.shipping_postal_code,
+            "country": order.shipping_country,
+        }
+
+
 class OrderListSerializer(serializers.ModelSerializer):
     """Compact serializer for order listing."""
 
@@ -88,3 +132,44 @@ class CheckoutSerializer(serializers.Serializer):
     state = serializers.CharField(max_length=100)
     postal_code = serializers.CharField(max_length=20)
     country = serializers.CharField(max_length=100, default="United States")
+
+
+class OrderExportQuerySerializer(serializers.Serializer):
+    """Query parameters for the order export."""
+
+    start = serializers.DateField()
+    end = serializers.DateField()
+    # Not "format", which DRF reserves for renderer selection
+    file_format = serializers.ChoiceField(choices=list(FORMATS), default="csv")
+    cursor = serializers.CharField(required=False)
+
+    def validate_cursor(self, value: str) -> str:
+        try:
+            decode_cursor(value)
+        except InvalidCursor as e:
+            raise serializers.ValidationError(str(e))
+        return value
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        if attrs["start"] > attrs["end"]:
+            raise serializers.ValidationError("start must not be after end")
+        # Whole days: [start 00:00, day after end 00:00)
+        attrs["since"] = timezone.make_aware(datetime.combine(attrs["start"], time.min))
+        attrs["until"] = timezone.make_aware(
+            datetime.combine(attrs["end"] + timedelta(days=1), time.min)
+        )
+        return attrs
+
+
+class OrderTransitionSerializer(serializers.Serializer):
+    """Serializer for bulk order status transition requests."""
+
+    MAX_ORDERS = 10000
+
+    order_ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        min_length=1,
+        max_length=MAX_ORDERS,
+    )
+    status = serializers.ChoiceField(choices=Order.Status.choices)
+    note = serializers.CharField(max_length=255, required=False, allow_blank=True)
@@ -1,131 +1,173 @@
 from __future__ import annotations
 
-import logging
 from decimal import Decimal
 from typing import Any
 
 from django.conf import settings
 from django.core.mail import send_mail
+from django.db import transaction
 
-from cart.services import CartService
+from cart import reservations
+from cart.services import CartService, CartValidationError, price_increases
+from orders import idempotency, outbox
+from orders.addresses import address_hash
 from orders.models import Order, OrderItem, ShippingAddress
-from products.models import Product
-
-logger = logging.getLogger(__name__)
+from shared.db import retry_on_db_lock
 
 
+@retry_on_db_lock
 def create_order_from_cart(
     cart: CartService,
     email: str,
     shipping_data: dict[str, Any],
     user=None,
+    idempotency_key: str | None = None,
 ) -> Order:
     """
     Create an order from cart contents.
 
+    Everything from revalidation to inserting the items runs in one
+    transaction, so a failure part way leaves no partial order behind.
+    Query count is constant in the number of cart lines. Retried when
+    SQLite reports the database locked, unless called inside an outer
+    transaction.
+
     Args:
         cart: CartService instance with items
         email: Customer email address
         shipping_data: Shipping address data
         user: Optional authenticated user
+        idempotency_key: Claimed key to link to the order in the same
+            transaction
 
     Returns:
         Created Order instance
 
     Raises:
         ValueError: If cart is empty
+        CartValidationError: If any item is unavailable or out of stock, or
+            costs more than the cart said
+        InsufficientStock: If stock ran out between validation and sale
     """
     if not cart.get_items():
         raise ValueError("Cannot create order from empty cart")
 
-    # Create shipping address
-    shipping_address = ShippingAddress.objects.create(
-        name=shipping_data["name"],
-        address_line_1=shipping_data["address_line_1"],
-        address_line_2=shipping_data.get("address_line_2", ""),
-        city=shipping_data["city"],
-        state=shipping_data["state"],
-        postal_code=shipping_data["postal_code"],
-        country=shipping_data.get("country", "United States"),
-    )
-
-    # Create order
-    order = Order.objects.create(
-        user=user,
-        email=email,
-        shipping_address=shipping_address,
-        total_price=Decimal("0.00"),
-    )
-
-    # Create order items
-    total = Decimal("0.00")
-    for item in cart.get_items():
-        try:
-            product = Product.objects.get(id=item["product_id"])
-        except Product.DoesNotExist:
-            product = None
-
-        order_item = OrderItem.objects.create(
-            order=order,
-            product=product,
-            product_name=item["name"],
-            quantity=item["quantity"],
-            price_at_purchase=Decimal(item["price"]),
+    with transaction.atomic():
+        # Reprice against the catalog before trusting the cart snapshots
+        products = cart.load_products()
+        validation = cart.revalidate(products)
+        # The customer agreed to the cart's prices; a rise needs agreeing
+        # to again. The cart now holds the new prices, so a retry succeeds
+        if price_increases(validation):
+            validation["valid"] = False
+        if not validation["valid"]:
+            raise CartValidationError(validation)
+
+        # Convert the cart's stock holds into sales
+        reservations.commit(cart.session_key, cart.quantities())
+
+        order_items = [
+            OrderItem(
+                product=products[item["product_id"]],
+                product_name=item["name"],
+                quantity=item["quantity"],
+                price_at_purchase=Decimal(item["price"]),
+            )
+            for item in cart.get_items()
+        ]
+        total = sum((item.subtotal for item in order_items), Decimal("0.00"))
+
+        address_fields = {
+            "name": shipping_data["name"],
+            "address_line_1": shipping_data["address_line_1"],
+            "address_line_2": shipping_data.get("address_line_2", ""),
+            "city": shipping_data["city"],
+            "state": shipping_data["state"],
+            "postal_code": shipping_data["postal_code"],
+            "country": shipping_data.get("country", "United States"),
+        }
+        # Repeat customers reuse the stored copy of their address. Insert
+        # first and ignore the conflict: race-free without a savepoint
+        content_hash = address_hash(address_fields)
+        ShippingAddress.objects.bulk_create(
+            [ShippingAddress(content_hash=content_hash, **address_fields)],
+            ignore_conflicts=True,
+        )
+        shipping_address = ShippingAddress.objects.get(content_hash=content_hash)
+
+        order = Order.objects.create(
+            user=user,
+            email=email,
+            shipping_address=shipping_address,
+            total_price=total,
+            item_count=sum(item.quantity for item in order_items),
         )
-        total += order_item.subtotal
 
-    # Update order total
-    order.total_price = total
-    order.save()
+        for order_item in order_items:
+            order_item.order = order
+        OrderItem.objects.bulk_create(order_items)
 
-    # Clear the cart
-    cart.clear()
+        if idempotency_key:
+            idempotency.complete(idempotency_key, order)
 
-    # Send notification
-    send_order_notification(order)
+        # Delivered by the process_outbox worker once this commits, keeping
+        # the hot rollup rows out of the checkout transaction. Digest mode
+        # leaves notification to the send_order_digest command
+        outbox.enqueue(outbox.SALES_ROLLUP, {"order_id": str(order.id)})
+        if settings.ORDER_NOTIFICATION_MODE == "per_order":
+            outbox.enqueue(outbox.ORDER_PLACED, {"order_id": str(order.id)})
 
+    cart.clear(release=False)
     return order
 
 
+def handle_order_placed(payload: dict[str, Any]) -> None:
+    """Outbox handler for ORDER_PLACED events."""
+    order = (
+        Order.objects.select_related("shipping_address")
+        .prefetch_related("items")
+        .get(pk=payload["order_id"])
+    )
+    send_order_notification(order)
+
+
 def send_order_notification(order: Order) -> None:
     """
     Send order notification email to store owner.
 
+    Runs from the outbox worker, never inside a request. Errors propagate
+    so the worker can retry with backoff.
+
     Args:
-        order: Order instance to notify about
+        order: Order instance to notify about, ideally with shipping_address
+            selected and items prefetched
     """
-    try:
-        subject = f"New Order #{str(order.id)[:8]}"
-        message = f"""
-New order received!
-
-Order ID: {order.id}
-Customer Email: {order.email}
-Total: ${order.total_price}
-Items: {order.item_count}
-
-Shipping Address:
-{order.shipping_address.name}
-{order.shipping_address.address_line_1}
-{order.shipping_address.address_line_2 or ''}
-{order.shipping_address.city}, {order.shipping_address.state} {order.shipping_address.postal_code}
-{order.shipping_address.country}
-
-Order Items:
-"""
-        for item in order.items.all():
-            message += f"- {item.product_name} x {item.quantity} @ ${item.price_at_purchase}\n"
-
-        # In development, just log the notification
-        logger.info(f"Order notification: {subject}\n{message}")
-
-        # In production, you would send an actual email:
-        # send_mail(
-        #     subject=subject,
-        #     message=message,
-        #     from_email=settings.DEFAULT_FROM_EMAIL,
-        #     recipient_list=[settings.STORE_OWNER_EMAIL],
-        # )
-
-    except Exception as e:
-        logger.error(f"Failed to send order notification: {e}")
+    address = order.shipping_address
+    lines = [
+        "New order received!",
+        "",
+        f"Order ID: {order.id}",
+        f"Customer Email: {order.email}",
+        f"Total: ${order.total_price}",
+        f"Items: {order.item_count}",
+        "",
+        "Shipping Address:",
+        address.name,
+        address.address_line_1,
+        *([address.address_line_2] if address.address_line_2 else []),
+        f"{address.city}, {address.state} {address.postal_code}",
+        address.country,
+        "",
+        "Order Items:",
+        *(
+            f"- {item.product_name} x {item.quantity} @ ${item.price_at_purchase}"
+            for item in order.items.all()
+        ),
+    ]
+
+    send_mail(
+        subject=f"New Order #{str(order.id)[:8]}",
+        message="\n".join(lines),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=[settings.STORE_OWNER_EMAIL],
+    )
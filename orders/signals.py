@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from orders.cache import invalidate_order_detail
+from orders.models import Order
+
+
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+def invalidate_order_on_change(sender: type, instance: Order, **kwargs: Any) -> None:
+    invalidate_order_detail(instance.pk)
@@ -0,0 +1,102 @@
+"""Tests for shipping address deduplication."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from orders.addresses import address_hash
+from orders.models import Order, ShippingAddress
+from products.models import Category, Product
+
+CHECKOUT = {
+    "email": "test@example.com",
+    "name": "John Doe",
+    "address_line_1": "123 Test St",
+    "city": "New York",
+    "state": "NY",
+    "postal_code": "10001",
+}
+
+
+def checkout(client: APIClient, product: Product, **overrides) -> None:
+    client.post(reverse("cart-items"), {"product_id": str(product.id), "quantity": 1})
+    client.post(reverse("checkout"), {**CHECKOUT, **overrides})
+
+
+@pytest.fixture
+def product(db) -> Product:
+    category = Category.objects.create(name="Test Category")
+    return Product.objects.create(
+        name="Test Hat", price=Decimal("29.99"), category=category, stock=10
+    )
+
+
+def test_hash_ignores_case_and_whitespace() -> None:
+    """Test that trivially different spellings hash the same."""
+    assert address_hash(CHECKOUT) == address_hash(
+        {**CHECKOUT, "name": "  john   DOE ", "city": "new york"}
+    )
+    assert address_hash(CHECKOUT) != address_hash({**CHECKOUT, "name": "Jane Doe"})
+
+
+@pytest.mark.django_db
+class TestCheckoutReusesAddress:
+    """Tests for reusing stored addresses at checkout."""
+
+    def test_repeat_address_is_shared(
+        self, api_client: APIClient, product: Product
+    ) -> None:
+        """Test that a repeat customer's orders share one address row."""
+        checkout(api_client, product)
+        checkout(api_client, product, address_line_1="123  TEST st")
+
+        assert Order.objects.count() == 2
+        assert ShippingAddress.objects.count() == 1
+        assert Order.objects.filter(shipping_address__isnull=False).count() == 2
+
+    def test_different_recipient_gets_new_row(
+        self, api_client: APIClient, product: Product
+    ) -> None:
+        """Test that the recipient name is part of the address identity."""
+        checkout(api_client, product)
+        checkout(api_client, product, name="Jane Doe")
+
+        assert ShippingAddress.objects.count() == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_migration_merges_existing_duplicates() -> None:
+    """Test that the dedupe migration repoints orders and drops copies."""
+    executor = MigrationExecutor(connection)
+    executor.migrate([("orders", "0010_archived_orders")])
+    apps = executor.loader.project_state(("orders", "0010_archived_orders")).apps
+    OldAddress = apps.get_model("orders", "ShippingAddress")
+    OldOrder = apps.get_model("orders", "Order")
+
+    fields = {k: v for k, v in CHECKOUT.items() if k != "email"}
+    first = OldAddress.objects.create(**fields)
+    copy = OldAddress.objects.create(**{**fields, "city": "NEW YORK"})
+    other = OldAddress.objects.create(**{**fields, "name": "Jane Doe"})
+    for address in (first, copy, other):
+        OldOrder.objects.create(
+            email="test@example.com", shipping_address_id=address.pk
+        )
+
+    executor = MigrationExecutor(connection)
+    executor.loader.build_graph()
+    executor.migrate(executor.loader.graph.leaf_nodes())
+
+    assert set(ShippingAddress.objects.values_list("pk", flat=True)) == {
+        first.pk,
+        other.pk,
+    }
+    assert Order.objects.filter(shipping_address_id=first.pk).count() == 2
+    assert ShippingAddress.objects.get(pk=first.pk).content_hash == address_hash(
+        {**fields, "country": "United States"}
+    )
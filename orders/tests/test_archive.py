@@ -0,0 +1,214 @@
+"""Tests for archiving old orders out of the hot tables."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from orders.archive import archive_orders
+from orders.export import iter_rows
+from orders.models import (
+    ArchivedOrder,
+    ArchivedOrderItem,
+    Order,
+    OrderItem,
+    ShippingAddress,
+)
+from products.models import Category, Product
+from reports.models import DailySalesRollup
+from reports.services import backfill
+from shared.tests.helpers import database_locked
+
+Status = Order.Status
+
+
+@pytest.fixture
+def address(db) -> ShippingAddress:
+    return ShippingAddress.objects.create(
+        name="John Doe",
+        address_line_1="123 Test St",
+        city="New York",
+        state="NY",
+        postal_code="10001",
+    )
+
+
+def create_order(
+    address: ShippingAddress,
+    order_status: str,
+    age_days: int = 400,
+    product: Product | None = None,
+) -> Order:
+    """Create an order with one item, backdated by age_days."""
+    order = Order.objects.create(
+        email="test@example.com",
+        shipping_address=address,
+        status=order_status,
+        total_price=Decimal("20.00"),
+        item_count=2,
+    )
+    OrderItem.objects.create(
+        order=order,
+        product=product,
+        product_name="Fedora",
+        quantity=2,
+        price_at_purchase=Decimal("10.00"),
+    )
+    Order.objects.filter(pk=order.pk).update(
+        created_at=timezone.now() - timedelta(days=age_days)
+    )
+    return order
+
+
+@pytest.mark.django_db
+class TestArchiveOrders:
+    """Tests for the archival job."""
+
+    def test_moves_old_terminal_orders(self, address: ShippingAddress) -> None:
+        """Test that only old delivered or cancelled orders are archived."""
+        delivered = create_order(address, Status.DELIVERED)
+        cancelled = create_order(address, Status.CANCELLED)
+        shipped = create_order(address, Status.SHIPPED)
+        recent = create_order(address, Status.DELIVERED, age_days=10)
+
+        archived = archive_orders(batch_size=1)
+
+        assert archived == 2
+        assert set(ArchivedOrder.objects.values_list("pk", flat=True)) == {
+            delivered.pk,
+            cancelled.pk,
+        }
+        assert set(Order.objects.values_list("pk", flat=True)) == {
+            shipped.pk,
+            recent.pk,
+        }
+        assert ArchivedOrderItem.objects.count() == 2
+        assert OrderItem.objects.count() == 2
+
+    def test_copies_order_and_address(self, address: ShippingAddress) -> None:
+        """Test that the archived row keeps ids, timestamps and address."""
+        order = create_order(address, Status.DELIVERED)
+        order.refresh_from_db()
+
+        archive_orders()
+
+        archived = ArchivedOrder.objects.get()
+        assert archived.created_at == order.created_at
+        assert archived.total_price == Decimal("20.00")
+        assert archived.shipping_address_id == address.pk
+        assert archived.shipping_city == "New York"
+
+    def test_keeps_addresses(self, address: ShippingAddress) -> None:
+        """Test that addresses stay for checkout to reuse once their orders move."""
+        create_order(address, Status.DELIVERED)
+
+        archive_orders()
+
+        assert not Order.objects.exists()
+        assert list(ShippingAddress.objects.all()) == [address]
+
+    def test_command(self, address: ShippingAddress) -> None:
+        """Test the archive_orders management command."""
+        create_order(address, Status.DELIVERED, age_days=40)
+        out = StringIO()
+
+        call_command("archive_orders", "--older-than-days=30", stdout=out)
+
+        assert "Archived 1 orders" in out.getvalue()
+        assert not Order.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_locked_batch_is_retried(address: ShippingAddress) -> None:
+    """A batch whose first write finds SQLite locked is retried whole."""
+    order = create_order(address, Status.DELIVERED)
+
+    with database_locked() as failed:
+        archived = archive_orders()
+
+    assert len(failed) == 1
+    assert archived == 1
+    assert not Order.objects.exists()
+    assert ArchivedOrder.objects.get().pk == order.pk
+    assert ArchivedOrderItem.objects.count() == 1
+
+
+@pytest.mark.django_db
+class TestArchivedOrderRetrieve:
+    """Tests for serving archived orders from the detail endpoint."""
+
+    def test_retrieve_falls_back_to_archive(
+        self, api_client: APIClient, address: ShippingAddress
+    ) -> None:
+        """Test that an archived order is returned in the usual shape."""
+        order = create_order(address, Status.DELIVERED)
+        url = reverse("order-detail", kwargs={"pk": order.pk})
+        live = api_client.get(url).data
+
+        archive_orders()
+        response = api_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == live
+        assert response["ETag"]
+
+
+@pytest.mark.django_db
+class TestArchivedOrdersInReports:
+    """Tests that sales rollups and the export still cover archived orders."""
+
+    @pytest.fixture
+    def fedora(self, db) -> Product:
+        return Product.objects.create(
+            name="Fedora",
+            price=Decimal("10.00"),
+            category=Category.objects.create(name="Hats"),
+            stock=10,
+        )
+
+    def test_backfill_counts_archived_orders(
+        self, address: ShippingAddress, fedora: Product
+    ) -> None:
+        """Test that rebuilding a day keeps its archived, uncancelled orders."""
+        delivered = create_order(address, Status.DELIVERED, product=fedora)
+        create_order(address, Status.CANCELLED, product=fedora)
+        shipped = create_order(address, Status.SHIPPED, product=fedora)
+        Order.objects.filter(pk=shipped.pk).update(
+            created_at=Order.objects.get(pk=delivered.pk).created_at
+        )
+        archive_orders()
+        assert ArchivedOrder.objects.count() == 2
+
+        day = timezone.localdate(ArchivedOrder.objects.get(pk=delivered.pk).created_at)
+        backfill(day, day)
+
+        rollup = DailySalesRollup.objects.get(date=day)
+        assert rollup.units == 4
+        assert rollup.revenue == Decimal("40.00")
+        assert rollup.order_count == 2
+
+    def test_export_merges_archived_orders(self, address: ShippingAddress) -> None:
+        """Test that the export is the same before and after archiving."""
+        for age_days in (400, 401, 402):
+            create_order(address, Status.DELIVERED, age_days=age_days)
+            create_order(address, Status.SHIPPED, age_days=age_days)
+        now = timezone.now()
+        start, end = now - timedelta(days=500), now
+
+        before = list(iter_rows(start, end, chunk_size=2))
+        archive_orders()
+        after = list(iter_rows(start, end, chunk_size=2))
+        resumed = list(iter_rows(start, end, cursor=after[2]["cursor"], chunk_size=2))
+
+        assert ArchivedOrder.objects.count() == 3
+        assert len(after) == 6
+        assert after == before
+        assert resumed == after[3:]
@@ -0,0 +1,135 @@
+"""Tests for periodic order digest emails."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+from orders import outbox
+from orders.digest import build_summary, send_digest
+from orders.models import Order, OrderDigest, OrderItem, ShippingAddress
+from shared.routers import pinned
+
+
+def create_order(items: list[tuple[str, int, str]], **kwargs) -> Order:
+    """Create an order with (product_name, quantity, price) items."""
+    address, _ = ShippingAddress.objects.get_or_create(
+        name="John Doe",
+        address_line_1="123 Test St",
+        city="New York",
+        state="NY",
+        postal_code="10001",
+    )
+    total = sum(Decimal(price) * quantity for _, quantity, price in items)
+    order = Order.objects.create(
+        email="test@example.com",
+        shipping_address=address,
+        total_price=total,
+        item_count=sum(quantity for _, quantity, _ in items),
+        **kwargs,
+    )
+    OrderItem.objects.bulk_create(
+        OrderItem(
+            order=order,
+            product_name=name,
+            quantity=quantity,
+            price_at_purchase=Decimal(price),
+        )
+        for name, quantity, price in items
+    )
+    return order
+
+
+@pytest.mark.django_db
+class TestOrderDigest:
+    """Tests for building and sending order digests."""
+
+    def test_summary_aggregates_window(self, django_assert_num_queries) -> None:
+        """Test totals and top products come from two aggregate queries."""
+        create_order([("Fedora", 2, "30.00"), ("Beanie", 1, "10.00")])
+        create_order([("Fedora", 1, "30.00")])
+        create_order([("Beret", 5, "20.00")], status=Order.Status.CANCELLED)
+        now = timezone.now()
+
+        with django_assert_num_queries(2):
+            summary = build_summary(now - timedelta(hours=1), now)
+
+        assert summary["order_count"] == 2
+        assert summary["units"] == 4
+        assert summary["revenue"] == Decimal("100.00")
+        assert [p["product_name"] for p in summary["top_products"]] == [
+            "Fedora",
+            "Beanie",
+        ]
+        assert summary["top_products"][0]["units"] == 3
+
+    # Outside the test transaction, where reads may go to a replica
+    @pytest.mark.django_db(transaction=True)
+    def test_summary_reads_primary(self, settings) -> None:
+        """Test that orders a lagging replica lacks still make the digest."""
+        create_order([("Fedora", 1, "30.00")])
+        # A replica serving nothing: any order read routed to it fails
+        settings.DATABASE_REPLICAS = ["lagging_replica"]
+        now = timezone.now()
+
+        # As in a cron run, which has written nothing to pin it
+        pinned_token = pinned.set(False)
+        try:
+            summary = build_summary(now - timedelta(hours=1), now)
+        finally:
+            pinned.reset(pinned_token)
+
+        assert summary["order_count"] == 1
+        assert summary["top_products"][0]["product_name"] == "Fedora"
+
+    def test_send_digest_emails_once_per_window(self, settings) -> None:
+        """Test that a digest is sent once the window elapses."""
+        settings.ORDER_DIGEST_WINDOW = timedelta(hours=1)
+        create_order([("Fedora", 1, "30.00")])
+        now = timezone.now()
+        OrderDigest.objects.create(
+            window_start=now - timedelta(hours=2), window_end=now - timedelta(hours=1)
+        )
+
+        digest = send_digest(now=now)
+        assert digest.order_count == 1
+        # Sent by the outbox worker once the window is committed
+        assert mail.outbox == []
+        outbox.drain()
+        assert len(mail.outbox) == 1
+        assert "Fedora: 1 sold, $30.00" in mail.outbox[0].body
+
+        assert send_digest(now=now + timedelta(minutes=5)) is None
+        outbox.drain()
+        assert len(mail.outbox) == 1
+
+    def test_overlapping_runs_record_window_once(
+        self, settings, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a run starting from an already recorded window sends nothing."""
+        settings.ORDER_DIGEST_WINDOW = timedelta(hours=1)
+        create_order([("Fedora", 1, "30.00")])
+        now = timezone.now()
+        first = send_digest(now=now)
+        # The second run read the previous digest before the first committed
+        monkeypatch.setattr(
+            "orders.digest._window_start", lambda now: first.window_start
+        )
+
+        assert send_digest(now=now + timedelta(seconds=30)) is None
+        outbox.drain()
+        assert OrderDigest.objects.count() == 1
+        assert len(mail.outbox) == 1
+
+    def test_empty_window_sends_nothing(self, db) -> None:
+        """Test that a window without orders is recorded silently."""
+        call_command("send_order_digest", "--force", stdout=StringIO())
+
+        assert OrderDigest.objects.count() == 1
+        assert mail.outbox == []
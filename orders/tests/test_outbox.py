@@ -0,0 +1,148 @@
+"""Tests for the transactional outbox and notification delivery."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.db import OperationalError
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from orders import outbox
+from orders.models import OutboxEvent
+from products.models import Category, Product
+
+
+def locked(failures: int | None, monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    """Make the outbox claim find the database locked failures times (None: always)."""
+    calls: list[int] = []
+    select_for_update = OutboxEvent.objects.select_for_update
+
+    def flaky(*args, **kwargs):
+        calls.append(1)
+        if failures is None or len(calls) <= failures:
+            raise OperationalError("database is locked")
+        return select_for_update(*args, **kwargs)
+
+    monkeypatch.setattr(OutboxEvent.objects, "select_for_update", flaky)
+    monkeypatch.setattr("shared.db.time.sleep", lambda seconds: None)
+    return calls
+
+
+@pytest.fixture
+def placed_order(api_client: APIClient, db) -> str:
+    """Check out a two-item cart and return the order id."""
+    category = Category.objects.create(name="Test Category")
+    product = Product.objects.create(
+        name="Test Hat", price=Decimal("29.99"), category=category, stock=10
+    )
+    api_client.post(
+        reverse("cart-items"), {"product_id": str(product.id), "quantity": 2}
+    )
+    response = api_client.post(
+        reverse("checkout"),
+        {
+            "email": "test@example.com",
+            "name": "John Doe",
+            "address_line_1": "123 Test St",
+            "city": "New York",
+            "state": "NY",
+            "postal_code": "10001",
+        },
+    )
+    return response.data["id"]
+
+
+@pytest.mark.django_db
+class TestOutbox:
+    """Tests for enqueueing and delivering outbox events."""
+
+    def test_checkout_enqueues_without_sending(self, placed_order: str) -> None:
+        """Test that checkout records an event instead of emailing inline."""
+        event = OutboxEvent.objects.get(topic=outbox.ORDER_PLACED)
+
+        assert event.payload == {"order_id": placed_order}
+        assert mail.outbox == []
+
+    def test_worker_sends_notification(self, placed_order: str) -> None:
+        """Test that the worker emails the store owner and drops the event."""
+        call_command("process_outbox", stdout=StringIO())
+
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].subject == f"New Order #{placed_order[:8]}"
+        assert "Test Hat x 2 @ $29.99" in mail.outbox[0].body
+        assert not OutboxEvent.objects.exists()
+
+    def test_failure_is_retried_with_backoff(
+        self, placed_order: str, monkeypatch
+    ) -> None:
+        """Test that a failing handler reschedules the event."""
+
+        def fail(*args, **kwargs):
+            raise ConnectionError("SMTP unavailable")
+
+        monkeypatch.setattr("orders.services.send_mail", fail)
+        outbox.drain()
+
+        event = OutboxEvent.objects.get(topic=outbox.ORDER_PLACED)
+        assert event.status == OutboxEvent.Status.PENDING
+        assert event.attempts == 1
+        assert event.available_at > timezone.now()
+        assert "SMTP unavailable" in event.last_error
+
+        monkeypatch.undo()
+        outbox.process_batch(now=event.available_at)
+        assert len(mail.outbox) == 1
+        assert not OutboxEvent.objects.exists()
+
+    def test_event_fails_after_max_attempts(
+        self, placed_order: str, monkeypatch, settings
+    ) -> None:
+        """Test that an event stops retrying after OUTBOX_MAX_ATTEMPTS."""
+        settings.OUTBOX_MAX_ATTEMPTS = 2
+
+        def fail(*args, **kwargs):
+            raise ConnectionError("SMTP unavailable")
+
+        monkeypatch.setattr("orders.services.send_mail", fail)
+        outbox.process_batch()
+        outbox.process_batch(now=timezone.now() + timedelta(days=1))
+
+        event = OutboxEvent.objects.get(topic=outbox.ORDER_PLACED)
+        assert event.status == OutboxEvent.Status.FAILED
+        assert event.attempts == 2
+
+    def test_enqueue_rejects_unknown_topic(self, db) -> None:
+        """Test that events without a handler are refused up front."""
+        with pytest.raises(ValueError):
+            outbox.enqueue("unknown.topic", {})
+
+    def test_locked_claim_skips_the_poll(
+        self, placed_order: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a claim still locked after retries leaves events due."""
+        locked(None, monkeypatch)
+
+        assert outbox.drain() == 0
+
+        monkeypatch.undo()
+        assert outbox.drain() == 2
+        assert len(mail.outbox) == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_locked_claim_is_retried(
+    placed_order: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a claim hitting the SQLite write lock backs off and retries."""
+    calls = locked(2, monkeypatch)
+
+    assert outbox.drain() == 2
+    assert len(calls) > 2
+    assert len(mail.outbox) == 1
@@ -0,0 +1,204 @@
+"""Tests for bulk order status transitions."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from orders import outbox
+from orders.cache import order_detail_key, set_order_detail
+from orders.models import Order, OrderItem, OrderStatusChange, ShippingAddress
+from orders.transitions import transition_orders
+from products.models import Category, Product
+from reports.models import DailySalesRollup
+from reports.services import record_order
+from shared.tests.helpers import database_locked
+
+Status = Order.Status
+
+
+def create_orders(count: int, order_status: str = Status.PENDING) -> list[Order]:
+    """Bulk-create orders sharing one shipping address."""
+    address, _ = ShippingAddress.objects.get_or_create(
+        name="John Doe",
+        address_line_1="123 Test St",
+        city="New York",
+        state="NY",
+        postal_code="10001",
+    )
+    return Order.objects.bulk_create(
+        Order(
+            email="test@example.com",
+            shipping_address=address,
+            total_price=Decimal("10.00"),
+            status=order_status,
+        )
+        for _ in range(count)
+    )
+
+
+@pytest.mark.django_db
+class TestTransitionOrders:
+    """Tests for the transition service."""
+
+    def test_moves_allowed_and_skips_rest(self) -> None:
+        """Test that only orders allowed to make the transition move."""
+        pending = create_orders(3)
+        delivered = create_orders(2, Status.DELIVERED)
+
+        result = transition_orders(
+            [o.pk for o in pending + delivered], Status.SHIPPED, note="Batch 42"
+        )
+
+        assert result == {"updated": 3, "skipped": 2}
+        assert Order.objects.filter(status=Status.SHIPPED).count() == 3
+        assert Order.objects.filter(status=Status.DELIVERED).count() == 2
+        changes = OrderStatusChange.objects.all()
+        assert {c.order_id for c in changes} == {o.pk for o in pending}
+        assert all(
+            c.from_status == Status.PENDING and c.note == "Batch 42" for c in changes
+        )
+
+    def test_queries_scale_with_batches_not_orders(self) -> None:
+        """Test that each batch costs a fixed number of queries."""
+        few = [o.pk for o in create_orders(5)]
+        many = [o.pk for o in create_orders(100)]
+
+        with CaptureQueriesContext(connection) as small:
+            transition_orders(few, Status.PAID, batch_size=500)
+        with CaptureQueriesContext(connection) as large:
+            transition_orders(many, Status.PAID, batch_size=500)
+
+        assert len(small.captured_queries) == len(large.captured_queries)
+
+    def test_updates_timestamp_and_invalidates_cache(
+        self, django_capture_on_commit_callbacks
+    ) -> None:
+        """Test that moved orders get a new updated_at and drop cached detail."""
+        order = create_orders(1)[0]
+        set_order_detail(order.pk, order.updated_at, {"status": Status.PENDING})
+
+        with django_capture_on_commit_callbacks(execute=True):
+            transition_orders([order.pk], Status.SHIPPED)
+
+        order_after = Order.objects.get(pk=order.pk)
+        assert order_after.updated_at > order.updated_at
+        assert cache.get(order_detail_key(order.pk)) is None
+
+    def test_unknown_status_rejected(self) -> None:
+        """Test that an invalid target status raises."""
+        with pytest.raises(ValueError):
+            transition_orders([], "lost")
+
+    def test_cancellation_reverses_sales_rollup(self) -> None:
+        """Test that cancelling a recorded order takes it out of the rollups."""
+        category = Category.objects.create(name="Hats")
+        product = Product.objects.create(
+            name="Fedora", price=Decimal("10.00"), category=category
+        )
+        orders = create_orders(2)
+        OrderItem.objects.bulk_create(
+            OrderItem(
+                order=order,
+                product=product,
+                product_name="Fedora",
+                quantity=1,
+                price_at_purchase=Decimal("10.00"),
+            )
+            for order in orders
+        )
+        for order in orders:
+            record_order({"order_id": str(order.pk)})
+
+        transition_orders([orders[0].pk], Status.CANCELLED)
+        outbox.drain()
+
+        rollup = DailySalesRollup.objects.get()
+        assert rollup.units == 1
+        assert rollup.revenue == Decimal("10.00")
+        assert rollup.order_count == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_locked_batch_is_retried() -> None:
+    """A batch whose first write finds SQLite locked is retried whole."""
+    orders = create_orders(3)
+
+    with database_locked() as failed:
+        result = transition_orders([o.pk for o in orders], Status.SHIPPED)
+
+    assert len(failed) == 1
+    assert result == {"updated": 3, "skipped": 0}
+    assert OrderStatusChange.objects.count() == 3
+
+
+@pytest.mark.django_db
+class TestOrderTransitionEndpoints:
+    """Tests for the bulk transition API and admin actions."""
+
+    def test_api_transitions_orders(self, staff_client: APIClient) -> None:
+        """Test that staff can move orders through the API."""
+        orders = create_orders(2)
+
+        response = staff_client.post(
+            reverse("order-transition"),
+            {"order_ids": [str(o.pk) for o in orders], "status": Status.SHIPPED},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {"updated": 2, "skipped": 0}
+        assert OrderStatusChange.objects.filter(changed_by__is_staff=True).count() == 2
+
+    def test_api_requires_admin(self, authenticated_client) -> None:
+        """Test that regular users cannot transition orders."""
+        client, _ = authenticated_client
+        order = create_orders(1)[0]
+
+        response = client.post(
+            reverse("order-transition"),
+            {"order_ids": [str(order.pk)], "status": Status.SHIPPED},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert Order.objects.get().status == Status.PENDING
+
+    def test_admin_action(self, admin_client) -> None:
+        """Test the changelist action for marking orders shipped."""
+        orders = create_orders(3)
+
+        admin_client.post(
+            reverse("admin:orders_order_changelist"),
+            {
+                "action": "mark_shipped",
+                "_selected_action": [str(o.pk) for o in orders],
+            },
+        )
+
+        assert Order.objects.filter(status=Status.SHIPPED).count() == 3
+
+    def test_admin_change_form_cannot_edit_status(self, admin_client, settings) -> None:
+        """Test that the change form leaves status to the audited actions."""
+        # Admin templates need static files; the manifest only exists after collectstatic
+        settings.STORAGES = {
+            **settings.STORAGES,
+            "staticfiles": {
+                "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+            },
+        }
+        order = create_orders(1)[0]
+
+        response = admin_client.get(
+            reverse("admin:orders_order_change", args=[order.pk])
+        )
+
+        assert response.status_code == 200
+        assert "status" not in response.context["adminform"].form.fields
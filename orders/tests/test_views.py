@@ -1,15 +1,35 @@
 """Tests for orders API endpoints."""
 from __future__ import annotations
 
+from datetime import timedelta
 from decimal import Decimal
 
 import pytest
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from orders.models import Order, OrderItem, ShippingAddress
+from accounts.tests.helpers import create_user
+from cart.models import StockReservation
+from cart.reservations import sweep_expired
+from cart.services import CartService
+from orders import outbox
+from orders.models import (
+    IdempotencyKey,
+    Order,
+    OrderItem,
+    OutboxEvent,
+    ShippingAddress,
+)
+from orders.services import create_order_from_cart
+from products.cache import get_product_summary
 from products.models import Category, Product
+from shared.routers import pinned
 
 
 @pytest.fixture
@@ -51,6 +71,27 @@ def checkout_data() -> dict:
     }
 
 
+def create_orders(user, count: int) -> None:
+    """Bulk-create orders for a user sharing one shipping address."""
+    address, _ = ShippingAddress.objects.get_or_create(
+        name="John Doe",
+        address_line_1="123 Test St",
+        city="New York",
+        state="NY",
+        postal_code="10001",
+    )
+    Order.objects.bulk_create(
+        Order(
+            user=user,
+            email=user.email,
+            shipping_address=address,
+            total_price=Decimal("10.00"),
+            item_count=2,
+        )
+        for _ in range(count)
+    )
+
+
 @pytest.mark.django_db
 class TestCheckoutView:
     """Tests for checkout endpoint."""
@@ -99,6 +140,100 @@ class TestCheckoutView:
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
+    def test_checkout_converts_reservations_to_sales(
+        self, cart_with_items: APIClient, checkout_data: dict, product: Product
+    ) -> None:
+        """Test that checkout decrements stock and drops the cart's hold."""
+        url = reverse("checkout")
+        cart_with_items.post(url, checkout_data)
+
+        product.refresh_from_db()
+        assert product.stock == 8
+        assert product.reserved == 0
+        assert not StockReservation.objects.exists()
+
+    def test_digest_mode_skips_per_order_notification(
+        self, cart_with_items: APIClient, checkout_data: dict, settings
+    ) -> None:
+        """Test that checkout does not queue per-order emails in digest mode."""
+        settings.ORDER_NOTIFICATION_MODE = "digest"
+
+        url = reverse("checkout")
+        response = cart_with_items.post(url, checkout_data)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert not OutboxEvent.objects.filter(topic=outbox.ORDER_PLACED).exists()
+
+    def test_checkout_after_hold_expired_uses_free_stock(
+        self, cart_with_items: APIClient, checkout_data: dict, product: Product
+    ) -> None:
+        """Test that an expired, swept hold is re-acquired at checkout."""
+        sweep_expired(now=timezone.now() + timedelta(days=1))
+
+        url = reverse("checkout")
+        response = cart_with_items.post(url, checkout_data)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        product.refresh_from_db()
+        assert product.stock == 8
+        assert product.reserved == 0
+
+    def test_checkout_rejects_unavailable_items(
+        self, cart_with_items: APIClient, checkout_data: dict, product: Product
+    ) -> None:
+        """Test that checkout refuses items deactivated after being added."""
+        product.is_active = False
+        product.save()
+
+        url = reverse("checkout")
+        response = cart_with_items.post(url, checkout_data)
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response.data["validation"]["unavailable"] == [str(product.id)]
+        assert Order.objects.count() == 0
+
+    def test_checkout_confirms_price_increase(
+        self, cart_with_items: APIClient, checkout_data: dict, product: Product
+    ) -> None:
+        """Test that a price rise is reported before the new price is charged."""
+        old_price = str(product.price)
+        product.price = Decimal("40.00")
+        product.save()
+
+        url = reverse("checkout")
+        response = cart_with_items.post(url, checkout_data)
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response.data["validation"]["valid"] is False
+        assert response.data["validation"]["price_changes"] == [
+            {
+                "product_id": str(product.id),
+                "name": product.name,
+                "old_price": old_price,
+                "new_price": "40.00",
+            }
+        ]
+        assert Order.objects.count() == 0
+
+        # Checking out again confirms the new price
+        response = cart_with_items.post(url, checkout_data)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Decimal(response.data["total_price"]) == Decimal("80.00")
+
+    def test_checkout_charges_lower_price(
+        self, cart_with_items: APIClient, checkout_data: dict, product: Product
+    ) -> None:
+        """Test that a price drop is applied without asking again."""
+        product.price = Decimal("5.00")
+        product.save()
+
+        url = reverse("checkout")
+        response = cart_with_items.post(url, checkout_data)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Decimal(response.data["total_price"]) == Decimal("10.00")
+
     def test_checkout_missing_fields_fails(
         self, cart_with_items: APIClient
     ) -> None:
@@ -166,3 +301,317 @@ class TestOrderViewSet:
         # 2 items at 29.99 each
         expected_total = Decimal("59.98")
         assert Decimal(response.data["total_price"]) == expected_total
+
+
+@pytest.mark.django_db
+class TestCreateOrderFromCart:
+    """Tests for the checkout service."""
+
+    def _cart_with_lines(self, category: Category, lines: int) -> CartService:
+        cart = CartService(SessionStore())
+        for i in range(lines):
+            product = Product.objects.create(
+                name=f"Hat {lines}-{i}",
+                price=Decimal("10.00"),
+                category=category,
+                stock=5,
+            )
+            cart.add(get_product_summary(str(product.id)), 2)
+        return cart
+
+    def _checkout_queries(self, cart: CartService, checkout_data: dict) -> int:
+        shipping_data = {k: v for k, v in checkout_data.items() if k != "email"}
+        with CaptureQueriesContext(connection) as ctx:
+            create_order_from_cart(cart, checkout_data["email"], shipping_data)
+        return len(ctx.captured_queries)
+
+    def test_query_count_is_constant_in_cart_size(
+        self, category: Category, checkout_data: dict
+    ) -> None:
+        """Test that checkout does not issue per-line queries."""
+        small = self._checkout_queries(
+            self._cart_with_lines(category, 1), checkout_data
+        )
+        large = self._checkout_queries(
+            self._cart_with_lines(category, 10), checkout_data
+        )
+
+        assert small == large
+        assert large <= 15
+
+    def test_order_total_written_on_insert(
+        self, category: Category, checkout_data: dict
+    ) -> None:
+        """Test that items and total are stored without a second order save."""
+        cart = self._cart_with_lines(category, 3)
+        shipping_data = {k: v for k, v in checkout_data.items() if k != "email"}
+
+        with CaptureQueriesContext(connection) as ctx:
+            order = create_order_from_cart(cart, checkout_data["email"], shipping_data)
+
+        order.refresh_from_db()
+        assert order.total_price == Decimal("60.00")
+        assert order.items.count() == 3
+        assert not any(
+            q["sql"].startswith('UPDATE "orders"') for q in ctx.captured_queries
+        )
+
+    def test_failure_leaves_no_partial_order(
+        self, category: Category, checkout_data: dict, monkeypatch
+    ) -> None:
+        """Test that an error while inserting items rolls back the order."""
+        cart = self._cart_with_lines(category, 2)
+        shipping_data = {k: v for k, v in checkout_data.items() if k != "email"}
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(OrderItem.objects, "bulk_create", fail)
+        with pytest.raises(RuntimeError):
+            create_order_from_cart(cart, checkout_data["email"], shipping_data)
+
+        assert Order.objects.count() == 0
+        assert ShippingAddress.objects.count() == 0
+        assert Product.objects.filter(reserved=2).count() == 2
+        assert cart.total_items == 4
+
+
+@pytest.mark.django_db
+class TestCheckoutIdempotency:
+    """Tests for retrying checkout with an Idempotency-Key."""
+
+    def test_retry_returns_original_order(
+        self, cart_with_items: APIClient, checkout_data: dict
+    ) -> None:
+        """Test that a retried request replays instead of ordering twice."""
+        url = reverse("checkout")
+        first = cart_with_items.post(url, checkout_data, HTTP_IDEMPOTENCY_KEY="retry-1")
+        # A retry from a client that never saw the session cookie
+        retry = APIClient().post(url, checkout_data, HTTP_IDEMPOTENCY_KEY="retry-1")
+
+        assert first.status_code == status.HTTP_201_CREATED
+        assert retry.status_code == status.HTTP_201_CREATED
+        assert retry.data["id"] == first.data["id"]
+        assert retry["Idempotent-Replayed"] == "true"
+        assert Order.objects.count() == 1
+
+    def test_key_reused_with_different_body(
+        self, cart_with_items: APIClient, checkout_data: dict
+    ) -> None:
+        """Test that a key cannot be replayed for a different request."""
+        url = reverse("checkout")
+        cart_with_items.post(url, checkout_data, HTTP_IDEMPOTENCY_KEY="retry-2")
+
+        checkout_data["email"] = "other@example.com"
+        response = cart_with_items.post(
+            url, checkout_data, HTTP_IDEMPOTENCY_KEY="retry-2"
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_concurrent_duplicate_fails_fast(
+        self, cart_with_items: APIClient, checkout_data: dict
+    ) -> None:
+        """Test that a duplicate arriving mid-checkout gets 409."""
+        IdempotencyKey.objects.create(
+            key="retry-3",
+            request_hash="in-progress",
+            expires_at=timezone.now() + timedelta(hours=1),
+        )
+
+        url = reverse("checkout")
+        response = cart_with_items.post(
+            url, checkout_data, HTTP_IDEMPOTENCY_KEY="retry-3"
+        )
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response["Retry-After"] == "1"
+        assert Order.objects.count() == 0
+
+    def test_failed_checkout_releases_key(
+        self, api_client: APIClient, checkout_data: dict, product: Product
+    ) -> None:
+        """Test that a key is reusable after checkout fails."""
+        url = reverse("checkout")
+        failed = api_client.post(url, checkout_data, HTTP_IDEMPOTENCY_KEY="retry-4")
+        assert failed.status_code == status.HTTP_400_BAD_REQUEST
+
+        api_client.post(
+            reverse("cart-items"), {"product_id": str(product.id), "quantity": 1}
+        )
+        response = api_client.post(url, checkout_data, HTTP_IDEMPOTENCY_KEY="retry-4")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert IdempotencyKey.objects.get(key="retry-4").order_id is not None
+
+    # Outside the test transaction, where reads may go to a replica
+    @pytest.mark.django_db(transaction=True)
+    def test_replay_reads_primary_when_replica_lags(
+        self, cart_with_items: APIClient, checkout_data: dict, settings
+    ) -> None:
+        """Test that a replay finds an order no replica has received yet."""
+        url = reverse("checkout")
+        first = cart_with_items.post(url, checkout_data, HTTP_IDEMPOTENCY_KEY="retry-5")
+        # A replica serving nothing: any order read routed to it fails
+        settings.DATABASE_REPLICAS = ["lagging_replica"]
+        pinned_token = pinned.set(False)
+        try:
+            retry = APIClient().post(url, checkout_data, HTTP_IDEMPOTENCY_KEY="retry-5")
+        finally:
+            pinned.reset(pinned_token)
+
+        assert retry.status_code == status.HTTP_201_CREATED
+        assert retry.data["id"] == first.data["id"]
+
+
+@pytest.mark.django_db
+class TestOrderItemCount:
+    """Tests for the denormalized Order.item_count."""
+
+    def test_checkout_stores_item_count(
+        self, cart_with_items: APIClient, checkout_data: dict
+    ) -> None:
+        """Test that checkout writes the unit count on the order row."""
+        response = cart_with_items.post(reverse("checkout"), checkout_data)
+
+        assert response.data["item_count"] == 2
+        assert Order.objects.get().item_count == 2
+
+    def test_admin_changelist_has_no_per_row_queries(
+        self, admin_client, settings
+    ) -> None:
+        """Test that the admin order list does not query items per row."""
+        settings.STORAGES = {
+            **settings.STORAGES,
+            "staticfiles": {
+                "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+            },
+        }
+        user = create_user(email="buyer@example.com")
+        url = reverse("admin:orders_order_changelist")
+
+        create_orders(user, 2)
+        with CaptureQueriesContext(connection) as few:
+            admin_client.get(url)
+
+        create_orders(user, 30)
+        with CaptureQueriesContext(connection) as many:
+            response = admin_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(many.captured_queries) == len(few.captured_queries)
+
+
+@pytest.mark.django_db
+class TestOrderHistory:
+    """Tests for the authenticated order history endpoint."""
+
+    def test_list_query_budget_is_constant(self, authenticated_client) -> None:
+        """Test that listing costs the same for 3 orders as for 2000."""
+        client, user = authenticated_client
+        url = reverse("order-list")
+
+        create_orders(user, 3)
+        with CaptureQueriesContext(connection) as few:
+            client.get(url)
+
+        create_orders(user, 2000)
+        with CaptureQueriesContext(connection) as many:
+            response = client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 2003
+        assert len(response.data["results"]) == 20
+        # JWT user lookup, COUNT(*), one page of orders
+        assert len(many.captured_queries) == len(few.captured_queries) == 3
+
+    def test_list_only_returns_own_orders(self, authenticated_client) -> None:
+        """Test that order history is scoped to the requesting user."""
+        client, user = authenticated_client
+        create_orders(user, 2)
+        create_orders(create_user(email="other@example.com"), 5)
+
+        response = client.get(reverse("order-list"))
+
+        assert response.data["count"] == 2
+
+    def test_retrieve_joins_shipping_address(
+        self, cart_with_items: APIClient, checkout_data: dict
+    ) -> None:
+        """Test that order detail costs one join plus one items query."""
+        order_id = cart_with_items.post(reverse("checkout"), checkout_data).data["id"]
+        url = reverse("order-detail", kwargs={"pk": order_id})
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as ctx:
+            cart_with_items.get(url)
+
+        order_queries = [
+            q["sql"]
+            for q in ctx.captured_queries
+            if '"orders"' in q["sql"] or '"order_items"' in q["sql"]
+        ]
+        # updated_at lookup for the ETag, then the joined order and its items
+        assert len(order_queries) == 3
+        assert 'JOIN "shipping_addresses"' in order_queries[1]
+
+
+@pytest.mark.django_db
+class TestOrderDetailCache:
+    """Tests for cached order detail payloads and ETags."""
+
+    @pytest.fixture
+    def order_url(self, cart_with_items: APIClient, checkout_data: dict) -> str:
+        order_id = cart_with_items.post(reverse("checkout"), checkout_data).data["id"]
+        return reverse("order-detail", kwargs={"pk": order_id})
+
+    def test_cached_detail_skips_order_queries(
+        self, cart_with_items: APIClient, order_url: str
+    ) -> None:
+        """Test that a cached payload costs only the updated_at lookup."""
+        cart_with_items.get(order_url)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = cart_with_items.get(order_url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["status"] == Order.Status.PENDING
+        order_queries = [
+            q["sql"]
+            for q in ctx.captured_queries
+            if '"orders"' in q["sql"] or '"order_items"' in q["sql"]
+        ]
+        assert len(order_queries) == 1
+
+    def test_if_none_match_returns_304(
+        self, cart_with_items: APIClient, order_url: str
+    ) -> None:
+        """Test that polling with the current ETag returns Not Modified."""
+        etag = cart_with_items.get(order_url)["ETag"]
+
+        response = cart_with_items.get(order_url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response["ETag"] == etag
+        assert not response.content
+
+    def test_status_change_invalidates(
+        self, cart_with_items: APIClient, order_url: str
+    ) -> None:
+        """Test that saving a new status yields a new ETag and payload."""
+        etag = cart_with_items.get(order_url)["ETag"]
+        order = Order.objects.get()
+        order.status = Order.Status.SHIPPED
+        order.save()
+
+        response = cart_with_items.get(order_url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+        assert response.data["status"] == Order.Status.SHIPPED
+
+    def test_malformed_id_returns_404(self, api_client: APIClient) -> None:
+        """Test that a non-UUID order id is treated as not found."""
+        response = api_client.get(reverse("order-detail", kwargs={"pk": "not-a-uuid"}))
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
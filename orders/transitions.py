@@ -0,0 +1,130 @@
+"""
+Bulk order status transitions for fulfillment.
+
+Orders are moved in batches: each batch locks the orders still eligible
+for the target status, updates them with a single UPDATE ... WHERE id IN
+(...), and records an OrderStatusChange per order with one bulk_create.
+No per-order save() runs, so post_save receivers do not fire; caches are
+invalidated explicitly once each batch commits. A batch that finds SQLite
+locked is retried on its own.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from itertools import islice
+from typing import Any, TypedDict
+
+from django.db import transaction
+from django.utils import timezone
+
+from orders import outbox
+from orders.cache import invalidate_order_detail
+from orders.models import Order, OrderStatusChange
+from shared.db import retry_on_db_lock
+
+Status = Order.Status
+
+# Status -> statuses it may move to. Orders start as PENDING and there is
+# no payment step yet, so fulfillment may ship them directly.
+ALLOWED_TRANSITIONS: dict[str, frozenset[str]] = {
+    Status.PENDING: frozenset({Status.PAID, Status.SHIPPED, Status.CANCELLED}),
+    Status.PAID: frozenset({Status.SHIPPED, Status.CANCELLED}),
+    Status.SHIPPED: frozenset({Status.DELIVERED}),
+    Status.DELIVERED: frozenset(),
+    Status.CANCELLED: frozenset(),
+}
+
+
+class TransitionResult(TypedDict):
+    """Outcome of a bulk transition."""
+
+    updated: int
+    skipped: int
+
+
+def can_transition(from_status: str, to_status: str) -> bool:
+    return to_status in ALLOWED_TRANSITIONS.get(from_status, frozenset())
+
+
+def _batches(items: Iterable[Any], size: int) -> Iterable[list[Any]]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def transition_orders(
+    order_ids: Iterable[Any],
+    to_status: str,
+    changed_by: Any = None,
+    note: str = "",
+    batch_size: int = 500,
+) -> TransitionResult:
+    """
+    Move orders to to_status where the transition is allowed.
+
+    Orders that do not exist, are already in to_status, or may not move
+    there from their current status are skipped rather than failing the
+    batch. Each batch commits on its own, so a large run holds locks only
+    briefly.
+
+    Args:
+        order_ids: Ids of the orders to move; may be a lazy iterable
+        to_status: Target Order.Status value
+        changed_by: User recorded on the audit rows
+        note: Free-text reason recorded on the audit rows
+        batch_size: Orders per UPDATE; keeps IN lists under SQLite's
+            parameter limit
+
+    Returns:
+        Counts of updated and skipped orders
+
+    Raises:
+        ValueError: If to_status is not an Order.Status value
+    """
+    if to_status not in Status.values:
+        raise ValueError(f"Unknown order status '{to_status}'")
+    eligible = [s for s in ALLOWED_TRANSITIONS if can_transition(s, to_status)]
+
+    updated = skipped = 0
+    for batch in _batches(order_ids, batch_size):
+        moved = _transition_batch(batch, eligible, to_status, changed_by, note)
+        updated += moved
+        skipped += len(batch) - moved
+
+    return TransitionResult(updated=updated, skipped=skipped)
+
+
+@retry_on_db_lock
+def _transition_batch(
+    batch: list[Any], eligible: list[str], to_status: str, changed_by: Any, note: str
+) -> int:
+    with transaction.atomic():
+        current = dict(
+            Order.objects.select_for_update()
+            .filter(pk__in=batch, status__in=eligible)
+            .values_list("pk", "status")
+        )
+        if not current:
+            return 0
+        Order.objects.filter(pk__in=current).update(
+            status=to_status, updated_at=timezone.now()
+        )
+        OrderStatusChange.objects.bulk_create(
+            OrderStatusChange(
+                order_id=pk,
+                from_status=from_status,
+                to_status=to_status,
+                changed_by=changed_by,
+                note=note,
+            )
+            for pk, from_status in current.items()
+        )
+        if to_status == Status.CANCELLED:
+            outbox.enqueue(
+                outbox.SALES_REVERSAL,
+                {"order_ids": [str(pk) for pk in current]},
+            )
+        pks = list(current)
+        transaction.on_commit(lambda: invalidate_order_detail(*pks))
+    return len(current)
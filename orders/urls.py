@@ -3,6 +3,7 @@ from __future__ import annotations
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
+from orders.admin_views import OrderExportView, OrderTransitionView
 from orders.views import CheckoutView, OrderViewSet
 
 router = DefaultRouter()
@@ -11,4 +12,10 @@ router.register(r"orders", OrderViewSet, basename="order")
 urlpatterns = [
     path("orders/checkout/", CheckoutView.as_view(), name="checkout"),
     path("", include(router.urls)),
+    path("admin/orders/export/", OrderExportView.as_view(), name="order-export"),
+    path(
+        "admin/orders/transition/",
+        OrderTransitionView.as_view(),
+        name="order-transition",
+    ),
 ]
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+from typing import Any
+
+from django.core.exceptions import ValidationError
+from django.utils.http import parse_etags
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -7,9 +11,14 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from cart.services import CartService
-from orders.models import Order
+from cart.reservations import InsufficientStock
+from cart.services import CartService, CartValidationError
+from monitoring.metrics import CHECKOUTS
+from orders import idempotency
+from orders.cache import get_order_detail, order_etag, set_order_detail
+from orders.models import ArchivedOrder, IdempotencyKey, Order
 from orders.serializers import (
+    ArchivedOrderSerializer,
     CheckoutSerializer,
     OrderListSerializer,
     OrderSerializer,
@@ -22,26 +31,87 @@ class CheckoutView(APIView):
     View for checkout process.
 
     POST /api/orders/checkout/ - Create order from cart
+
+    Headers:
+        Idempotency-Key: Optional client-generated key. Retrying with the
+            same key and body returns the original order instead of
+            creating another one.
+
+    Responds 409 with the cart validation when items are unavailable or
+    prices went up; the cart then holds the current prices, so posting
+    again confirms them.
     """
 
     permission_classes = [AllowAny]
+    uses_session = True
 
     def post(self, request: Request) -> Response:
         serializer = CheckoutSerializer(data=request.data)
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+        data = serializer.validated_data
+        user = request.user if request.user.is_authenticated else None
+
+        key = request.headers.get("Idempotency-Key")
+        if key is None:
+            return self._checkout(request, data, user)
+
+        if not key or len(key) > IdempotencyKey._meta.get_field("key").max_length:
+            return Response(
+                {"error": "Invalid Idempotency-Key"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            order = idempotency.claim(
+                key, idempotency.request_fingerprint(data, getattr(user, "pk", None))
+            )
+        except idempotency.IdempotencyInProgress as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_409_CONFLICT,
+                headers={"Retry-After": "1"},
+            )
+        except idempotency.IdempotencyMismatch as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+
+        if order is not None:
+            CHECKOUTS.labels("replayed").inc()
+            return Response(
+                OrderSerializer(order).data,
+                status=status.HTTP_201_CREATED,
+                headers={"Idempotent-Replayed": "true"},
+            )
+
+        try:
+            response = self._checkout(request, data, user, key)
+        except Exception:
+            idempotency.release(key)
+            raise
+        if response.status_code != status.HTTP_201_CREATED:
+            idempotency.release(key)
+        return response
+
+    def _checkout(
+        self,
+        request: Request,
+        data: dict[str, Any],
+        user: Any,
+        idempotency_key: str | None = None,
+    ) -> Response:
         cart = CartService(request.session)
 
         if not cart.get_items():
+            CHECKOUTS.labels("empty_cart").inc()
             return Response(
                 {"error": "Cart is empty"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        data = serializer.validated_data
-        user = request.user if request.user.is_authenticated else None
-
         try:
             order = create_order_from_cart(
                 cart=cart,
@@ -56,17 +126,32 @@ class CheckoutView(APIView):
                     "country": data.get("country", "United States"),
                 },
                 user=user,
+                idempotency_key=idempotency_key,
+            )
+        except CartValidationError as e:
+            CHECKOUTS.labels("invalid_cart").inc()
+            return Response(
+                {"error": str(e), "validation": e.validation},
+                status=status.HTTP_409_CONFLICT,
+            )
+        except InsufficientStock as e:
+            CHECKOUTS.labels("out_of_stock").inc()
+            return Response(
+                {"error": str(e), "product_ids": e.product_ids},
+                status=status.HTTP_409_CONFLICT,
             )
         except ValueError as e:
+            CHECKOUTS.labels("rejected").inc()
             return Response(
                 {"error": str(e)},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        return Response(
-            OrderSerializer(order).data,
-            status=status.HTTP_201_CREATED,
-        )
+        CHECKOUTS.labels("placed").inc()
+        data = OrderSerializer(order).data
+        # The confirmation page fetches this order next
+        set_order_detail(order.pk, order.updated_at, data)
+        return Response(data, status=status.HTTP_201_CREATED)
 
 
 class OrderViewSet(viewsets.ReadOnlyModelViewSet):
@@ -81,11 +166,14 @@ class OrderViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [AllowAny]  # Allow anonymous order lookup by ID
 
     def get_queryset(self):
-        if self.request.user.is_authenticated:
-            return Order.objects.filter(user=self.request.user).prefetch_related(
-                "items", "shipping_address"
-            )
-        return Order.objects.none()
+        if not self.request.user.is_authenticated:
+            return Order.objects.none()
+
+        queryset = Order.objects.filter(user=self.request.user)
+        if self.action == "list":
+            # OrderListSerializer only reads columns on the order row
+            return queryset
+        return queryset.select_related("shipping_address").prefetch_related("items")
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -93,14 +181,47 @@ class OrderViewSet(viewsets.ReadOnlyModelViewSet):
         return OrderSerializer
 
     def retrieve(self, request: Request, *args, **kwargs) -> Response:
-        # Allow anonymous users to retrieve their order by ID
+        """
+        Get order details; anonymous users may retrieve their order by ID.
+
+        Only status changes after checkout, so the payload is cached per
+        (id, updated_at) and the response carries an ETag derived from the
+        same pair. A matching If-None-Match costs a single indexed lookup
+        and returns 304 Not Modified. Orders moved out by the archival job
+        are served from the archive tables in the same shape.
+        """
+        pk = kwargs.get("pk")
         try:
-            order = Order.objects.prefetch_related(
-                "items", "shipping_address"
-            ).get(pk=kwargs.get("pk"))
-            return Response(OrderSerializer(order).data)
-        except Order.DoesNotExist:
+            model, serializer_class = Order, OrderSerializer
+            updated_at = self._updated_at(model, pk)
+            if updated_at is None:
+                model, serializer_class = ArchivedOrder, ArchivedOrderSerializer
+                updated_at = self._updated_at(model, pk)
+        except ValidationError:
+            updated_at = None
+        if updated_at is None:
             return Response(
                 {"error": "Order not found"},
                 status=status.HTTP_404_NOT_FOUND,
             )
+
+        etag = order_etag(pk, updated_at)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+        if etag in if_none_match or "*" in if_none_match:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        data = get_order_detail(pk, updated_at)
+        if data is None:
+            queryset = model.objects.prefetch_related("items")
+            if model is Order:
+                queryset = queryset.select_related("shipping_address")
+            order = queryset.get(pk=pk)
+            data = serializer_class(order).data
+            set_order_detail(pk, order.updated_at, data)
+            headers["ETag"] = order_etag(pk, order.updated_at)
+        return Response(data, headers=headers)
+
+    @staticmethod
+    def _updated_at(model: type[Order] | type[ArchivedOrder], pk: Any) -> Any:
+        return model.objects.filter(pk=pk).values_list("updated_at", flat=True).first()
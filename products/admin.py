@@ -26,7 +26,16 @@ class CategoryAdmin(admin.ModelAdmin):
 class ProductAdmin(admin.ModelAdmin):
     """Admin configuration for Product model."""
 
-    list_display = ["name", "category", "price", "stock", "is_active", "created_at"]
+    list_display = [
+        "name",
+        "category",
+        "price",
+        "stock",
+        "reserved",
+        "is_active",
+        "created_at",
+    ]
+    readonly_fields = ["reserved"]
     list_filter = ["category", "is_active"]
     search_fields = ["name", "description"]
     prepopulated_fields = {"slug": ("name",)}
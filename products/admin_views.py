@@ -12,6 +12,7 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from monitoring.metrics import PRODUCT_IMPORT_ROWS
 from products.models import Category, Product, ProductImage
 
 
@@ -67,10 +68,13 @@ class ProductImportView(APIView):
             result = self._process_row(row, row_num)
             if result.get("error"):
                 results["errors"].append(result["error"])
+                PRODUCT_IMPORT_ROWS.labels("error").inc()
             elif result.get("created"):
                 results["created"] += 1
+                PRODUCT_IMPORT_ROWS.labels("created").inc()
             elif result.get("updated"):
                 results["updated"] += 1
+                PRODUCT_IMPORT_ROWS.labels("updated").inc()
 
         return Response(results)
 
@@ -8,3 +8,6 @@ class ProductsConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "products"
+
+    def ready(self) -> None:
+        from products import signals  # noqa: F401
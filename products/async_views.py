@@ -0,0 +1,94 @@
+"""
+Async catalog views for ASGI deployments (see config.urls_async).
+
+Same URLs and responses as CategoryViewSet and ProductViewSet.
+"""
+
+from __future__ import annotations
+
+from django.db.models import Count, Q
+from django.http import HttpRequest, HttpResponse
+
+from products.models import Category, Product
+from products.serializers import (
+    CategorySerializer,
+    ProductDetailSerializer,
+    ProductListSerializer,
+)
+from products.views import CategoryViewSet, ProductViewSet
+from shared.async_views import AsyncReadView, json_response, not_found, paginate
+
+
+def _active_products():
+    return (
+        Product.objects.filter(is_active=True)
+        .select_related("category")
+        .prefetch_related("images")
+    )
+
+
+async def _attach_category_counts(products: list[Product]) -> None:
+    """Set product_count on each product's category with one GROUP BY query."""
+    category_ids = {product.category_id for product in products}
+    if not category_ids:
+        return
+    counts = {
+        row["category"]: row["count"]
+        async for row in Product.objects.filter(
+            is_active=True, category__in=category_ids
+        )
+        .values("category")
+        .annotate(count=Count("id"))
+    }
+    for product in products:
+        product.category.product_count = counts.get(product.category_id, 0)
+
+
+class CategoryListView(AsyncReadView):
+    """GET /api/categories/"""
+
+    sync_view = staticmethod(CategoryViewSet.as_view({"get": "list"}))
+
+    async def get(self, request: HttpRequest) -> HttpResponse:
+        queryset = Category.objects.annotate(
+            product_count=Count("products", filter=Q(products__is_active=True))
+        )
+        return await paginate(request, queryset, CategorySerializer)
+
+
+class ProductListView(AsyncReadView):
+    """
+    GET /api/products/
+
+    Query Parameters:
+        category: Filter by category slug
+        search: Case-insensitive substring of the product name
+    """
+
+    sync_view = staticmethod(ProductViewSet.as_view({"get": "list"}))
+
+    async def get(self, request: HttpRequest) -> HttpResponse:
+        queryset = _active_products()
+        category_slug = request.GET.get("category")
+        if category_slug:
+            queryset = queryset.filter(category__slug=category_slug)
+        search = request.GET.get("search", "").strip()
+        if search:
+            queryset = queryset.filter(name__icontains=search)
+        return await paginate(
+            request, queryset, ProductListSerializer, prepare=_attach_category_counts
+        )
+
+
+class ProductDetailView(AsyncReadView):
+    """GET /api/products/{slug}/"""
+
+    sync_view = staticmethod(ProductViewSet.as_view({"get": "retrieve"}))
+
+    async def get(self, request: HttpRequest, slug: str) -> HttpResponse:
+        try:
+            product = await _active_products().aget(slug=slug)
+        except Product.DoesNotExist:
+            return not_found("No Product matches the given query.")
+        await _attach_category_counts([product])
+        return json_response(ProductDetailSerializer(product).data)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Any, Generic, TypedDict, TypeVar
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import OuterRef, Subquery
+
+from monitoring.metrics import record_cache
+from products.models import Product, ProductImage
+
+V = TypeVar("V")
+
+
+class ProductSummary(TypedDict):
+    """Catalog fields needed to put a product in the cart."""
+
+    id: str
+    name: str
+    price: Decimal
+    image_url: str | None
+    is_active: bool
+    stock: int
+
+
+class LRUCache(Generic[V]):
+    """
+    Thread-safe, size-bounded LRU cache whose entries expire after a TTL.
+
+    Entries live in process memory, so each worker keeps its own copy;
+    the TTL bounds how long another worker's writes can stay invisible.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[Any, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> V | None:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Any, value: V) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Any) -> None:
+        """Drop a single entry if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+product_summaries: LRUCache[ProductSummary] = LRUCache(
+    max_size=settings.PRODUCT_SUMMARY_CACHE_SIZE,
+    ttl=settings.PRODUCT_SUMMARY_CACHE_TTL,
+)
+
+
+def _load_product_summary(product_id: str) -> ProductSummary | None:
+    """Load a summary with one query, resolving the primary image inline."""
+    # Same precedence as Product.primary_image: primary first, then ordering
+    primary_image_url = (
+        ProductImage.objects.filter(product=OuterRef("pk"))
+        .order_by("-is_primary", "display_order", "created_at")
+        .values("image_url")[:1]
+    )
+    try:
+        row = (
+            Product.objects.filter(id=product_id)
+            .annotate(primary_image_url=Subquery(primary_image_url))
+            .values("id", "name", "price", "primary_image_url", "is_active", "stock")
+            .first()
+        )
+    except ValidationError:
+        # Malformed UUID
+        return None
+
+    if row is None:
+        return None
+
+    return ProductSummary(
+        id=str(row["id"]),
+        name=row["name"],
+        price=row["price"],
+        image_url=row["primary_image_url"],
+        is_active=row["is_active"],
+        stock=row["stock"],
+    )
+
+
+def get_product_summary(product_id: str) -> ProductSummary | None:
+    """
+    Get a product summary, loading it from the database on a cache miss.
+
+    Returns None for unknown products. Inactive products are returned so
+    callers can tell "not found" apart from "not for sale".
+    """
+    key = str(product_id)
+    summary = product_summaries.get(key)
+    record_cache("product_summary", summary is not None)
+    if summary is None:
+        summary = _load_product_summary(key)
+        if summary is not None:
+            product_summaries.set(key, summary)
+    return summary
+
+
+def invalidate_product_summary(product_id: Any) -> None:
+    """Drop a product's cached summary after it changes."""
+    product_summaries.delete(str(product_id))
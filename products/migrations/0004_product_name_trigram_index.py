@@ -0,0 +1,36 @@
+"""
+Trigram index for product name search, on PostgreSQL only.
+
+name__icontains compiles to UPPER(name::text) LIKE UPPER(%s) on
+PostgreSQL; a GIN trigram index over the same expression serves it. Other
+databases have no equivalent and keep scanning, so this is a no-op there.
+"""
+from django.db import migrations
+
+CREATE = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS products_name_trgm_idx "
+    "ON products USING gin ((UPPER(name::text)) gin_trgm_ops)",
+]
+DROP = ["DROP INDEX IF EXISTS products_name_trgm_idx"]
+
+
+def run_on_postgresql(statements):
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0003_product_active_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(run_on_postgresql(CREATE), run_on_postgresql(DROP)),
+    ]
@@ -44,11 +44,26 @@ class Product(BaseModel):
         related_name="products",
     )
     stock = models.PositiveIntegerField(default=0)
+    # Units held by carts (see cart.reservations); not yet sold
+    reserved = models.PositiveIntegerField(default=0)
     is_active = models.BooleanField(default=True)
 
     class Meta:
         db_table = "products"
         ordering = ["-created_at"]
+        indexes = [
+            # Catalog listings only ever show active products
+            models.Index(
+                fields=["-created_at"],
+                condition=models.Q(is_active=True),
+                name="products_active_created_idx",
+            ),
+            models.Index(
+                fields=["category", "-created_at"],
+                condition=models.Q(is_active=True),
+                name="products_active_category_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -56,20 +71,38 @@ class Product(BaseModel):
     def save(self, *args, **kwargs) -> None:
         if not self.slug:
             self.slug = slugify(self.name)
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            # reserved only changes through conditional F() updates; never
+            # write back a value read before concurrent reservations
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "reserved"
+            ]
         super().save(*args, **kwargs)
 
     @property
     def primary_image(self) -> "ProductImage | None":
         """Get the primary image or first image if no primary is set."""
+        if "images" in getattr(self, "_prefetched_objects_cache", {}):
+            images = list(self.images.all())
+            return next((image for image in images if image.is_primary), None) or (
+                images[0] if images else None
+            )
         primary = self.images.filter(is_primary=True).first()
         if primary:
             return primary
         return self.images.first()
 
+    @property
+    def available_stock(self) -> int:
+        """Units that can still be added to a cart."""
+        return max(self.stock - self.reserved, 0)
+
     @property
     def in_stock(self) -> bool:
         """Check if product is in stock."""
-        return self.stock > 0
+        return self.available_stock > 0
 
 
 class ProductImage(BaseModel):
@@ -35,6 +35,9 @@ class CategorySerializer(serializers.ModelSerializer):
         ]
 
     def get_product_count(self, obj: Category) -> int:
+        # Annotated by list querysets to avoid a COUNT per category
+        if hasattr(obj, "product_count"):
+            return obj.product_count
         return obj.products.filter(is_active=True).count()
 
 
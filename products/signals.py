@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from typing import Any
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from products.cache import invalidate_product_summary
+from products.models import Category, Product, ProductImage
+from products.storefront import invalidate_storefront
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product_on_change(
+    sender: type, instance: Product, **kwargs: Any
+) -> None:
+    invalidate_product_summary(instance.pk)
+    invalidate_storefront()
+
+
+@receiver(post_save, sender=ProductImage)
+@receiver(post_delete, sender=ProductImage)
+def invalidate_product_on_image_change(
+    sender: type, instance: ProductImage, **kwargs: Any
+) -> None:
+    invalidate_product_summary(instance.product_id)
+    invalidate_storefront()
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_storefront_on_category_change(
+    sender: type, instance: Category, **kwargs: Any
+) -> None:
+    invalidate_storefront()
@@ -0,0 +1,116 @@
+"""
+Composite storefront payloads.
+
+Each storefront page loads from a single request: the home payload holds
+every category plus the first product page, and a category payload holds
+the category plus its first page. Both use the same plan. Categories are
+read once with their active product counts annotated. The product page is
+attached to those category objects in Python, so nested categories cost
+nothing and the page count comes from the annotation instead of a COUNT
+query. Primary images come from one prefetch. Payloads are cached whole
+in the shared cache, and any catalog write moves every key to a new
+version.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, QuerySet
+
+from monitoring.metrics import record_cache
+from products.models import Category, Product
+from products.serializers import CategorySerializer, ProductListSerializer
+
+VERSION_KEY = "storefront:version"
+
+
+def _version() -> int:
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = 1
+        cache.add(VERSION_KEY, version, None)
+    return version
+
+
+def invalidate_storefront() -> None:
+    """Retire every cached payload; called on catalog writes."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, None)
+
+
+def _cached(key: str, build: Any) -> Any:
+    key = f"storefront:{_version()}:{key}"
+    payload = cache.get(key)
+    record_cache("storefront", payload is not None)
+    if payload is None:
+        payload = build()
+        cache.set(key, payload, settings.STOREFRONT_CACHE_TIMEOUT)
+    return payload
+
+
+def _categories() -> QuerySet[Category]:
+    return Category.objects.annotate(
+        product_count=Count("products", filter=Q(products__is_active=True))
+    )
+
+
+def _first_page(
+    categories: dict[Any, Category], count: int, category_slug: str | None = None
+) -> dict[str, Any]:
+    """First product page in the shape of the paginated product list."""
+    page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+    products = Product.objects.filter(is_active=True).prefetch_related("images")
+    if category_slug is not None:
+        products = products.filter(category_id__in=categories)
+    page = list(products[:page_size])
+    for product in page:
+        product.category = categories[product.category_id]
+
+    # Relative, so the cached payload is independent of the request host
+    next_url = None
+    if count > page_size:
+        next_url = "/api/products/?page=2"
+        if category_slug is not None:
+            next_url += f"&category={category_slug}"
+    return {
+        "count": count,
+        "next": next_url,
+        "previous": None,
+        "results": ProductListSerializer(page, many=True).data,
+    }
+
+
+def _build_home() -> dict[str, Any]:
+    categories = {category.id: category for category in _categories()}
+    # Every product has a category, so the counts add up to the total
+    count = sum(category.product_count for category in categories.values())
+    return {
+        "categories": CategorySerializer(categories.values(), many=True).data,
+        "products": _first_page(categories, count),
+    }
+
+
+def _build_category(slug: str) -> dict[str, Any] | None:
+    category = _categories().filter(slug=slug).first()
+    if category is None:
+        return None
+    return {
+        "category": CategorySerializer(category).data,
+        "products": _first_page({category.id: category}, category.product_count, slug),
+    }
+
+
+def get_home_payload() -> dict[str, Any]:
+    """Categories and the first page of all active products."""
+    return _cached("home", _build_home)
+
+
+def get_category_payload(slug: str) -> dict[str, Any] | None:
+    """A category and its first product page, or None if it does not exist."""
+    payload = _cached(f"category:{slug}", lambda: _build_category(slug) or {})
+    return payload or None
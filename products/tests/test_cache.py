@@ -0,0 +1,127 @@
+"""Tests for the product summary cache."""
+
+from __future__ import annotations
+
+import time
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from products.cache import LRUCache, get_product_summary, product_summaries
+from products.models import Category, Product, ProductImage
+
+
+@pytest.fixture
+def product(db) -> Product:
+    """Create a test product with a primary image."""
+    category = Category.objects.create(name="Test Category")
+    product = Product.objects.create(
+        name="Test Hat",
+        price=Decimal("29.99"),
+        category=category,
+        stock=10,
+    )
+    ProductImage.objects.create(
+        product=product,
+        image_url="https://example.com/secondary.jpg",
+        display_order=0,
+    )
+    ProductImage.objects.create(
+        product=product,
+        image_url="https://example.com/primary.jpg",
+        display_order=1,
+        is_primary=True,
+    )
+    return product
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty cache."""
+    product_summaries.clear()
+    yield
+    product_summaries.clear()
+
+
+class TestLRUCache:
+    """Tests for the bounded TTL cache."""
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Test that the oldest untouched entry is evicted first."""
+        cache: LRUCache[int] = LRUCache(max_size=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_entries_expire(self) -> None:
+        """Test that entries are dropped after their TTL."""
+        cache: LRUCache[int] = LRUCache(max_size=2, ttl=0.01)
+        cache.set("a", 1)
+        time.sleep(0.02)
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+
+@pytest.mark.django_db
+class TestProductSummary:
+    """Tests for loading and invalidating product summaries."""
+
+    def test_summary_uses_primary_image(self, product: Product) -> None:
+        """Test that the summary resolves the primary image in one query."""
+        with CaptureQueriesContext(connection) as ctx:
+            summary = get_product_summary(str(product.id))
+
+        assert len(ctx.captured_queries) == 1
+        assert summary["name"] == "Test Hat"
+        assert summary["price"] == Decimal("29.99")
+        assert summary["image_url"] == "https://example.com/primary.jpg"
+
+    def test_unknown_and_malformed_ids(self, db) -> None:
+        """Test that missing products and bad ids return None."""
+        assert get_product_summary("00000000-0000-0000-0000-000000000000") is None
+        assert get_product_summary("not-a-uuid") is None
+
+    def test_save_invalidates_summary(self, product: Product) -> None:
+        """Test that product and image saves drop the cached summary."""
+        get_product_summary(str(product.id))
+
+        product.price = Decimal("19.99")
+        product.save()
+        assert get_product_summary(str(product.id))["price"] == Decimal("19.99")
+
+        product.images.filter(is_primary=True).delete()
+        assert (
+            get_product_summary(str(product.id))["image_url"]
+            == "https://example.com/secondary.jpg"
+        )
+
+    def test_add_to_cart_skips_catalog_when_cached(
+        self, api_client: APIClient, product: Product
+    ) -> None:
+        """Test that a warm add-to-cart does not read catalog tables."""
+        url = reverse("cart-items")
+        api_client.post(url, {"product_id": str(product.id), "quantity": 1})
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.post(
+                url, {"product_id": str(product.id), "quantity": 1}
+            )
+
+        assert response.status_code == 201
+        catalog_queries = [
+            q["sql"]
+            for q in ctx.captured_queries
+            if q["sql"].startswith("SELECT")
+            and ('"products"' in q["sql"] or '"product_images"' in q["sql"])
+        ]
+        assert catalog_queries == []
@@ -0,0 +1,139 @@
+"""Tests for the composite storefront endpoints."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from products.models import Category, Product, ProductImage
+
+
+@pytest.fixture(autouse=True)
+def clear_cache() -> None:
+    cache.clear()
+
+
+@pytest.fixture
+def catalog(db) -> list[Category]:
+    """Create two categories of three products, each with two images."""
+    categories = [Category.objects.create(name=name) for name in ("Fedoras", "Caps")]
+    for category in categories:
+        for i in range(3):
+            product = Product.objects.create(
+                name=f"{category.name} {i}",
+                price=Decimal("20.00"),
+                category=category,
+                stock=5,
+            )
+            ProductImage.objects.create(
+                product=product, image_url="https://example.com/a.jpg", display_order=0
+            )
+            ProductImage.objects.create(
+                product=product,
+                image_url="https://example.com/primary.jpg",
+                display_order=1,
+                is_primary=True,
+            )
+    Product.objects.create(
+        name="Retired", price=Decimal("5.00"), category=categories[0], is_active=False
+    )
+    return categories
+
+
+@pytest.mark.django_db
+class TestStorefrontHome:
+    """Tests for GET /api/storefront/home/."""
+
+    def test_payload(self, api_client: APIClient, catalog) -> None:
+        """Test that home returns categories and the first product page."""
+        response = api_client.get(reverse("storefront-home"))
+
+        assert response.status_code == status.HTTP_200_OK
+        counts = {c["slug"]: c["product_count"] for c in response.data["categories"]}
+        assert counts == {"fedoras": 3, "caps": 3}
+        products = response.data["products"]
+        assert products["count"] == 6
+        assert products["next"] is None
+        assert len(products["results"]) == 6
+        assert products["results"][0]["primary_image"]["image_url"].endswith(
+            "primary.jpg"
+        )
+        assert products["results"][0]["category"]["product_count"] == 3
+
+    def test_fixed_query_plan(self, api_client: APIClient, catalog) -> None:
+        """Test that building the payload costs three queries at any size."""
+        with CaptureQueriesContext(connection) as ctx:
+            api_client.get(reverse("storefront-home"))
+
+        # Categories with counts, the product page, its images
+        assert len(ctx.captured_queries) == 3
+
+    def test_served_from_cache(self, api_client: APIClient, catalog) -> None:
+        """Test that a repeat request runs no queries."""
+        api_client.get(reverse("storefront-home"))
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(reverse("storefront-home"))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(ctx.captured_queries) == 0
+        assert "max-age" in response["Cache-Control"]
+
+    def test_catalog_write_invalidates(self, api_client: APIClient, catalog) -> None:
+        """Test that saving a product retires cached payloads."""
+        api_client.get(reverse("storefront-home"))
+        Product.objects.create(
+            name="New Hat", price=Decimal("9.00"), category=catalog[1]
+        )
+
+        response = api_client.get(reverse("storefront-home"))
+
+        assert response.data["products"]["count"] == 7
+        assert response.data["products"]["results"][0]["name"] == "New Hat"
+
+
+@pytest.mark.django_db
+class TestStorefrontCategory:
+    """Tests for GET /api/storefront/categories/{slug}/."""
+
+    def test_payload(self, api_client: APIClient, catalog) -> None:
+        """Test that a category page holds the category and its products."""
+        url = reverse("storefront-category", kwargs={"slug": "caps"})
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["category"]["name"] == "Caps"
+        assert response.data["products"]["count"] == 3
+        assert {
+            p["category"]["slug"] for p in response.data["products"]["results"]
+        } == {"caps"}
+        assert len(ctx.captured_queries) == 3
+
+    def test_next_page_link(self, api_client: APIClient, catalog, settings) -> None:
+        """Test that a category with more products links to page two."""
+        settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, "PAGE_SIZE": 2}
+        url = reverse("storefront-category", kwargs={"slug": "caps"})
+
+        response = api_client.get(url)
+
+        assert len(response.data["products"]["results"]) == 2
+        assert (
+            response.data["products"]["next"] == "/api/products/?page=2&category=caps"
+        )
+
+    def test_unknown_category(self, api_client: APIClient, catalog) -> None:
+        """Test that a missing category returns 404."""
+        url = reverse("storefront-category", kwargs={"slug": "missing"})
+
+        response = api_client.get(url)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
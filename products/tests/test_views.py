@@ -116,6 +116,23 @@ class TestProductViewSet:
         assert response.data["count"] == 1
         assert response.data["results"][0]["name"] == product.name
 
+    def test_search_products_by_name(
+        self, api_client: APIClient, product: Product
+    ) -> None:
+        """Test searching products by a case-insensitive name substring."""
+        Product.objects.create(
+            name="Wool Beanie",
+            price=Decimal("14.99"),
+            category=product.category,
+            stock=5,
+        )
+
+        url = reverse("product-list")
+        response = api_client.get(url, {"search": "beAN"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [p["name"] for p in response.data["results"]] == ["Wool Beanie"]
+
     def test_retrieve_product(
         self, api_client: APIClient, product_with_images: Product
     ) -> None:
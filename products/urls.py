@@ -4,7 +4,12 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from products.admin_views import ProductImportView
-from products.views import CategoryViewSet, ProductViewSet
+from products.views import (
+    CategoryViewSet,
+    ProductViewSet,
+    StorefrontCategoryView,
+    StorefrontHomeView,
+)
 
 router = DefaultRouter()
 router.register(r"categories", CategoryViewSet, basename="category")
@@ -12,5 +17,11 @@ router.register(r"products", ProductViewSet, basename="product")
 
 urlpatterns = [
     path("", include(router.urls)),
+    path("storefront/home/", StorefrontHomeView.as_view(), name="storefront-home"),
+    path(
+        "storefront/categories/<slug:slug>/",
+        StorefrontCategoryView.as_view(),
+        name="storefront-category",
+    ),
     path("admin/products/import/", ProductImportView.as_view(), name="product-import"),
 ]
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
-from rest_framework import viewsets
+from django.conf import settings
+from django.db.models import Count, Q
+from rest_framework import status, viewsets
 from rest_framework.permissions import AllowAny
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
 from products.models import Category, Product
 from products.serializers import (
@@ -9,6 +14,7 @@ from products.serializers import (
     ProductDetailSerializer,
     ProductListSerializer,
 )
+from products.storefront import get_category_payload, get_home_payload
 
 
 class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
@@ -19,7 +25,9 @@ class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
     retrieve: GET /api/categories/{id}/
     """
 
-    queryset = Category.objects.all()
+    queryset = Category.objects.annotate(
+        product_count=Count("products", filter=Q(products__is_active=True))
+    )
     serializer_class = CategorySerializer
     permission_classes = [AllowAny]
     lookup_field = "slug"
@@ -34,6 +42,7 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
 
     Query Parameters:
         category: Filter by category slug
+        search: Case-insensitive substring of the product name
     """
 
     permission_classes = [AllowAny]
@@ -48,9 +57,56 @@ class ProductViewSet(viewsets.ReadOnlyModelViewSet):
         if category_slug:
             queryset = queryset.filter(category__slug=category_slug)
 
+        search = self.request.query_params.get("search", "").strip()
+        if search:
+            # Served by a trigram index on PostgreSQL (products migration 0004)
+            queryset = queryset.filter(name__icontains=search)
+
         return queryset
 
     def get_serializer_class(self):
         if self.action == "retrieve":
             return ProductDetailSerializer
         return ProductListSerializer
+
+
+class StorefrontView(APIView):
+    """Base view for public, cacheable storefront payloads."""
+
+    permission_classes = [AllowAny]
+    # Public catalog data: skip the per-request user lookup
+    authentication_classes: list = []
+
+    def cached_response(self, payload: dict) -> Response:
+        max_age = settings.STOREFRONT_CACHE_TIMEOUT
+        return Response(
+            payload, headers={"Cache-Control": f"public, max-age={max_age}"}
+        )
+
+
+class StorefrontHomeView(StorefrontView):
+    """
+    GET /api/storefront/home/
+
+    All categories and the first page of active products in one response.
+    """
+
+    def get(self, request: Request) -> Response:
+        return self.cached_response(get_home_payload())
+
+
+class StorefrontCategoryView(StorefrontView):
+    """
+    GET /api/storefront/categories/{slug}/
+
+    A category and the first page of its active products in one response.
+    """
+
+    def get(self, request: Request, slug: str) -> Response:
+        payload = get_category_payload(slug)
+        if payload is None:
+            return Response(
+                {"error": "Category not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return self.cached_response(payload)
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from django.contrib import admin
+
+from reports.models import DailySalesRollup
+
+
+@admin.register(DailySalesRollup)
+class DailySalesRollupAdmin(admin.ModelAdmin):
+    """Read-only admin for DailySalesRollup; rows are maintained by reports.services."""
+
+    list_display = [
+        "date",
+        "product_name",
+        "category_name",
+        "units",
+        "revenue",
+        "order_count",
+    ]
+    list_filter = ["category_name"]
+    search_fields = ["product_name"]
+    date_hierarchy = "date"
+
+    def has_add_permission(self, request) -> bool:
+        return False
+
+    def has_change_permission(self, request, obj=None) -> bool:
+        return False
@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+from django.apps import AppConfig
+
+
+class ReportsConfig(AppConfig):
+    """Reports app configuration."""
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "reports"
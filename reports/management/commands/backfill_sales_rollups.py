@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.utils import timezone
+
+from orders.models import ArchivedOrder, Order
+from reports.services import backfill
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild daily sales rollups from live and archived order items, one "
+        "day per transaction. Defaults to every day since the first order."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--start",
+            type=date.fromisoformat,
+            help="First day to rebuild (YYYY-MM-DD)",
+        )
+        parser.add_argument(
+            "--end",
+            type=date.fromisoformat,
+            help="Last day to rebuild (YYYY-MM-DD), default today",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        end = options["end"] or timezone.localdate()
+        start = options["start"]
+        if start is None:
+            firsts = [
+                model.objects.order_by("created_at")
+                .values_list("created_at", flat=True)
+                .first()
+                for model in (Order, ArchivedOrder)
+            ]
+            first = min((first for first in firsts if first is not None), default=None)
+            if first is None:
+                self.stdout.write("No orders to backfill")
+                return
+            start = timezone.localdate(first)
+        if start > end:
+            raise CommandError("--start must not be after --end")
+
+        written = backfill(start, end)
+        self.stdout.write(f"Wrote {written} rollup rows for {start} to {end}")
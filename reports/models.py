@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+from django.db import models
+
+from shared.models import BaseModel
+
+
+class DailySalesRollup(BaseModel):
+    """
+    Units and revenue for one product on one day.
+
+    Maintained incrementally from the outbox as orders are placed (see
+    reports.services), so sales reports never scan order_items. Names are
+    copied in so rows stay readable after a product or category is deleted.
+    """
+
+    date = models.DateField()
+    product = models.ForeignKey(
+        "products.Product",
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+",
+    )
+    category = models.ForeignKey(
+        "products.Category",
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="+",
+    )
+    product_name = models.CharField(max_length=200)
+    category_name = models.CharField(max_length=100)
+    units = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal("0.00"),
+    )
+    # Orders containing the product; each order falls on a single day, so
+    # summing across days stays exact
+    order_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "daily_sales_rollups"
+        ordering = ["-date", "product_name"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "product"], name="unique_rollup_per_day_product"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["category", "date"], name="rollup_category_date_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.date} {self.product_name}"
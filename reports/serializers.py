@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from django.utils import timezone
+from rest_framework import serializers
+
+
+class SalesReportQuerySerializer(serializers.Serializer):
+    """Query parameters shared by the sales report endpoints."""
+
+    DEFAULT_DAYS = 30
+    MAX_DAYS = 366
+
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    category = serializers.UUIDField(required=False)
+    limit = serializers.IntegerField(
+        required=False, min_value=1, max_value=100, default=20
+    )
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        end = attrs.get("end") or timezone.localdate()
+        start = attrs.get("start") or end - timedelta(days=self.DEFAULT_DAYS - 1)
+        if start > end:
+            raise serializers.ValidationError("start must not be after end")
+        if (end - start).days >= self.MAX_DAYS:
+            raise serializers.ValidationError(
+                f"Date range cannot exceed {self.MAX_DAYS} days"
+            )
+        attrs["start"], attrs["end"] = start, end
+        return attrs
+
+
+class DailySalesSerializer(serializers.Serializer):
+    """Sales totals for one day."""
+
+    date = serializers.DateField()
+    units = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=12, decimal_places=2)
+
+
+class ProductSalesSerializer(serializers.Serializer):
+    """Sales totals for one product across the report range."""
+
+    product_id = serializers.UUIDField(allow_null=True)
+    product_name = serializers.CharField()
+    category_name = serializers.CharField()
+    units = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=12, decimal_places=2)
+    order_count = serializers.IntegerField()
+
+
+class CategorySalesSerializer(serializers.Serializer):
+    """Sales totals for one category across the report range."""
+
+    category_id = serializers.UUIDField(allow_null=True)
+    category_name = serializers.CharField()
+    units = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=12, decimal_places=2)
@@ -0,0 +1,281 @@
+"""
+Daily sales rollups.
+
+Sales reports read pre-aggregated DailySalesRollup rows instead of grouping
+order_items on every request. Each placed order is folded into its day by
+the SALES_ROLLUP outbox handler; backfill() rebuilds whole days from
+order_items and archived_order_items for history or repair.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Any
+
+from django.db import transaction
+from django.db.models import (
+    Count,
+    DecimalField,
+    ExpressionWrapper,
+    F,
+    Max,
+    QuerySet,
+    Sum,
+)
+from django.utils import timezone
+
+from orders.models import ArchivedOrderItem, Order, OrderItem
+from reports.models import DailySalesRollup
+from shared.db import retry_on_db_lock
+
+
+def _line_total() -> ExpressionWrapper:
+    return ExpressionWrapper(
+        F("price_at_purchase") * F("quantity"),
+        output_field=DecimalField(max_digits=12, decimal_places=2),
+    )
+
+
+def _aggregate(
+    items: QuerySet[OrderItem] | QuerySet[ArchivedOrderItem],
+) -> list[dict[str, Any]]:
+    """
+    Group live or archived order items by product.
+
+    Items whose product has since been deleted have no category and are
+    left out.
+    """
+    return list(
+        items.filter(product__isnull=False)
+        .values("product_id")
+        .annotate(
+            category_id=Max("product__category_id"),
+            product_name=Max("product_name"),
+            category_name=Max("product__category__name"),
+            units=Sum("quantity"),
+            revenue=Sum(_line_total()),
+            order_count=Count("order_id", distinct=True),
+        )
+        .order_by()
+    )
+
+
+def _combine(*groups: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Sum _aggregate() rows for disjoint sets of orders by product."""
+    by_product: dict[Any, dict[str, Any]] = {}
+    for rows in groups:
+        for row in rows:
+            total = by_product.get(row["product_id"])
+            if total is None:
+                by_product[row["product_id"]] = dict(row)
+                continue
+            for field in ("units", "revenue", "order_count"):
+                total[field] += row[field]
+    return list(by_product.values())
+
+
+def _rollup(day: date, row: dict[str, Any]) -> DailySalesRollup:
+    return DailySalesRollup(
+        date=day,
+        product_id=row["product_id"],
+        category_id=row["category_id"],
+        product_name=row["product_name"],
+        category_name=row["category_name"],
+        units=row["units"],
+        revenue=row["revenue"],
+        order_count=row["order_count"],
+    )
+
+
+def _day_bounds(day: date) -> tuple[datetime, datetime]:
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def _apply(day: date, rows: list[dict[str, Any]], sign: int = 1) -> None:
+    """Add (sign=1) or subtract (sign=-1) aggregated rows on one day's rollups."""
+    by_product = {row["product_id"]: row for row in rows}
+    existing = list(
+        DailySalesRollup.objects.select_for_update().filter(
+            date=day, product_id__in=by_product
+        )
+    )
+    for rollup in existing:
+        row = by_product.pop(rollup.product_id)
+        rollup.units += sign * row["units"]
+        rollup.revenue += sign * row["revenue"]
+        rollup.order_count += sign * row["order_count"]
+
+    DailySalesRollup.objects.bulk_update(existing, ["units", "revenue", "order_count"])
+    if sign > 0:
+        # A concurrent insert for the same product and day fails the unique
+        # constraint and rolls everything back; the outbox retries the event
+        DailySalesRollup.objects.bulk_create(
+            _rollup(day, row) for row in by_product.values()
+        )
+
+
+def record_order(payload: dict[str, Any]) -> None:
+    """
+    Outbox handler for SALES_ROLLUP events: add one order to its day.
+
+    Safe to deliver more than once. The order's sales_recorded_at is
+    claimed with a conditional UPDATE in the same transaction as the
+    rollup writes, so redelivered events and orders already covered by a
+    backfill are skipped.
+    """
+    order_id = payload["order_id"]
+    with transaction.atomic():
+        claimed = (
+            Order.objects.filter(pk=order_id, sales_recorded_at__isnull=True)
+            .exclude(status=Order.Status.CANCELLED)
+            .update(sales_recorded_at=timezone.now())
+        )
+        if not claimed:
+            return
+
+        created_at = Order.objects.values_list("created_at", flat=True).get(pk=order_id)
+        _apply(
+            timezone.localdate(created_at),
+            _aggregate(OrderItem.objects.filter(order_id=order_id)),
+        )
+
+
+@retry_on_db_lock
+def reverse_orders(payload: dict[str, Any]) -> None:
+    """
+    Outbox handler for SALES_REVERSAL events: take cancelled orders back out.
+
+    Only orders that were recorded are reversed. Their sales_recorded_at is
+    cleared in the same transaction, so redelivery is a no-op. Reads
+    before writing, so it is retried when SQLite reports the database
+    locked.
+    """
+    with transaction.atomic():
+        orders = dict(
+            Order.objects.select_for_update()
+            .filter(
+                pk__in=payload["order_ids"],
+                status=Order.Status.CANCELLED,
+                sales_recorded_at__isnull=False,
+            )
+            .values_list("pk", "created_at")
+        )
+        if not orders:
+            return
+        Order.objects.filter(pk__in=orders).update(sales_recorded_at=None)
+
+        by_day: dict[date, list[Any]] = defaultdict(list)
+        for pk, created_at in orders.items():
+            by_day[timezone.localdate(created_at)].append(pk)
+        for day, pks in by_day.items():
+            _apply(day, _aggregate(OrderItem.objects.filter(order_id__in=pks)), sign=-1)
+
+
+def backfill(start: date, end: date) -> int:
+    """
+    Rebuild the rollups for each day in [start, end] from order_items and
+    archived_order_items.
+
+    Runs one short transaction per day so the database is never locked for
+    the whole range. Orders counted in a rebuilt day are marked as
+    recorded and cancelled ones as not, which makes pending SALES_ROLLUP
+    and SALES_REVERSAL events for that day no-ops. Archived orders are
+    delivered or cancelled and no longer get events, so every delivered
+    one is counted.
+
+    Returns:
+        Number of rollup rows written
+    """
+    written = 0
+    day = start
+    while day <= end:
+        day_start, day_end = _day_bounds(day)
+        stamp = timezone.now()
+        with transaction.atomic():
+            day_orders = Order.objects.filter(
+                created_at__gte=day_start, created_at__lt=day_end
+            )
+            day_orders.filter(status=Order.Status.CANCELLED).update(
+                sales_recorded_at=None
+            )
+            day_orders.exclude(status=Order.Status.CANCELLED).update(
+                sales_recorded_at=stamp
+            )
+            # Aggregate exactly the orders marked above, so an order that
+            # commits mid-rebuild is left for its outbox event
+            orders = day_orders.filter(sales_recorded_at=stamp).values("id")
+            rows = _combine(
+                _aggregate(OrderItem.objects.filter(order__in=orders)),
+                _aggregate(
+                    ArchivedOrderItem.objects.filter(
+                        order__created_at__gte=day_start,
+                        order__created_at__lt=day_end,
+                    ).exclude(order__status=Order.Status.CANCELLED)
+                ),
+            )
+
+            DailySalesRollup.objects.filter(date=day).delete()
+            written += len(
+                DailySalesRollup.objects.bulk_create(_rollup(day, row) for row in rows)
+            )
+        day += timedelta(days=1)
+    return written
+
+
+def sales_report(
+    group_by: str,
+    start: date,
+    end: date,
+    category_id: Any = None,
+    limit: int | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Aggregate rollups over [start, end] by date, product or category.
+
+    Reads only daily_sales_rollups; cost grows with products times days in
+    the range, never with order volume.
+
+    Args:
+        group_by: One of "date", "product" or "category"
+        start: First day, inclusive
+        end: Last day, inclusive
+        category_id: Restrict to one category
+        limit: Maximum number of rows; products and categories are ranked
+            by revenue
+
+    Returns:
+        One dict per group with units and revenue, plus names and
+        order_count where they apply
+    """
+    rollups = DailySalesRollup.objects.filter(date__gte=start, date__lte=end)
+    if category_id is not None:
+        rollups = rollups.filter(category_id=category_id)
+
+    totals = {"units": Sum("units"), "revenue": Sum("revenue")}
+    if group_by == "date":
+        rows = rollups.values("date").annotate(**totals).order_by("date")
+    elif group_by == "product":
+        rows = (
+            rollups.values("product_id")
+            .annotate(
+                product_name=Max("product_name"),
+                category_name=Max("category_name"),
+                order_count=Sum("order_count"),
+                **totals,
+            )
+            .order_by("-revenue", "product_name")
+        )
+    elif group_by == "category":
+        rows = (
+            rollups.values("category_id")
+            .annotate(category_name=Max("category_name"), **totals)
+            .order_by("-revenue", "category_name")
+        )
+    else:
+        raise ValueError(f"Unknown sales report grouping '{group_by}'")
+
+    if limit is not None:
+        rows = rows[:limit]
+    return list(rows)
@@ -0,0 +1,192 @@
+"""Tests for daily sales rollups and the reports API."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from cart.services import CartService
+from orders import outbox
+from orders.models import Order
+from orders.services import create_order_from_cart
+from products.cache import get_product_summary
+from products.models import Category, Product
+from reports.models import DailySalesRollup
+from reports.services import backfill, record_order
+
+SHIPPING = {
+    "name": "John Doe",
+    "address_line_1": "123 Test St",
+    "city": "New York",
+    "state": "NY",
+    "postal_code": "10001",
+}
+
+
+@pytest.fixture
+def products(db) -> tuple[Product, Product]:
+    """Create two products in different categories."""
+    hats = Category.objects.create(name="Hats")
+    caps = Category.objects.create(name="Caps")
+    return (
+        Product.objects.create(
+            name="Fedora", price=Decimal("30.00"), category=hats, stock=50
+        ),
+        Product.objects.create(
+            name="Snapback", price=Decimal("15.00"), category=caps, stock=50
+        ),
+    )
+
+
+def place_order(lines: dict[Product, int]) -> Order:
+    """Check out a fresh cart holding the given quantities."""
+    cart = CartService(SessionStore())
+    for product, quantity in lines.items():
+        cart.add(get_product_summary(str(product.id)), quantity)
+    return create_order_from_cart(cart, "test@example.com", SHIPPING)
+
+
+@pytest.mark.django_db
+class TestSalesRollups:
+    """Tests for maintaining the rollups."""
+
+    def test_outbox_worker_records_orders(self, products) -> None:
+        """Test that placed orders are folded into per-product daily rows."""
+        fedora, snapback = products
+        place_order({fedora: 2, snapback: 1})
+        place_order({fedora: 1})
+
+        assert not DailySalesRollup.objects.exists()
+        outbox.drain()
+
+        rollup = DailySalesRollup.objects.get(product=fedora)
+        assert rollup.date == timezone.localdate()
+        assert rollup.units == 3
+        assert rollup.revenue == Decimal("90.00")
+        assert rollup.order_count == 2
+        assert rollup.category_name == "Hats"
+        assert DailySalesRollup.objects.get(product=snapback).units == 1
+
+    def test_redelivered_event_is_ignored(self, products) -> None:
+        """Test that recording the same order twice counts it once."""
+        order = place_order({products[0]: 2})
+
+        record_order({"order_id": str(order.id)})
+        record_order({"order_id": str(order.id)})
+
+        assert DailySalesRollup.objects.get().units == 2
+
+    def test_backfill_matches_incremental(self, products) -> None:
+        """Test that rebuilding a day reproduces the incremental rows."""
+        fedora, snapback = products
+        place_order({fedora: 2, snapback: 1})
+        place_order({snapback: 4})
+        outbox.drain()
+        expected = set(
+            DailySalesRollup.objects.values_list(
+                "product_id", "units", "revenue", "order_count"
+            )
+        )
+
+        today = timezone.localdate()
+        written = backfill(today - timedelta(days=1), today)
+
+        assert written == 2
+        assert (
+            set(
+                DailySalesRollup.objects.values_list(
+                    "product_id", "units", "revenue", "order_count"
+                )
+            )
+            == expected
+        )
+
+    def test_backfill_supersedes_pending_events(self, products) -> None:
+        """Test that events for backfilled orders do not double count."""
+        place_order({products[0]: 3})
+
+        call_command("backfill_sales_rollups", stdout=StringIO())
+        outbox.drain()
+
+        assert DailySalesRollup.objects.get().units == 3
+        assert not Order.objects.filter(sales_recorded_at__isnull=True).exists()
+
+    def test_backfill_excludes_cancelled_orders(self, products) -> None:
+        """Test that cancelled orders are left out of rebuilt days."""
+        order = place_order({products[0]: 3})
+        Order.objects.filter(pk=order.pk).update(status=Order.Status.CANCELLED)
+
+        today = timezone.localdate()
+        backfill(today, today)
+
+        assert not DailySalesRollup.objects.exists()
+
+
+@pytest.mark.django_db
+class TestSalesReportViews:
+    """Tests for the admin sales report endpoints."""
+
+    @pytest.fixture(autouse=True)
+    def recorded_sales(self, products) -> None:
+        fedora, snapback = products
+        place_order({fedora: 1, snapback: 4})
+        place_order({fedora: 2})
+        outbox.drain()
+
+    def test_requires_admin(self, authenticated_client) -> None:
+        """Test that non-staff users cannot read reports."""
+        client, _ = authenticated_client
+
+        response = client.get(reverse("sales-products"))
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_products_ranked_by_revenue(self, staff_client: APIClient) -> None:
+        """Test that the product report ranks rows by revenue."""
+        response = staff_client.get(reverse("sales-products"))
+
+        assert response.status_code == status.HTTP_200_OK
+        results = response.data["results"]
+        assert [row["product_name"] for row in results] == ["Fedora", "Snapback"]
+        assert results[0]["units"] == 3
+        assert results[0]["revenue"] == "90.00"
+        assert results[0]["order_count"] == 2
+
+    def test_categories_and_daily_totals(self, staff_client: APIClient) -> None:
+        """Test category and per-day groupings."""
+        categories = staff_client.get(reverse("sales-categories")).data["results"]
+        daily = staff_client.get(reverse("sales-daily")).data["results"]
+
+        assert [row["category_name"] for row in categories] == ["Hats", "Caps"]
+        assert len(daily) == 1
+        assert daily[0]["units"] == 7
+        assert daily[0]["revenue"] == "150.00"
+
+    def test_reads_only_rollups(self, staff_client: APIClient) -> None:
+        """Test that reports never touch the order tables."""
+        with CaptureQueriesContext(connection) as ctx:
+            staff_client.get(reverse("sales-products"))
+
+        assert not any(
+            '"order_items"' in q["sql"] or '"orders"' in q["sql"]
+            for q in ctx.captured_queries
+        )
+
+    def test_rejects_inverted_range(self, staff_client: APIClient) -> None:
+        """Test that start after end is a validation error."""
+        response = staff_client.get(
+            reverse("sales-daily"), {"start": "2024-02-01", "end": "2024-01-01"}
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from django.urls import path
+
+from reports.views import CategorySalesView, DailySalesView, ProductSalesView
+
+urlpatterns = [
+    path("reports/sales/daily/", DailySalesView.as_view(), name="sales-daily"),
+    path("reports/sales/products/", ProductSalesView.as_view(), name="sales-products"),
+    path(
+        "reports/sales/categories/",
+        CategorySalesView.as_view(),
+        name="sales-categories",
+    ),
+]
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from rest_framework import serializers, status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from reports.serializers import (
+    CategorySalesSerializer,
+    DailySalesSerializer,
+    ProductSalesSerializer,
+    SalesReportQuerySerializer,
+)
+from reports.services import sales_report
+
+
+class SalesReportView(APIView):
+    """
+    Base view for sales reports served from the daily rollups.
+
+    Query params:
+        start: First day (YYYY-MM-DD), default 29 days before end
+        end: Last day (YYYY-MM-DD), default today
+        category: Restrict to one category id
+        limit: Maximum rows for ranked reports (1-100, default 20)
+    """
+
+    permission_classes = [IsAdminUser]
+    group_by: str
+    row_serializer_class: type[serializers.Serializer]
+    ranked = True
+
+    def get(self, request: Request) -> Response:
+        query = SalesReportQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        params = query.validated_data
+        rows = sales_report(
+            self.group_by,
+            params["start"],
+            params["end"],
+            category_id=params.get("category"),
+            limit=params["limit"] if self.ranked else None,
+        )
+        return Response(
+            {
+                "start": params["start"],
+                "end": params["end"],
+                "results": self.row_serializer_class(rows, many=True).data,
+            }
+        )
+
+
+class DailySalesView(SalesReportView):
+    """GET /api/reports/sales/daily/ - Units and revenue per day"""
+
+    group_by = "date"
+    row_serializer_class = DailySalesSerializer
+    ranked = False
+
+
+class ProductSalesView(SalesReportView):
+    """GET /api/reports/sales/products/ - Top products by revenue"""
+
+    group_by = "product"
+    row_serializer_class = ProductSalesSerializer
+
+
+class CategorySalesView(SalesReportView):
+    """GET /api/reports/sales/categories/ - Categories by revenue"""
+
+    group_by = "category"
+    row_serializer_class = CategorySalesSerializer
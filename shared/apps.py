@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from django.apps import AppConfig
+
+
+class SharedConfig(AppConfig):
+    """Shared app configuration."""
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "shared"
+
+    def ready(self) -> None:
+        from django.db.backends.signals import connection_created
+
+        from shared.db import configure_sqlite
+
+        connection_created.connect(
+            configure_sqlite, dispatch_uid="shared.configure_sqlite"
+        )
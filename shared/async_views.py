@@ -0,0 +1,120 @@
+"""
+Building blocks for async read views served under ASGI.
+
+DRF views are sync-only, so the async views are plain Django views that
+produce the same JSON as their DRF counterparts. They do their database
+work through the async ORM and serialize fully loaded instances with the
+existing DRF serializers, which then touch no database.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Callable
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.db.models import QuerySet
+from django.http import HttpRequest, HttpResponse
+from django.views import View
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import BaseSerializer
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def json_response(
+    data: Any, status: int = 200, headers: dict[str, str] | None = None
+) -> HttpResponse:
+    """Render data exactly as DRF's JSONRenderer would."""
+    return HttpResponse(
+        JSONRenderer().render(data) if data is not None else b"",
+        status=status,
+        headers=headers,
+        content_type="application/json",
+    )
+
+
+def not_found(message: str) -> HttpResponse:
+    return json_response({"detail": message}, status=404)
+
+
+async def paginate(
+    request: HttpRequest,
+    queryset: QuerySet,
+    serializer_class: type[BaseSerializer],
+    prepare: Callable[[list[Any]], Any] | None = None,
+) -> HttpResponse:
+    """
+    Async equivalent of DRF's PageNumberPagination.
+
+    Args:
+        request: Request carrying the page query parameter
+        queryset: Ordered queryset to page through
+        serializer_class: Serializer for the page's objects
+        prepare: Optional coroutine function given the page's objects
+            before serialization, e.g. to attach annotations
+
+    Returns:
+        {count, next, previous, results}, or 404 for an invalid page
+    """
+    page_size = api_settings.PAGE_SIZE
+    count = await queryset.acount()
+    num_pages = max(1, math.ceil(count / page_size))
+
+    raw = request.GET.get("page", "1")
+    try:
+        number = num_pages if raw == "last" else int(raw)
+    except ValueError:
+        number = 0
+    if not 1 <= number <= num_pages:
+        return not_found("Invalid page.")
+
+    offset = (number - 1) * page_size
+    objects = [obj async for obj in queryset[offset : offset + page_size]]
+    if prepare is not None:
+        await prepare(objects)
+
+    url = request.build_absolute_uri()
+    if number == 1:
+        previous = None
+    elif number == 2:
+        previous = remove_query_param(url, "page")
+    else:
+        previous = replace_query_param(url, "page", number - 1)
+    return json_response(
+        {
+            "count": count,
+            "next": (
+                replace_query_param(url, "page", number + 1)
+                if number < num_pages
+                else None
+            ),
+            "previous": previous,
+            "results": serializer_class(objects, many=True).data,
+        }
+    )
+
+
+class AsyncReadView(View):
+    """
+    Async GET handler in front of an existing sync view.
+
+    GET and HEAD run the async handler; every other method is passed to
+    sync_view in a worker thread, so writes keep their DRF behaviour.
+    """
+
+    sync_view: Callable[..., HttpResponse] | None = None
+
+    @classmethod
+    def as_view(cls, **initkwargs: Any) -> Callable[..., Any]:
+        view = super().as_view(**initkwargs)
+        # The sync view enforces its own CSRF policy, as DRF views do.
+        # Set directly: csrf_exempt() on Django 4.2 hides that the view is async.
+        view.csrf_exempt = True
+        return view
+
+    def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Any:
+        if request.method in ("GET", "HEAD") or self.sync_view is None:
+            return super().dispatch(request, *args, **kwargs)
+        return sync_to_async(self.sync_view)(request, *args, **kwargs)
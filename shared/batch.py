@@ -0,0 +1,221 @@
+"""
+In-process request batching.
+
+POST /api/batch/ runs a list of API sub-requests through the URL resolver
+without extra HTTP round trips. Sub-requests reuse the batch request's
+authenticated user, so a JWT is verified once per batch rather than per
+sub-request. They also share its already-loaded session, so cart
+operations in a batch see each other's changes. Sub-requests skip the
+middleware stack, which already ran for the batch itself.
+
+Views that read or write the session set ``uses_session = True``. Even a
+GET of one of them changes the session (the cart view stores an empty
+cart and reprices items), and SessionStore is not thread-safe, so a
+batch containing one always runs sequentially.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import io
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty, SimpleQueue
+from typing import Any, TypedDict
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connections
+from django.http import HttpRequest, HttpResponseBase
+from django.urls import Resolver404, resolve, reverse
+from rest_framework.request import Request
+
+from monitoring.instrumentation import RequestStats, current
+
+logger = logging.getLogger(__name__)
+
+# Only these may run concurrently; anything else runs in order
+READ_METHODS = frozenset({"GET"})
+
+# Request metadata carried over from the batch request, besides HTTP_*
+_INHERITED_META = ("REMOTE_ADDR", "SERVER_NAME", "SERVER_PORT", "SERVER_PROTOCOL")
+
+
+class SubRequest(TypedDict, total=False):
+    """One request within a batch."""
+
+    id: str
+    method: str
+    path: str
+    body: Any
+
+
+class SubResponse(TypedDict):
+    """Outcome of one sub-request."""
+
+    id: str | None
+    status: int
+    body: Any
+    duration_ms: float
+
+
+def _build_request(outer: HttpRequest, sub: SubRequest) -> WSGIRequest:
+    path, _, query = sub["path"].partition("?")
+    data = b"" if sub.get("body") is None else json.dumps(sub["body"]).encode()
+
+    environ: dict[str, Any] = {
+        key: value
+        for key, value in outer.META.items()
+        if (key.startswith("HTTP_") and key != "HTTP_CONTENT_LENGTH")
+        or key in _INHERITED_META
+    }
+    environ.update(
+        {
+            "REQUEST_METHOD": sub.get("method", "GET"),
+            "PATH_INFO": path,
+            "SCRIPT_NAME": "",
+            "QUERY_STRING": query,
+            "CONTENT_TYPE": "application/json",
+            "CONTENT_LENGTH": str(len(data)),
+            "wsgi.input": io.BytesIO(data),
+            "wsgi.url_scheme": outer.scheme,
+        }
+    )
+    request = WSGIRequest(environ)
+    request.session = outer.session
+    return request
+
+
+def _body(response: HttpResponseBase) -> Any:
+    content = response.content
+    if not content:
+        return None
+    if response.get("Content-Type", "").startswith("application/json"):
+        return json.loads(content)
+    return content.decode(response.charset)
+
+
+def dispatch(outer: Request, sub: SubRequest) -> SubResponse:
+    """Run one sub-request through the resolver and capture its response."""
+    started = time.perf_counter()
+
+    def result(status: int, body: Any) -> SubResponse:
+        return SubResponse(
+            id=sub.get("id"),
+            status=status,
+            body=body,
+            duration_ms=round((time.perf_counter() - started) * 1000, 2),
+        )
+
+    path = sub["path"].partition("?")[0]
+    if not path.startswith("/api/") or path == reverse("batch"):
+        return result(400, {"error": "Only API endpoints can be batched"})
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return result(404, {"error": "Not found"})
+
+    request = _build_request(outer._request, sub)
+    if outer.user.is_authenticated:
+        # Honoured by DRF in place of its authenticators. Anonymous
+        # batches run them as usual, keeping 401 challenges intact.
+        request._force_auth_user = outer.user
+        request._force_auth_token = outer.auth
+
+    try:
+        response = match.func(request, *match.args, **match.kwargs)
+        if response.streaming:
+            return result(400, {"error": "Streaming endpoints cannot be batched"})
+        if hasattr(response, "render"):
+            response.render()
+        return result(response.status_code, _body(response))
+    except Exception:
+        logger.exception("Batched %s %s failed", sub.get("method", "GET"), path)
+        return result(500, {"error": "Internal server error"})
+
+
+def _parallel_safe(sub: SubRequest) -> bool:
+    """Whether sub may run alongside others: a GET leaving the session alone."""
+    if sub.get("method", "GET") not in READ_METHODS:
+        return False
+    try:
+        match = resolve(sub["path"].partition("?")[0])
+    except Resolver404:
+        return True
+    view_class = getattr(match.func, "view_class", None)
+    return not getattr(view_class, "uses_session", False)
+
+
+def _dispatch_counted(
+    outer: Request, sub: SubRequest
+) -> tuple[SubResponse, RequestStats | None]:
+    # The batch request's stats are not thread-safe; count into a fresh
+    # one, added to them on the batch request's thread
+    if current.get() is None:
+        return dispatch(outer, sub), None
+    stats = RequestStats()
+    token = current.set(stats)
+    try:
+        return dispatch(outer, sub), stats
+    finally:
+        current.reset(token)
+
+
+def _worker(
+    outer: Request, queue: SimpleQueue
+) -> list[tuple[int, SubResponse, RequestStats | None]]:
+    """Run queued sub-requests until none are left, on one connection."""
+    results = []
+    try:
+        while True:
+            try:
+                index, sub = queue.get_nowait()
+            except Empty:
+                return results
+            results.append((index, *_dispatch_counted(outer, sub)))
+    finally:
+        # Connections are per thread; don't leak one per pool worker
+        connections.close_all()
+
+
+def run_batch(
+    outer: Request, subs: list[SubRequest], parallel: bool = False
+) -> list[SubResponse]:
+    """
+    Run sub-requests and return their responses in request order.
+
+    With parallel set and every sub-request a GET of a view that leaves
+    the session alone, they run concurrently on up to BATCH_MAX_WORKERS
+    threads. Each thread opens one database
+    connection for the batch and closes it when done, so a parallel batch
+    holds up to BATCH_MAX_WORKERS connections besides its own. Batches
+    containing writes always run sequentially, in order, so later
+    sub-requests see earlier changes.
+    """
+    # Load the session once, before any thread can race to do it
+    outer.session.items()
+
+    if not parallel or len(subs) < 2 or not all(_parallel_safe(sub) for sub in subs):
+        return [dispatch(outer, sub) for sub in subs]
+
+    queue: SimpleQueue = SimpleQueue()
+    for index, sub in enumerate(subs):
+        queue.put((index, sub))
+    workers = min(settings.BATCH_MAX_WORKERS, len(subs))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # Carry request-scoped state, such as replica pinning, into the workers
+        futures = [
+            pool.submit(contextvars.copy_context().run, _worker, outer, queue)
+            for _ in range(workers)
+        ]
+        results = [result for future in futures for result in future.result()]
+
+    responses: list[SubResponse] = [None] * len(subs)  # type: ignore[list-item]
+    stats = current.get()
+    for index, response, sub_stats in results:
+        responses[index] = response
+        if stats is not None and sub_stats is not None:
+            stats.add(sub_stats)
+    return responses
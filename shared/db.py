@@ -0,0 +1,112 @@
+"""
+SQLite connection tuning and lock-contention retries.
+
+Every new SQLite connection gets the SQLITE_PRAGMAS from settings (WAL,
+relaxed fsync, busy timeout, page cache and mmap sizing). WAL lets readers
+run alongside a writer, but SQLite still allows one writer at a time, and
+a transaction that reads before it writes can fail with "database is
+locked" without waiting on the busy timeout. retry_on_db_lock reruns such
+write paths with jittered backoff.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import random
+import time
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def configure_sqlite(
+    sender: Any, connection: BaseDatabaseWrapper, **kwargs: Any
+) -> None:
+    """connection_created receiver applying SQLITE_PRAGMAS."""
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def streams_with_server_side_cursors(using: str = DEFAULT_DB_ALIAS) -> bool:
+    """
+    Whether QuerySet.iterator() on this database streams from a named cursor.
+
+    True on PostgreSQL unless DISABLE_SERVER_SIDE_CURSORS is set (needed
+    behind transaction-pooling PgBouncer). Elsewhere iterator() still runs
+    one query whose results the driver buffers, so long scans should page
+    with keyset queries instead.
+    """
+    connection = connections[using]
+    return connection.vendor == "postgresql" and not connection.settings_dict.get(
+        "DISABLE_SERVER_SIDE_CURSORS"
+    )
+
+
+def is_lock_error(exc: BaseException) -> bool:
+    """Whether exc is SQLite refusing a write because another holds the lock."""
+    return isinstance(exc, OperationalError) and "database is locked" in str(exc)
+
+
+def lock_retry_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter, capped at DB_LOCK_RETRY_MAX_SECONDS."""
+    ceiling = min(
+        settings.DB_LOCK_RETRY_BASE_SECONDS * 2 ** (attempt - 1),
+        settings.DB_LOCK_RETRY_MAX_SECONDS,
+    )
+    return random.uniform(0, ceiling)
+
+
+def retry_on_db_lock(func: F | None = None, *, using: str = DEFAULT_DB_ALIAS) -> Any:
+    """
+    Retry the decorated function when SQLite reports "database is locked".
+
+    The function must do all of its writes in its own transaction, so a
+    failed attempt leaves nothing behind. Calls made inside an outer
+    atomic block are not retried: the outer transaction is already broken,
+    and only its owner can start over.
+
+    Usable bare (@retry_on_db_lock) or with a database alias
+    (@retry_on_db_lock(using="...")). Up to DB_LOCK_RETRY_ATTEMPTS
+    attempts are made in total.
+    """
+
+    def decorator(f: F) -> F:
+        @functools.wraps(f)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            attempt = 1
+            while True:
+                try:
+                    return f(*args, **kwargs)
+                except OperationalError as e:
+                    if (
+                        not is_lock_error(e)
+                        or attempt >= settings.DB_LOCK_RETRY_ATTEMPTS
+                        or connections[using].in_atomic_block
+                    ):
+                        raise
+                    delay = lock_retry_delay(attempt)
+                    logger.info(
+                        "%s hit a database lock (attempt %d), retrying in %.3fs",
+                        f.__qualname__,
+                        attempt,
+                        delay,
+                    )
+                    time.sleep(delay)
+                    attempt += 1
+
+        return wrapper  # type: ignore[return-value]
+
+    if func is not None:
+        return decorator(func)
+    return decorator
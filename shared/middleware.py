@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponse
+
+from shared.routers import pinned, wrote
+
+
+class ReplicaPinningMiddleware:
+    """
+    Keep a client on the primary database briefly after it writes.
+
+    A request carrying the pin cookie reads only from the primary. A
+    request that writes a replicated model (see shared.routers) sets the
+    cookie for REPLICA_PIN_SECONDS, long enough for replicas to catch up.
+    Not loaded when no replicas are configured. Runs natively under WSGI
+    and ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        pinned_token = pinned.set(settings.REPLICA_PIN_COOKIE in request.COOKIES)
+        wrote_token = wrote.set(False)
+        try:
+            return self._pin(self.get_response(request))
+        finally:
+            pinned.reset(pinned_token)
+            wrote.reset(wrote_token)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        pinned_token = pinned.set(settings.REPLICA_PIN_COOKIE in request.COOKIES)
+        wrote_token = wrote.set(False)
+        try:
+            return self._pin(await self.get_response(request))
+        finally:
+            pinned.reset(pinned_token)
+            wrote.reset(wrote_token)
+
+    @staticmethod
+    def _pin(response: HttpResponse) -> HttpResponse:
+        if wrote.get():
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
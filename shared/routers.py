@@ -0,0 +1,67 @@
+"""
+Read-replica database routing.
+
+Reads of the catalog, order history and sales reports go to a random
+alias in DATABASE_REPLICAS; everything else, all writes and every query
+inside a transaction on the primary use "default".
+
+Replicas lag the primary, so a request that writes one of those models
+pins the rest of its reads to the primary. ReplicaPinningMiddleware then
+sets a short-lived cookie so the client's next requests are pinned too,
+e.g. the order page fetched right after checkout. Outside a request, a
+write pins the rest of the thread's reads.
+"""
+
+from __future__ import annotations
+
+import random
+from contextvars import ContextVar
+from typing import Any
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Model
+
+# Read the primary for the rest of the current request
+pinned: ContextVar[bool] = ContextVar("replica_pinned", default=False)
+# The current request wrote a replicated model
+wrote: ContextVar[bool] = ContextVar("replica_wrote", default=False)
+
+
+def _replicated(model: type[Model]) -> bool:
+    return model._meta.label_lower in settings.REPLICA_READ_MODELS
+
+
+class ReplicaRouter:
+    """Route replica-safe reads to DATABASE_REPLICAS."""
+
+    def db_for_read(self, model: type[Model], **hints: Any) -> str | None:
+        replicas = settings.DATABASE_REPLICAS
+        instance = hints.get("instance")
+        if replicas and instance is not None and instance._state.db:
+            # Related objects come from the database their instance was
+            # read from, as without a router, so an explicit
+            # .using("default") also covers its prefetches
+            return instance._state.db
+        if (
+            not replicas
+            or not _replicated(model)
+            or pinned.get()
+            # Reads in a transaction must see its own writes and locks
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model: type[Model], **hints: Any) -> str:
+        if _replicated(model):
+            pinned.set(True)
+            wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: Any) -> bool:
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db: str, app_label: str, **hints: Any) -> bool:
+        return db == DEFAULT_DB_ALIAS
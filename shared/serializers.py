@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from django.conf import settings
+from rest_framework import serializers
+
+
+class SubRequestSerializer(serializers.Serializer):
+    """Serializer for one request within a batch."""
+
+    id = serializers.CharField(max_length=100, required=False)
+    method = serializers.ChoiceField(
+        choices=["GET", "POST", "PUT", "PATCH", "DELETE"], default="GET"
+    )
+    path = serializers.CharField(max_length=2000)
+    body = serializers.JSONField(required=False)
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    """Serializer for a batch of API requests."""
+
+    requests = serializers.ListField(
+        child=SubRequestSerializer(),
+        min_length=1,
+        max_length=settings.BATCH_MAX_REQUESTS,
+    )
+    parallel = serializers.BooleanField(default=False)
@@ -0,0 +1,20 @@
+"""
+Database session engine whose saves retry SQLite lock errors.
+
+Selected with SESSION_ENGINE = "shared.sessions". Every cart change saves
+the session, so session writes are the most frequent writes in the shop.
+"""
+
+from __future__ import annotations
+
+from django.contrib.sessions.backends.db import SessionStore as DBSessionStore
+
+from shared.db import retry_on_db_lock
+
+
+class SessionStore(DBSessionStore):
+    """django.contrib.sessions.backends.db.SessionStore with lock retries."""
+
+    @retry_on_db_lock
+    def save(self, must_create: bool = False) -> None:
+        super().save(must_create=must_create)
@@ -5,7 +5,11 @@ App-specific helpers belong in their respective app's tests/ directory.
 """
 from __future__ import annotations
 
+from collections.abc import Iterator
+from contextlib import contextmanager
+
 import pytest
+from django.db import OperationalError, connection
 from rest_framework.test import APIClient
 
 
@@ -13,3 +17,25 @@ from rest_framework.test import APIClient
 def api_client() -> APIClient:
     """Return an unauthenticated API client."""
     return APIClient()
+
+
+@contextmanager
+def database_locked(
+    failures: int | None = 1,
+    statements: tuple[str, ...] = ("INSERT", "UPDATE", "DELETE"),
+) -> Iterator[list[str]]:
+    """
+    Fail the first failures writes on this thread's connection (every one
+    when None) with "database is locked", as SQLite does when another
+    connection holds the write lock. Yields the SQL of the failed writes.
+    """
+    failed: list[str] = []
+
+    def wrapper(execute, sql, params, many, context):
+        if sql.startswith(statements) and (failures is None or len(failed) < failures):
+            failed.append(sql)
+            raise OperationalError("database is locked")
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(wrapper):
+        yield failed
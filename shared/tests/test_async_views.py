@@ -0,0 +1,176 @@
+"""Tests for the async views served by the ASGI deployment."""
+
+from __future__ import annotations
+
+import logging
+from decimal import Decimal
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.handlers.asgi import ASGIHandler
+from django.test import AsyncClient, override_settings
+from django.urls import resolve
+from rest_framework.test import APIClient
+
+from products.models import Category, Product, ProductImage
+
+SHIPPING = {
+    "email": "test@example.com",
+    "name": "John Doe",
+    "address_line_1": "123 Test St",
+    "city": "New York",
+    "state": "NY",
+    "postal_code": "10001",
+}
+
+
+@pytest.fixture
+def catalog(db) -> list[Product]:
+    """Create 25 products over two categories, enough for two pages."""
+    hats = Category.objects.create(name="Hats")
+    caps = Category.objects.create(name="Caps")
+    products = [
+        Product.objects.create(
+            name=f"Hat {i}",
+            price=Decimal("19.99"),
+            category=hats if i % 2 else caps,
+            stock=5,
+        )
+        for i in range(25)
+    ]
+    ProductImage.objects.create(
+        product=products[0], image_url="https://example.com/0.jpg", is_primary=True
+    )
+    return products
+
+
+def get_both(client: APIClient, path: str, **extra):
+    """GET path through the sync URLconf and then the async one."""
+    sync = client.get(path, **extra)
+    with override_settings(ROOT_URLCONF="config.urls_async"):
+        assert resolve(path.partition("?")[0]).func.view_class.view_is_async
+        response = client.get(path, **extra)
+    return sync, response
+
+
+@pytest.mark.django_db
+class TestAsyncViews:
+    """The async views return exactly what the DRF views do."""
+
+    @pytest.mark.parametrize(
+        "path",
+        [
+            "/api/categories/",
+            "/api/products/",
+            "/api/products/?page=2",
+            "/api/products/?page=last",
+            "/api/products/?page=9",
+            "/api/products/?search=hat%201",
+            "/api/products/hat-0/",
+            "/api/products/missing/",
+        ],
+    )
+    def test_catalog(
+        self, api_client: APIClient, catalog: list[Product], path: str
+    ) -> None:
+        sync, response = get_both(api_client, path)
+
+        assert response.status_code == sync.status_code
+        assert response.json() == sync.json()
+
+    def test_cart(self, api_client: APIClient, catalog: list[Product]) -> None:
+        api_client.post(
+            "/api/cart/items/", {"product_id": str(catalog[0].id), "quantity": 2}
+        )
+
+        sync, response = get_both(api_client, "/api/cart/?validate=true")
+
+        assert response.json() == sync.json()
+        assert response.json()["total_items"] == 2
+
+    def test_cart_delete_uses_sync_view(
+        self, api_client: APIClient, catalog: list[Product]
+    ) -> None:
+        api_client.post(
+            "/api/cart/items/", {"product_id": str(catalog[0].id), "quantity": 1}
+        )
+
+        with override_settings(ROOT_URLCONF="config.urls_async"):
+            response = api_client.delete("/api/cart/")
+
+        assert response.status_code == 200
+        assert api_client.get("/api/cart/").json()["total_items"] == 0
+
+    def test_order_detail(self, api_client: APIClient, catalog: list[Product]) -> None:
+        api_client.post(
+            "/api/cart/items/", {"product_id": str(catalog[0].id), "quantity": 1}
+        )
+        order_id = api_client.post("/api/orders/checkout/", SHIPPING).json()["id"]
+
+        sync, response = get_both(api_client, f"/api/orders/{order_id}/")
+
+        assert response.json() == sync.json()
+        assert response["ETag"] == sync["ETag"]
+        _, not_modified = get_both(
+            api_client, f"/api/orders/{order_id}/", HTTP_IF_NONE_MATCH=sync["ETag"]
+        )
+        assert not_modified.status_code == 304
+
+
+@pytest.mark.django_db(transaction=True)
+def test_asgi_handler(catalog: list[Product]) -> None:
+    """Requests through the ASGI handler reach the async views."""
+
+    async def fetch():
+        return await AsyncClient().get("/api/products/hat-0/")
+
+    with override_settings(ROOT_URLCONF="config.urls_async"):
+        response = async_to_sync(fetch)()
+
+    assert response.status_code == 200
+    assert len(response.json()["images"]) == 1
+
+
+@pytest.fixture
+def asgi_stack(settings):
+    """The ASGI middleware stack with every optional middleware loaded."""
+    settings.MIDDLEWARE = [
+        m for m in settings.MIDDLEWARE if not m.startswith("whitenoise.")
+    ]
+    settings.REQUEST_INSTRUMENTATION = True
+    settings.REQUEST_INSTRUMENTATION_HEADERS = True
+    settings.SLOW_QUERY_LOG = True
+    settings.SLOW_QUERY_THRESHOLD_MS = 60_000
+    settings.PROFILING_ENABLED = True
+    settings.DATABASE_REPLICAS = ["replica_1"]
+    settings.ROOT_URLCONF = "config.urls_async"
+    return settings
+
+
+def test_asgi_middleware_stays_async(
+    asgi_stack, caplog: pytest.LogCaptureFixture
+) -> None:
+    """No middleware makes Django hop between the event loop and threads."""
+    with caplog.at_level(logging.DEBUG, logger="django.request"):
+        ASGIHandler().load_middleware(is_async=True)
+
+    assert [r.getMessage() for r in caplog.records if "adapted" in r.getMessage()] == []
+
+
+@pytest.mark.django_db(transaction=True)
+def test_asgi_instrumentation(asgi_stack, catalog: list[Product]) -> None:
+    """Queries run by async views are counted by the async middleware."""
+    from monitoring import instrumentation
+
+    instrumentation.install()
+    # Catalog reads would go to the (unconfigured) replica
+    asgi_stack.DATABASE_REPLICAS = []
+
+    async def fetch():
+        return await AsyncClient().get("/api/products/hat-0/")
+
+    response = async_to_sync(fetch)()
+
+    assert response.status_code == 200
+    assert int(response["X-Query-Count"]) > 0
+    assert "db;dur=" in response["Server-Timing"]
@@ -0,0 +1,211 @@
+"""Tests for the batch API endpoint."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from monitoring import instrumentation
+from products.models import Category, Product
+
+
+@pytest.fixture
+def product(db) -> Product:
+    """Create a test product."""
+    category = Category.objects.create(name="Test Category")
+    return Product.objects.create(
+        name="Test Hat",
+        price=Decimal("29.99"),
+        category=category,
+        stock=10,
+    )
+
+
+def batch(client: APIClient, requests: list[dict], **extra) -> dict:
+    response = client.post(
+        reverse("batch"), {"requests": requests, **extra}, format="json"
+    )
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
+
+@pytest.mark.django_db
+class TestBatchView:
+    """Tests for POST /api/batch/."""
+
+    def test_responses_in_request_order(
+        self, api_client: APIClient, product: Product
+    ) -> None:
+        """Each sub-request gets its own status and body, keyed by id."""
+        data = batch(
+            api_client,
+            [
+                {"id": "product", "path": f"/api/products/{product.slug}/"},
+                {"id": "missing", "path": "/api/products/not-a-product/"},
+                {"id": "list", "path": "/api/products/?page=1"},
+            ],
+        )
+
+        assert [r["id"] for r in data["responses"]] == ["product", "missing", "list"]
+        assert data["responses"][0]["status"] == 200
+        assert data["responses"][0]["body"]["name"] == "Test Hat"
+        assert data["responses"][1]["status"] == 404
+        assert data["responses"][2]["body"]["count"] == 1
+
+    def test_writes_share_the_session(
+        self, api_client: APIClient, product: Product
+    ) -> None:
+        """A cart change is visible to later sub-requests and after the batch."""
+        data = batch(
+            api_client,
+            [
+                {
+                    "method": "POST",
+                    "path": "/api/cart/items/",
+                    "body": {"product_id": str(product.id), "quantity": 2},
+                },
+                {"path": "/api/cart/"},
+            ],
+        )
+
+        assert data["responses"][0]["status"] == 201
+        assert data["responses"][1]["body"]["total_items"] == 2
+        assert api_client.get(reverse("cart")).data["total_items"] == 2
+
+    def test_authenticates_once(
+        self, authenticated_client: tuple[APIClient, User]
+    ) -> None:
+        """The batch's JWT user is reused by every sub-request."""
+        client, user = authenticated_client
+
+        with CaptureQueriesContext(connection) as ctx:
+            data = batch(client, [{"path": "/api/accounts/me/"}] * 3)
+
+        assert {r["body"]["email"] for r in data["responses"]} == {user.email}
+        user_lookups = [q for q in ctx.captured_queries if 'FROM "users"' in q["sql"]]
+        assert len(user_lookups) == 1
+
+    def test_sub_request_permissions_apply(self, api_client: APIClient) -> None:
+        """Anonymous batches cannot reach authenticated endpoints."""
+        data = batch(api_client, [{"path": "/api/accounts/me/"}])
+
+        assert data["responses"][0]["status"] == 401
+
+    @pytest.mark.parametrize(
+        ("path", "expected"),
+        [
+            ("/api/nope/", 404),
+            ("/admin/", 400),
+            ("/api/batch/", 400),
+        ],
+    )
+    def test_rejected_paths(
+        self, api_client: APIClient, path: str, expected: int
+    ) -> None:
+        """Unknown, non-API and recursive batch paths are refused per sub-request."""
+        data = batch(api_client, [{"path": path}])
+
+        assert data["responses"][0]["status"] == expected
+
+    def test_empty_batch_rejected(self, api_client: APIClient) -> None:
+        """A batch needs at least one request."""
+        response = api_client.post(reverse("batch"), {"requests": []}, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_too_many_requests_rejected(self, api_client: APIClient, settings) -> None:
+        """Batches over BATCH_MAX_REQUESTS are rejected outright."""
+        response = api_client.post(
+            reverse("batch"),
+            {"requests": [{"path": "/api/cart/"}] * (settings.BATCH_MAX_REQUESTS + 1)},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db(transaction=True)
+def test_parallel_reads(api_client: APIClient, product: Product) -> None:
+    """Read-only batches can run concurrently and keep request order."""
+    data = batch(
+        api_client,
+        [{"id": str(i), "path": f"/api/products/{product.slug}/"} for i in range(6)],
+        parallel=True,
+    )
+
+    assert [r["id"] for r in data["responses"]] == [str(i) for i in range(6)]
+    assert {r["status"] for r in data["responses"]} == {200}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_parallel_reads_share_worker_connections(
+    api_client: APIClient, product: Product, settings, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Each worker thread keeps its connection for the batch, then closes it."""
+    settings.BATCH_MAX_WORKERS = 2
+    closed: list[int] = []
+    monkeypatch.setattr("shared.batch.connections.close_all", lambda: closed.append(1))
+
+    data = batch(
+        api_client,
+        [{"id": str(i), "path": f"/api/products/{product.slug}/"} for i in range(6)],
+        parallel=True,
+    )
+
+    assert {r["status"] for r in data["responses"]} == {200}
+    assert len(closed) == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_parallel_queries_counted_for_batch(
+    api_client: APIClient, product: Product, settings
+) -> None:
+    """Queries run by worker threads are added to the batch request's count."""
+    instrumentation.install()
+    settings.REQUEST_INSTRUMENTATION = True
+    settings.REQUEST_INSTRUMENTATION_HEADERS = True
+    requests = [{"path": f"/api/products/{product.slug}/"} for _ in range(6)]
+
+    def query_count(parallel: bool) -> int:
+        response = api_client.post(
+            reverse("batch"),
+            {"requests": requests, "parallel": parallel},
+            format="json",
+        )
+        return int(response["X-Query-Count"])
+
+    assert query_count(parallel=True) == query_count(parallel=False)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_parallel_batch_with_session_view_runs_in_order(
+    api_client: APIClient, product: Product, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Batches touching the session never share it across threads."""
+
+    def no_threads(*args, **kwargs):
+        raise AssertionError("session-touching batch ran in a thread pool")
+
+    monkeypatch.setattr("shared.batch.ThreadPoolExecutor", no_threads)
+    api_client.post(
+        reverse("cart-items"), {"product_id": str(product.id), "quantity": 1}
+    )
+
+    data = batch(
+        api_client,
+        [
+            {"id": "cart", "path": "/api/cart/?validate=true"},
+            {"id": "product", "path": f"/api/products/{product.slug}/"},
+        ],
+        parallel=True,
+    )
+
+    assert [r["status"] for r in data["responses"]] == [200, 200]
+    assert data["responses"][0]["body"]["total_items"] == 1
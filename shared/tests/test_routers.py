@@ -0,0 +1,121 @@
+"""Tests for read-replica routing and primary pinning."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import pytest
+from django.contrib.sessions.models import Session
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from orders.models import IdempotencyKey, Order
+from products.models import Product
+from shared.middleware import ReplicaPinningMiddleware
+from shared.routers import ReplicaRouter, pinned, wrote
+
+router = ReplicaRouter()
+
+
+@pytest.fixture
+def replicas(settings) -> Iterator[list[str]]:
+    """Configure two replica aliases; routing never opens them."""
+    settings.DATABASE_REPLICAS = ["replica_1", "replica_2"]
+    # Writes by earlier tests pinned this thread to the primary
+    pinned_token, wrote_token = pinned.set(False), wrote.set(False)
+    yield settings.DATABASE_REPLICAS
+    pinned.reset(pinned_token)
+    wrote.reset(wrote_token)
+
+
+class TestReplicaRouter:
+    """Tests for ReplicaRouter."""
+
+    def test_catalog_reads_use_replicas(self, replicas: list[str]) -> None:
+        """Replicated models read from one of the replicas."""
+        assert router.db_for_read(Product) in replicas
+        assert router.db_for_read(Order) in replicas
+
+    def test_other_models_read_primary(self, replicas: list[str]) -> None:
+        """Sessions and checkout bookkeeping always read the primary."""
+        assert router.db_for_read(Session) == "default"
+        assert router.db_for_read(IdempotencyKey) == "default"
+
+    def test_related_reads_follow_instance(self, replicas: list[str]) -> None:
+        """Objects related to an instance read from its database."""
+        order = Order()
+        order._state.db = "default"
+
+        assert router.db_for_read(Order, instance=order) == "default"
+
+    def test_no_replicas_configured(self, settings) -> None:
+        """Without replicas everything stays on the primary."""
+        settings.DATABASE_REPLICAS = []
+
+        assert router.db_for_read(Product) == "default"
+
+    @pytest.mark.django_db
+    def test_reads_in_transaction_use_primary(self, replicas: list[str]) -> None:
+        """Reads inside a transaction must see its writes and locks."""
+        with transaction.atomic():
+            assert router.db_for_read(Product) == "default"
+
+    def test_migrations_only_on_primary(self) -> None:
+        """Replicas receive schema changes by replication, not migrate."""
+        assert router.allow_migrate("default", "products")
+        assert not router.allow_migrate("replica_1", "products")
+
+
+class TestReplicaPinningMiddleware:
+    """Tests for ReplicaPinningMiddleware."""
+
+    def middleware(self, view) -> ReplicaPinningMiddleware:
+        return ReplicaPinningMiddleware(view)
+
+    def test_write_pins_request_and_sets_cookie(
+        self, replicas: list[str], settings
+    ) -> None:
+        """After a write, later reads in the request and the client's next requests use the primary."""
+        reads = []
+
+        def view(request) -> HttpResponse:
+            router.db_for_write(Order)
+            reads.append(router.db_for_read(Order))
+            return HttpResponse()
+
+        response = self.middleware(view)(RequestFactory().post("/api/orders/checkout/"))
+
+        assert reads == ["default"]
+        cookie = response.cookies[settings.REPLICA_PIN_COOKIE]
+        assert cookie["max-age"] == settings.REPLICA_PIN_SECONDS
+        # Pinning ends with the request
+        assert router.db_for_read(Order) in replicas
+
+    def test_pin_cookie_reads_primary(self, replicas: list[str], settings) -> None:
+        """A client holding the cookie reads from the primary."""
+        reads = []
+
+        def view(request) -> HttpResponse:
+            reads.append(router.db_for_read(Order))
+            return HttpResponse()
+
+        request = RequestFactory().get("/api/orders/")
+        request.COOKIES[settings.REPLICA_PIN_COOKIE] = "1"
+        response = self.middleware(view)(request)
+
+        assert reads == ["default"]
+        assert settings.REPLICA_PIN_COOKIE not in response.cookies
+
+    def test_unreplicated_writes_do_not_pin(
+        self, replicas: list[str], settings
+    ) -> None:
+        """Session saves alone leave the client on the replicas."""
+
+        def view(request) -> HttpResponse:
+            router.db_for_write(Session)
+            return HttpResponse()
+
+        response = self.middleware(view)(RequestFactory().post("/api/cart/items/"))
+
+        assert settings.REPLICA_PIN_COOKIE not in response.cookies
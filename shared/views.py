@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import time
+
+from rest_framework import status
+from rest_framework.permissions import AllowAny
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from shared.batch import run_batch
+from shared.serializers import BatchRequestSerializer
+
+
+class BatchView(APIView):
+    """
+    Run several API requests in one round trip.
+
+    POST /api/batch/
+
+    Body:
+    - requests: List of {id, method, path, body}; path includes any query
+      string, e.g. "/api/products/?page=2"
+    - parallel: Run the requests concurrently when all are GETs of views
+      that leave the session alone
+
+    Each sub-request is authorized by its own view as the batch's user.
+    The response lists {id, status, body, duration_ms} in request order;
+    the batch itself returns 200 whatever the sub-request statuses.
+    """
+
+    permission_classes = [AllowAny]
+
+    def post(self, request: Request) -> Response:
+        serializer = BatchRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        started = time.perf_counter()
+        responses = run_batch(
+            request,
+            serializer.validated_data["requests"],
+            parallel=serializer.validated_data["parallel"],
+        )
+        return Response(
+            {
+                "responses": responses,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            }
+        )